@@ -0,0 +1,85 @@
+# File: OutlawRpg-main/outlaw/bench/chat_xp.py
+#
+# Benchmark de carga do XP por mensagem (game_logic.chat_xp.ChatXpBuffer e
+# utils.apply_chat_xp): mensagens sintéticas em memória, sem Discord e sem
+# gravar nada em disco.
+#
+#     python -m bench.chat_xp [--rate 1000] [--seconds 120] [--users 5000] [--seed 1]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Permite executar como script a partir de qualquer pasta
+OUTLAW_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if OUTLAW_DIR not in sys.path:
+    sys.path.insert(0, OUTLAW_DIR)
+
+from config import XP_PER_MESSAGE_FLUSH_SECONDS  # noqa: E402
+from game_logic.chat_xp import ChatXpBuffer  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do XP por mensagem (mensagens sintéticas, em memória).")
+    parser.add_argument("--rate", type=int, default=1000, help="Mensagens por segundo.")
+    parser.add_argument("--seconds", type=int, default=120, help="Duração simulada.")
+    parser.add_argument("--users", type=int, default=5000, help="Autores distintos.")
+    parser.add_argument("--players", type=float, default=0.5, help="Fração dos autores que tem perfil.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import data_manager
+    from models import Player
+    from utils import apply_chat_xp
+
+    # Benchmark em memória: nada é carregado nem gravado (sem journal)
+    data_manager._journal = None
+    rng = random.Random(args.seed)
+    author_ids = [10**17 + i for i in range(args.users)]
+    for author_id in author_ids[: int(args.users * args.players)]:
+        player = Player.new(str(author_id), 0)
+        player.update({"class": "Lutador", "strength": 5, "agility": 5, "intelligence": 5})
+        data_manager.player_database[str(author_id)] = player
+    profiles = len(data_manager.player_database)
+
+    buffer = ChatXpBuffer(data_manager.player_database)
+    total = args.rate * args.seconds
+    record_time = apply_time = 0.0
+    apply_times = []
+    counted = level_ups = 0
+    next_flush = XP_PER_MESSAGE_FLUSH_SECONDS
+    # Autores com distribuição desigual (poucos falam muito), como em um servidor real
+    authors = rng.choices(author_ids, weights=[1 / (i + 1) for i in range(args.users)], k=total)
+    for index, author_id in enumerate(authors):
+        now = index / args.rate
+        start = time.perf_counter()
+        counted += buffer.record(author_id, None, now)
+        record_time += time.perf_counter() - start
+        if now >= next_flush:
+            next_flush += XP_PER_MESSAGE_FLUSH_SECONDS
+            start = time.perf_counter()
+            level_ups += len(apply_chat_xp(*buffer.drain()))
+            elapsed = time.perf_counter() - start
+            apply_time += elapsed
+            apply_times.append(elapsed)
+    start = time.perf_counter()
+    level_ups += len(apply_chat_xp(*buffer.drain()))
+    apply_time += time.perf_counter() - start
+
+    print(f"{total} mensagens em {args.seconds}s simulados ({args.rate}/s), {args.users} autores.")
+    print(f"Valeram XP: {counted} ({len(apply_times) + 1} lotes); subidas de nível detectadas: {level_ups}.")
+    print(f"Perfis criados pelo chat: {len(data_manager.player_database) - profiles}; "
+          f"autores em cooldown no fim: {len(buffer.cooldowns)}.")
+    print(f"on_message (cooldown + contagem): {record_time / total * 1e6:.2f} µs por mensagem.")
+    if apply_times:
+        print(
+            f"Lote de XP: média {sum(apply_times) / len(apply_times) * 1e3:.2f} ms, "
+            f"máximo {max(apply_times) * 1e3:.2f} ms."
+        )
+    print(f"Tempo de CPU total: {(record_time + apply_time) / args.seconds:.2%} de um núcleo.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# File: OutlawRpg-main/outlaw/bench/cooldowns.py
+#
+# Memória e tempo de um CooldownStore (game_logic.cooldowns) com N usuários
+# distintos em cooldown ao mesmo tempo.
+#
+#     python -m bench.cooldowns [--users 1000000] [--seconds 60]
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Permite executar como script a partir de qualquer pasta
+OUTLAW_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if OUTLAW_DIR not in sys.path:
+    sys.path.insert(0, OUTLAW_DIR)
+
+from game_logic.cooldowns import CooldownStore  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória e tempo de um CooldownStore com N usuários distintos.")
+    parser.add_argument("--users", type=int, default=1_000_000, help="Usuários distintos em cooldown ao mesmo tempo.")
+    parser.add_argument("--seconds", type=float, default=60, help="Duração do cooldown.")
+    args = parser.parse_args()
+
+    # IDs de usuário do Discord (snowflakes de 64 bits), todos em cooldown ao mesmo tempo
+    user_ids = [1_100_000_000_000_000_000 + i * 7919 for i in range(args.users)]
+    times = [index * args.seconds / args.users / 2 for index in range(args.users)]  # Todos na mesma janela
+
+    store = CooldownStore(args.seconds)
+    tracemalloc.start()
+    for user_id, now in zip(user_ids, times):
+        store.acquire(user_id, now)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{len(store)} usuários em cooldown: {current / 2**20:.1f} MiB ({current / len(store):.0f} bytes/usuário, "
+          f"sem contar os próprios IDs), pico {peak / 2**20:.1f} MiB.")
+
+    store = CooldownStore(args.seconds)  # Tempo medido sem o tracemalloc
+    start = time.perf_counter()
+    for user_id, now in zip(user_ids, times):
+        store.acquire(user_id, now)
+    print(f"acquire (novo usuário): {(time.perf_counter() - start) / args.users * 1e6:.2f} µs.")
+
+    now = args.seconds / 2
+    start = time.perf_counter()
+    for user_id in user_ids:
+        store.acquire(user_id, now)
+    print(f"acquire (em cooldown): {(time.perf_counter() - start) / args.users * 1e6:.2f} µs.")
+
+    start = time.perf_counter()
+    store.acquire(user_ids[0], args.seconds * 2)  # Tudo venceu: esta chamada limpa o store
+    print(f"Limpeza de {args.users} entradas vencidas: {(time.perf_counter() - start) * 1e3:.0f} ms; "
+          f"restam {len(store)} no store.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# File: OutlawRpg-main/outlaw/bench/records.py
+#
+# Memória e custo dos registros de models.py (Player com slots) contra os
+# dicionários usados antes: N jogadores sintéticos lidos de um JSON, medidos
+# com tracemalloc, mais o tempo de leitura de um campo e de to_dict/from_dict.
+#
+#     python -m bench.records [--players 100000] [--seed 1]
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+# Permite executar como script a partir de qualquer pasta
+OUTLAW_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if OUTLAW_DIR not in sys.path:
+    sys.path.insert(0, OUTLAW_DIR)
+
+from config import ITEMS_DATA  # noqa: E402
+from models import Player  # noqa: E402
+
+
+def synthetic_snapshot(count: int, rng: random.Random) -> bytes:
+    """JSON com `count` jogadores completos (todos os campos de um perfil com classe)."""
+    item_ids = list(ITEMS_DATA)
+    players = {}
+    for index in range(count):
+        user_id = str(10**17 + index)
+        player = Player.new(user_id, 1_700_000_000 + index)
+        player.update({
+            "name": f"Jogador {index}",
+            "class": rng.choice(("Lutador", "Espadachim", "Atirador", "Curandeiro", "Vampiro", "Domador")),
+            "power_style": rng.choice(("Força", "Agilidade", "Inteligência", "Constituição", "Destreza")),
+            "level": rng.randint(1, 80),
+            "xp": rng.randint(0, 500_000),
+            "money": rng.randint(0, 1_000_000),
+            "inventory": {item_id: rng.randint(1, 5) for item_id in rng.sample(item_ids, rng.randint(0, 6))},
+        })
+        players[user_id] = player.to_dict()
+    return json.dumps(players).encode("utf-8")
+
+
+def _traced(build):
+    """Memória (bytes) ocupada pelo resultado de build(), medida com tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória e custo de Player (slots) contra dicionários.")
+    parser.add_argument("--players", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    raw = synthetic_snapshot(args.players, random.Random(args.seed))
+    fields = len(json.loads(raw)[str(10**17)])
+
+    dicts, dict_size = _traced(lambda: json.loads(raw))
+    del dicts
+    records, record_size = _traced(
+        lambda: {user_id: Player.from_dict(data) for user_id, data in json.loads(raw).items()}
+    )
+    saved = dict_size - record_size
+    print(f"{args.players} jogadores com {fields} campos, lidos do JSON:")
+    print(f"  dicionários: {dict_size / 2**20:.1f} MiB ({dict_size / args.players:.0f} B por jogador)")
+    print(f"  Player:      {record_size / 2**20:.1f} MiB ({record_size / args.players:.0f} B por jogador)")
+    print(f"  economia:    {saved / args.players:.0f} B por jogador ({saved / dict_size:.1%})")
+
+    player = next(iter(records.values()))
+    data = player.to_dict()
+    number = 1_000_000
+    print(f"Leitura player.money: {timeit.timeit(lambda: player.money, number=number) / number * 1e9:.0f} ns; "
+          f"player['money']: {timeit.timeit(lambda: player['money'], number=number) / number * 1e9:.0f} ns; "
+          f"dict['money']: {timeit.timeit(lambda: data['money'], number=number) / number * 1e9:.0f} ns.")
+    number = 20_000
+    print(f"to_dict: {timeit.timeit(player.to_dict, number=number) / number * 1e6:.1f} µs; "
+          f"from_dict: {timeit.timeit(lambda: Player.from_dict(data), number=number) / number * 1e6:.1f} µs.")
+
+
+if __name__ == "__main__":
+    main()
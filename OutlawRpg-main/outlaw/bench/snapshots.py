@@ -0,0 +1,83 @@
+# File: OutlawRpg-main/outlaw/bench/snapshots.py
+#
+# Custo dos snapshots (storage/snapshot.py) por codificação: serialização,
+# gravação atômica (temporário + fsync + rotação das gerações), tamanho e
+# leitura, com jogadores sintéticos gravados numa pasta temporária.
+#
+#     python -m bench.snapshots [--players 1000 10000 100000] [--seed 1]
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Permite executar como script a partir de qualquer pasta
+OUTLAW_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if OUTLAW_DIR not in sys.path:
+    sys.path.insert(0, OUTLAW_DIR)
+
+from config import ITEMS_DATA, SNAPSHOT_GENERATIONS  # noqa: E402
+from models import Player  # noqa: E402
+from storage import snapshot  # noqa: E402
+
+
+def synthetic_players(count: int, rng: random.Random) -> dict:
+    """Jogadores no formato gravado em disco, com inventários de tamanhos variados."""
+    item_ids = list(ITEMS_DATA)
+    players = {}
+    for index in range(count):
+        user_id = str(10**17 + index)
+        player = Player.new(user_id, 1_700_000_000 + index)
+        player.update({
+            "name": f"Jogador {index}",
+            "class": rng.choice(("Lutador", "Espadachim", "Atirador", "Curandeiro", "Vampiro", "Domador")),
+            "level": rng.randint(1, 80),
+            "xp": rng.randint(0, 500_000),
+            "money": rng.randint(0, 1_000_000),
+            "inventory": {item_id: rng.randint(1, 5) for item_id in rng.sample(item_ids, rng.randint(0, 6))},
+        })
+        players[user_id] = player.to_dict()
+    return players
+
+
+def available_encodings() -> list:
+    encodings = ["json", "compact"]
+    if snapshot.msgpack is not None:
+        encodings.append("msgpack")
+    return encodings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialização, gravação atômica e leitura dos snapshots.")
+    parser.add_argument("--players", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"orjson: {'sim' if snapshot.orjson else 'não'}; msgpack: {'sim' if snapshot.msgpack else 'não'}.")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.players:
+            players = synthetic_players(count, rng)
+            for encoding in available_encodings():
+                path = os.path.join(directory, f"bench_{count}_{encoding}.snapshot")
+                start = time.perf_counter()
+                payload = snapshot.encode(players, encoding)
+                encode_time = time.perf_counter() - start
+                start = time.perf_counter()
+                size = snapshot.write_payload(path, payload, SNAPSHOT_GENERATIONS)
+                write_time = time.perf_counter() - start
+                start = time.perf_counter()
+                loaded = snapshot.read_snapshot(path, SNAPSHOT_GENERATIONS)
+                read_time = time.perf_counter() - start
+                assert len(loaded) == count
+                print(
+                    f"{count:>7} jogadores, {encoding:<7}: serialização {encode_time * 1e3:8.1f} ms, "
+                    f"gravação {write_time * 1e3:8.1f} ms, leitura {read_time * 1e3:8.1f} ms, "
+                    f"{size / 2**20:7.1f} MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
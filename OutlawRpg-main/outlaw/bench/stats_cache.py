@@ -0,0 +1,84 @@
+# File: OutlawRpg-main/outlaw/bench/stats_cache.py
+#
+# Cache de atributos efetivos (utils.calculate_effective_stats, invalidado
+# por data_manager.bump_stats_version): custo de um acerto contra o cálculo
+# completo, ganho de XP por mensagem, e uma sequência de alterações
+# aleatórias conferida contra o cálculo sem cache. Tudo em memória.
+#
+#     python -m bench.stats_cache [--mutations 50000] [--seed 1]
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+# Permite executar como script a partir de qualquer pasta
+OUTLAW_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if OUTLAW_DIR not in sys.path:
+    sys.path.insert(0, OUTLAW_DIR)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Acerto do cache de atributos efetivos contra o cálculo completo.")
+    parser.add_argument("--mutations", type=int, default=50_000, help="Alterações aleatórias conferidas.")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    import data_manager
+    import utils
+    from game_logic.stat_modifiers import compute_effective_stats
+    from models import Player
+
+    # Em memória: nada é carregado nem gravado (sem journal)
+    data_manager._journal = None
+    data_manager._players_loaded = data_manager._clans_loaded = True
+    rng = random.Random(args.seed)
+    user_ids = [str(10**17 + i) for i in range(args.players)]
+    for user_id in user_ids:
+        player = Player.new(user_id, 0)
+        player.update({
+            "class": "Vampiro", "power_style": "Força", "strength": 40, "agility": 10, "intelligence": 30,
+            "constitution": 20, "dexterity": 25, "inventory": {"habilidade_inata": 1, "coracao_do_universo": 1},
+            "equipped_items": {"arma": "espada_fantasma"},
+        })
+        data_manager.player_database[user_id] = player
+
+    # Um jogador com bônus de estilo e itens: acerto do cache contra o cálculo completo
+    player = data_manager.player_database[user_ids[0]]
+    number = 200_000
+    uncached = timeit.timeit(lambda: compute_effective_stats(player), number=number) / number
+    utils.calculate_effective_stats(player)
+    cached = timeit.timeit(lambda: utils.calculate_effective_stats(player), number=number) / number
+    xp_gain = timeit.timeit(lambda: utils.get_player_effective_xp_gain(player, 1), number=number) / number
+    print(f"calculate_effective_stats: {uncached * 1e6:.2f} µs sem cache, {cached * 1e6:.2f} µs num acerto.")
+    print(f"get_player_effective_xp_gain (por mensagem): {xp_gain * 1e6:.2f} µs.")
+
+    # Alterações aleatórias (com o bump correspondente) misturadas com leituras
+    hits_before = utils.stats_cache_info()["hits"]
+    misses_before = utils.stats_cache_info()["misses"]
+    mismatches = 0
+    for _ in range(args.mutations):
+        user_id = rng.choice(user_ids)
+        action = rng.random()
+        if action < 0.1:
+            data_manager.mutate_player(user_id, "strength", "add", rng.randint(1, 3))
+        elif action < 0.15:
+            data_manager.mutate_player(user_id, "bencao_dracula_active", "set", rng.random() < 0.5)
+        elif action < 0.2:
+            data_manager.mutate_player(user_id, "inventory", "add", 1, key="habilidade_inata")
+        player = data_manager.player_database[user_id]
+        if utils.calculate_effective_stats(player) != compute_effective_stats(player):
+            mismatches += 1
+    info = utils.stats_cache_info()
+    hits, misses = info["hits"] - hits_before, info["misses"] - misses_before
+    print(
+        f"{args.mutations} leituras com alterações aleatórias: {mismatches} divergências do cálculo sem cache, "
+        f"{hits / (hits + misses):.0%} de acertos."
+    )
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
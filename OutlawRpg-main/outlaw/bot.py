@@ -4,6 +4,7 @@ from discord.ext import commands, tasks
 from discord import app_commands, Embed, Color, Interaction
 import os
 import json
+import asyncio
 import random
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
@@ -17,25 +18,36 @@ from config import ( # Changed from .config to config
     ITEMS_DATA,
     CLASS_TRANSFORMATIONS,
     WORLD_MAP,
-    LEVEL_ROLES,
-    NEW_CHARACTER_ROLE_ID,
     LOCATION_KILL_GOALS,
     CLAN_RANKING_INTERVAL_DAYS,
     CLAN_RANK_REWARDS,
     DEFAULT_CLAN_XP,
     CUSTOM_EMOJIS,
-    XP_PER_MESSAGE_COOLDOWN_SECONDS,
+    SAVE_CHECK_TICK_SECONDS,
+    LOAD_PLAYERS_IN_BACKGROUND,
+    XP_PER_MESSAGE_FLUSH_SECONDS,
+    DM_METRICS_INTERVAL_MINUTES,
+    DM_SHUTDOWN_DRAIN_SECONDS,
 )
 
 # Importar data manager
 from data_manager import ( # Changed from .data_manager to data_manager
     load_data,
-    save_data,
+    load_data_async,
+    load_clan_data,
+    wait_until_loaded,
+    PlayerDataLoading,
     get_player_data,
     player_database,
-    load_clan_data,
+    mutate_player,
     save_clan_data,
     clan_database,
+    flush,
+    is_flush_due,
+    save_async,
+    close_storage,
+    verify_indexes,
+    migrate_all_players,
 )
 
 # Importar utilitários
@@ -43,8 +55,20 @@ from utils import ( # Changed from .utils to utils
     calculate_effective_stats,
     run_turn_based_combat,
     check_and_process_levelup_internal,
-    get_player_effective_xp_gain,
-    calculate_xp_for_next_level,
+    apply_chat_xp,
+)
+
+from game_logic.chat_xp import ChatXpBuffer
+from role_sync import RoleSync
+from notifications import NotificationQueue
+from name_resolver import NameResolver
+
+from game_logic.timers import (
+    TRANSFORMATION_TIMER,
+    buff_timers,
+    rebuild_buff_timers,
+    schedule_blessing_expiry,
+    schedule_transformation_expiry,
 )
 
 # Importar exceções personalizadas para tratamento de erros
@@ -76,9 +100,28 @@ class OutlawsBot(commands.Bot):
         intents.members = True
         intents.message_content = True
         super().__init__(command_prefix="!", intents=intents)
-        self.last_message_xp_time = {}
+        # XP por mensagem: cooldown e contagem em on_message, aplicados em lote por chat_xp_flush
+        self.chat_xp = ChatXpBuffer(player_database)
+        # Cargos de nível: fila de membros a sincronizar, uma edição por membro
+        self.role_sync = RoleSync(lambda: self.get_guild(GUILD_ID), player_database)
+        self.role_sync_task = None
+        # DMs: avisos enfileirados e enviados em segundo plano (notify não espera pela API)
+        self.notifications = NotificationQueue(self)
+        # Nomes de exibição para embeds: cache LRU+TTL e fetch_user em paralelo
+        self.names = NameResolver(self)
+        self.buff_timer_task = None
+        self.migration_task = None
+        self.load_task = None
 
     async def setup_hook(self):
+        # Dados: os clãs são poucos e carregam aqui; os jogadores carregam em
+        # segundo plano (LOAD_PLAYERS_IN_BACKGROUND) enquanto o bot conecta
+        load_clan_data()
+        if LOAD_PLAYERS_IN_BACKGROUND:
+            self.load_task = asyncio.create_task(self.load_players())
+        else:
+            await self.load_players()
+
         # Carregar Cogs. Todos os comandos de barra reais devem ser definidos DENTRO desses Cogs.
         await self.add_cog(CharacterCommands(self))
         await self.add_cog(CombatCommands(self))
@@ -91,8 +134,12 @@ class OutlawsBot(commands.Bot):
 
         # Iniciar tarefas em segundo plano
         self.auto_save.start()
-        self.energy_regeneration.start()
+        self.chat_xp_flush.start()
+        self.buff_timer_task = asyncio.create_task(buff_timers.run(self.expire_buff))
         # Removido: self.boss_attack_loop.start()
+        self.role_sync_task = asyncio.create_task(self.run_role_sync())
+        self.notifications.start()
+        self.log_notification_metrics.start()
         self.sync_roles_periodically.start()
         self.weekly_clan_ranking.start()
 
@@ -115,9 +162,16 @@ class OutlawsBot(commands.Bot):
         """Um manipulador de erros global para todos os comandos de barra."""
 
         # Importando exceções personalizadas localmente aqui para evitar importações circulares se as verificações forem importadas por Cogs
-        from custom_checks import NotInCity, NotInWilderness # Changed from .custom_checks to custom_checks
+        from custom_checks import DataLoading, NotInCity, NotInWilderness # Changed from .custom_checks to custom_checks
 
-        if isinstance(error, app_commands.CommandOnCooldown):
+        if isinstance(error, DataLoading):
+            await interaction.response.send_message(str(error), ephemeral=True)
+        elif isinstance(getattr(error, "original", None), PlayerDataLoading):
+            await interaction.response.send_message(
+                "⏳ Os dados dos jogadores ainda estão carregando. Tente novamente em alguns segundos.",
+                ephemeral=True,
+            )
+        elif isinstance(error, app_commands.CommandOnCooldown):
             await interaction.response.send_message(
                 f"⏳ Este comando está em cooldown! Tente novamente em **{error.retry_after:.1f} segundos**.",
                 ephemeral=True,
@@ -158,57 +212,75 @@ class OutlawsBot(commands.Bot):
             except Exception as e:
                 print(f"Erro ao tentar enviar a mensagem de erro ao usuário: {e}")
 
+    async def load_players(self):
+        """Carrega os jogadores e prepara o que depende de todos eles (timers, índices, migrações)."""
+        try:
+            if LOAD_PLAYERS_IN_BACKGROUND:
+                await load_data_async()
+            else:
+                load_data()
+        except Exception as e:
+            # Nunca continuar com um banco incompleto por cima dos dados reais
+            print(f"ERRO ao carregar os dados dos jogadores: {e}")
+            await self.close()
+            return
+        # Expiração de bênçãos/transformações: timers recriados a partir dos dados salvos
+        print(f"{rebuild_buff_timers(player_database)} expirações de bênçãos/transformações agendadas.")
+        # Índices secundários e listas de membros dos clãs
+        for problem in verify_indexes():
+            print(f"AVISO: {problem}")
+        # Migrações de esquema pendentes, em lotes, sem travar o event loop
+        self.migration_task = asyncio.create_task(migrate_all_players())
+
     async def on_ready(self):
+        # on_ready dispara de novo a cada reconexão ao gateway: nada pesado aqui.
+        # Os dados são carregados uma vez em setup_hook (load_players) e as
+        # migrações de esquema rodam uma única vez (ao fim da carga + primeiro acesso).
         print(f"Bot {self.user} está online!")
-        # Percorre o player_database para garantir que os padrões estejam inicializados
-        # Isso é importante para usuários existentes antes da adição dos novos campos de relíquias/chaves.
-        # get_player_data já inicializa os padrões, então apenas acessá-los garante isso.
-        for user_id_str in list(
-            player_database.keys()
-        ):  # Itera sobre uma cópia para evitar modificação durante a iteração
-            if not user_id_str.isdigit(): #
-                print(f"AVISO: Chave inválida encontrada no player_database: '{user_id_str}'. Ignorando.") #
-                continue #
-            get_player_data(user_id_str)
-        save_data()  # Salva quaisquer inicializações feitas
-        load_clan_data()
-        print(f"Dados de {len(clan_database)} clãs carregados.")
 
     async def on_message(self, message):
         if message.author.bot:
             return
 
-        user_id = str(message.author.id)
-        player_data = get_player_data(
-            user_id
-        )  # Usa a função atualizada para obter/inicializar dados
-
-        if player_data:
-            current_time = datetime.now().timestamp()
-            if (
-                user_id not in self.last_message_xp_time
-                or (current_time - self.last_message_xp_time[user_id])
-                >= XP_PER_MESSAGE_COOLDOWN_SECONDS
-            ):
-                xp_gain = 1
-                effective_xp_gain = get_player_effective_xp_gain(player_data, xp_gain)
-                player_data["xp"] = player_data.get("xp", 0) + effective_xp_gain
-                self.last_message_xp_time[user_id] = current_time
+        # Só o cooldown e a contagem: sem criar perfil para quem não tem ficha.
+        # O XP é aplicado em lote por chat_xp_flush (jogadores ainda não
+        # carregados não estão em player_database e não ganham XP).
+        self.chat_xp.record(message.author.id, message)
+
+        await self.process_commands(message)
 
+    @tasks.loop(seconds=XP_PER_MESSAGE_FLUSH_SECONDS)  # XP do chat em lote
+    async def chat_xp_flush(self):
+        # Todo o XP do lote é aplicado antes de qualquer envio de level-up
+        level_ups = apply_chat_xp(*self.chat_xp.drain())
+        for user_id, message in level_ups:
+            player_data = player_database.get(user_id)
+            if player_data is None or message is None:
+                continue
+            try:
                 # Chamar a função centralizada de level-up
                 await self.check_and_process_levelup(
                     message.author, player_data, message.channel
                 )
-
-                # Salvar dados após potencial aumento de nível (o check_and_process_levelup já deve salvar)
-                save_data()  # Garante que as mudanças de XP e level-up sejam salvas
-
-        await self.process_commands(message)
+            except Exception as e:
+                # Um canal sem permissão não pode parar o loop (o XP do chat deixaria de ser aplicado)
+                print(f"Erro ao processar o level-up de {user_id} pelo chat: {e}")
 
     async def close(self):
         print("Desligando e salvando dados...")
-        save_data()
-        save_clan_data()
+        if self.buff_timer_task:
+            self.buff_timer_task.cancel()
+        if self.role_sync_task:
+            self.role_sync_task.cancel()
+        await self.notifications.drain(DM_SHUTDOWN_DRAIN_SECONDS)  # Envia o que der antes de parar
+        self.notifications.stop()  # Loga os avisos que ficaram na fila
+        self.chat_xp_flush.cancel()
+        apply_chat_xp(*self.chat_xp.drain())  # O level-up fica para o próximo ganho de XP
+        if self.load_task and not self.load_task.done() and self.load_task is not asyncio.current_task():
+            self.load_task.cancel()
+        await save_async()  # Espera gravações em andamento
+        flush()  # Grava tudo o que ainda está pendente no write-behind
+        close_storage()
         await super().close()
 
     async def check_and_process_levelup(
@@ -219,72 +291,55 @@ class OutlawsBot(commands.Bot):
     ):
         await check_and_process_levelup_internal(self, member, player_data, send_target)
 
-    @tasks.loop(seconds=60)  # Auto-salvamento a cada minuto
+    @tasks.loop(seconds=SAVE_CHECK_TICK_SECONDS)  # Grava em lote por intervalo ou limite de registros
     async def auto_save(self):
-        save_data()
-        save_clan_data()
-
-    @tasks.loop(seconds=60)  # Regeneração de energia e expiração de buffs a cada minuto
-    async def energy_regeneration(self):
+        if is_flush_due():
+            await save_async()  # Serializa e grava fora do event loop
+
+    async def expire_buff(self, key, payload):
+        """
+        Chamado por buff_timers no instante em que uma bênção ou transformação
+        termina (substitui a varredura de todos os jogadores a cada minuto).
+        """
+        await self.wait_until_ready()  # Timers vencidos com o bot desligado disparam logo ao iniciar
+        user_id_str, timer_id = key
+        player_data = player_database.get(user_id_str)
+        if not player_data:
+            return
         now = datetime.now().timestamp()
-        # Iterate over a copy of keys to avoid RuntimeError: dictionary changed size during iteration if player_database is modified
-        for user_id_str in list(player_database.keys()): #
-            if not user_id_str.isdigit(): #
-                print(f"AVISO: Chave inválida encontrada no player_database durante regeneração de energia: '{user_id_str}'. Ignorando.") #
-                continue #
-            user_id = int(user_id_str) #
-            player_data = player_database[user_id_str] #
-
-            # Regeneração de Energia
-            if player_data.get("energy", 0) < MAX_ENERGY:
-                player_data["energy"] = min(
-                    MAX_ENERGY, player_data.get("energy", 0) + 1
-                )
 
-            # Verificação de Buffs/Transformações/Bênçãos que expiram
-            # Iterar sobre ITEMS_DATA para bênçãos
-            for item_id, item_info in ITEMS_DATA.items():
-                if item_info.get("type") == "blessing_unlock":
-                    active_key = f"{item_id}_active"
-                    end_time_key = f"{item_id}_end_time"
-                    if player_data.get(active_key) and now > player_data.get(
-                        end_time_key, 0
-                    ):
-                        player_data[active_key] = False
-                        player_data[end_time_key] = 0
-                        user = self.get_user(user_id)
-                        if user:
-                            try:
-                                await user.send(
-                                    f"✨ A {item_info.get('name', 'Bênção')} em você expirou!"
-                                )
-                            except discord.Forbidden:
-                                pass  # Bot não pode enviar DM
-                            except Exception as e:
-                                print(
-                                    f"Erro ao enviar DM sobre expiração de bênção para {user.name}: {e}"
-                                )
+        if timer_id == TRANSFORMATION_TIMER:
+            transform_name = player_data.get("current_transformation")
+            if not transform_name:
+                return
+            end_time = player_data.get("transform_end_time", 0)
+            if now < end_time:  # Prolongada sem reagendar: agenda o novo fim
+                schedule_transformation_expiry(user_id_str, end_time)
+                return
+            mutate_player(user_id_str, "current_transformation", "set", None)
+            mutate_player(user_id_str, "transform_end_time", "set", 0)
+            message = f"🔄 Sua transformação de **{transform_name}** expirou!"
+        else:
+            active_key = f"{timer_id}_active"
+            end_time_key = f"{timer_id}_end_time"
+            if not player_data.get(active_key):
+                return
+            end_time = player_data.get(end_time_key, 0)
+            if now < end_time:
+                schedule_blessing_expiry(user_id_str, timer_id, end_time)
+                return
+            mutate_player(user_id_str, active_key, "set", False)
+            mutate_player(user_id_str, end_time_key, "set", 0)
+            message = f"✨ A {ITEMS_DATA.get(timer_id, {}).get('name', 'Bênção')} em você expirou!"
 
-            # Verificação de Transformações (campo current_transformation)
-            if player_data.get("current_transformation"):
-                if now > player_data.get("transform_end_time", 0):
-                    transform_name = player_data["current_transformation"]
-                    player_data["current_transformation"] = None
-                    player_data["transform_end_time"] = 0
-                    user = self.get_user(user_id)
-                    if user:
-                        try:
-                            await user.send(
-                                f"🔄 Sua transformação de **{transform_name}** expirou!"
-                            )
-                        except discord.Forbidden:
-                            pass  # Bot não pode enviar DM
-                        except Exception as e:
-                            print(
-                                f"Erro ao enviar DM sobre expiração de transformação para {user.name}: {e}"
-                            )
+        if user_id_str.isdigit():
+            self.notifications.notify(user_id_str, message)
 
-        save_data()  # Salva as mudanças de energia e buffs para todos os jogadores
+    @tasks.loop(minutes=DM_METRICS_INTERVAL_MINUTES)  # Resumo da fila de DMs no log
+    async def log_notification_metrics(self):
+        metrics = self.notifications.metrics()
+        if metrics["sent"] or metrics["failed"] or metrics["queued_users"]:
+            print(self.notifications.summary())
 
     @tasks.loop(minutes=5)  # Sincronização de cargos a cada 5 minutos
     async def sync_roles_periodically(self):
@@ -316,113 +371,29 @@ class OutlawsBot(commands.Bot):
                 print(f"Erro ao carregar membros da guilda {guild.name}: {e}")
                 return
 
-        total_synced = 0
-        # Iterate over a copy of keys to avoid RuntimeError: dictionary changed size during iteration if player_database is modified
-        for member_id_str in list(player_database.keys()): #
-            if not member_id_str.isdigit(): #
-                print(f"AVISO: Chave inválida encontrada no player_database durante sincronização de cargos: '{member_id_str}'. Ignorando.") #
-                continue #
-            member_id = int(member_id_str) #
-            player_data = player_database[member_id_str] #
-
-            member = guild.get_member(member_id)
-
-            if not member:
-                continue
-
-            if player_data.get("status") == "afk":
-                continue
-
-            if isinstance(NEW_CHARACTER_ROLE_ID, int) and NEW_CHARACTER_ROLE_ID > 0:
-                new_char_role = guild.get_role(NEW_CHARACTER_ROLE_ID)
-                if new_char_role:
-                    if new_char_role not in member.roles:
-                        try:
-                            await member.add_roles(
-                                new_char_role, reason="Sincronização de cargo inicial."
-                            )
-                            total_synced += 1
-                        except discord.Forbidden:
-                            print(
-                                f"PERMISSÃO NEGADA: Não foi possível adicionar '{new_char_role.name}' a {member.display_name}."
-                            )
-                        except discord.HTTPException as e:
-                            print(
-                                f"ERRO HTTP ao adicionar '{new_char_role.name}' a {member.display_name}: {e}"
-                            )
-                else:
-                    print(
-                        f"Cargo inicial com ID {NEW_CHARACTER_ROLE_ID} não encontrado na guilda."
-                    )
-            else:
-                print(
-                    "NEW_CHARACTER_ROLE_ID não é um ID de cargo válido (deve ser um número inteiro positivo)."
-                )
-
-            if isinstance(LEVEL_ROLES, dict):
-                current_level = player_data.get("level", 1)
-                highest_applicable_role_id = None
-
-                for required_level in sorted(LEVEL_ROLES.keys(), reverse=True):
-                    if current_level >= required_level:
-                        highest_applicable_role_id = LEVEL_ROLES[required_level]
-                        break
-
-                all_level_role_ids = list(LEVEL_ROLES.values())
-
-                roles_to_remove = []
-                roles_to_add = []
-
-                for existing_role in member.roles:
-                    if (
-                        existing_role.id in all_level_role_ids
-                        and existing_role.id != highest_applicable_role_id
-                    ):
-                        roles_to_remove.append(existing_role)
+        # Só os jogadores cujo cargo desejado mudou entram na fila do RoleSync
+        marked = await self.role_sync.refresh()
+        print(
+            f"Sincronização de cargos: {marked} membros na fila, "
+            f"{self.role_sync.edits} edições de cargos desde o início."
+        )
 
-                if highest_applicable_role_id:
-                    role_to_add = guild.get_role(highest_applicable_role_id)
-                    if role_to_add and role_to_add not in member.roles:
-                        roles_to_add.append(role_to_add)
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if after.guild.id == GUILD_ID and before.roles != after.roles:
+            self.role_sync.member_roles_changed(after)
 
-                if roles_to_remove:
-                    try:
-                        await member.remove_roles(
-                            *roles_to_remove, reason="Sincronização de cargos de nível."
-                        )
-                        total_synced += len(roles_to_remove)
-                    except discord.Forbidden:
-                        print(
-                            f"PERMISSÃO NEGADA: Não foi possível remover cargos de {member.display_name}."
-                        )
-                    except discord.HTTPException as e:
-                        print(
-                            f"ERRO HTTP ao remover cargos de {member.display_name}: {e}"
-                        )
+    async def on_member_join(self, member: discord.Member):
+        if member.guild.id == GUILD_ID and str(member.id) in player_database:
+            self.role_sync.mark(member.id)  # Quem volta à guilda volta sem cargos
 
-                if roles_to_add:
-                    try:
-                        await member.add_roles(
-                            *roles_to_add, reason="Sincronização de cargos de nível."
-                        )
-                        total_synced += len(roles_to_add)
-                    except discord.Forbidden:
-                        print(
-                            f"PERMISSÃO NEGADA: Não foi possível adicionar '{roles_to_add[0].name}' a {member.display_name}."
-                        )
-                    except discord.HTTPException as e:
-                        print(
-                            f"ERRO HTTP ao adicionar '{roles_to_add[0].name}' a {member.display_name}: {e}"
-                        )
-
-        if total_synced > 0:
-            print(f"Sincronização de cargos concluída. Total de ações: {total_synced}.")
-        else:
-            print("Sincronização de cargos concluída. Nenhum cargo foi alterado.")
+    async def run_role_sync(self):
+        await self.wait_until_ready()
+        await self.role_sync.run()
 
     @sync_roles_periodically.before_loop
     async def before_sync_roles_periodically(self):
         await self.wait_until_ready()
+        await wait_until_loaded()
 
     @tasks.loop(hours=24 * CLAN_RANKING_INTERVAL_DAYS)  # Ranking de clãs
     async def weekly_clan_ranking(self):
@@ -488,10 +459,8 @@ class OutlawsBot(commands.Bot):
                 for member_id in clan["members"]:
                     player_data = get_player_data(member_id)
                     if player_data:
-                        player_data["xp"] = player_data.get("xp", 0) + xp_reward
-                        player_data["money"] = (
-                            player_data.get("money", 0) + money_reward
-                        )
+                        mutate_player(member_id, "xp", "add", xp_reward)
+                        mutate_player(member_id, "money", "add", money_reward)
                         # A lógica de level up agora é centralizada na função check_and_process_levelup_internal
                         try:
                             member_obj = await self.fetch_user(int(member_id))
@@ -513,7 +482,6 @@ class OutlawsBot(commands.Bot):
                             print(
                                 f"Erro ao atualizar nível ou enviar mensagem para {member_id}: {e}"
                             )
-                        save_data()  # Salva o progresso do jogador
                     else:
                         print(
                             f"Dados do jogador {member_id} não encontrados para recompensar."
@@ -542,6 +510,7 @@ class OutlawsBot(commands.Bot):
     @weekly_clan_ranking.before_loop
     async def before_weekly_clan_ranking(self):
         await self.wait_until_ready()
+        await wait_until_loaded()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands
 from discord import app_commands, Interaction, Embed, Color
-from data_manager import get_player_data, save_data
+from data_manager import get_player_data, mutate_player
 from views.embed_creator_views import EmbedCreatorView
 from datetime import datetime
 
@@ -27,8 +27,7 @@ class AdminCommands(commands.Cog):
             )
             return
 
-        player_data["xptriple"] = status
-        save_data()
+        mutate_player(membro.id, "xptriple", "set", status)
 
         status_str = "ativado" if status else "desativado"
         await i.response.send_message(
@@ -54,8 +53,7 @@ class AdminCommands(commands.Cog):
             )
             return
 
-        player_data["money_double"] = status
-        save_data()
+        mutate_player(membro.id, "money_double", "set", status)
 
         status_str = "ativado" if status else "desativado"
         await i.response.send_message(
@@ -3,9 +3,15 @@ from discord.ext import commands
 from discord import app_commands, Embed, Color, Interaction
 from datetime import datetime
 
-from data_manager import get_player_data, save_data
+from data_manager import (
+    get_player_data,
+    mutate_player,
+    get_energy,
+    change_energy,
+)
 from config import ITEMS_DATA, MAX_ENERGY
 from custom_checks import check_player_exists
+from game_logic.timers import schedule_blessing_expiry, cancel_buff_expiry
 
 
 class BlessingCommands(commands.Cog):
@@ -74,7 +80,7 @@ class BlessingCommands(commands.Cog):
             return
 
         # Check energy cost
-        if raw_player_data["energy"] < blessing_info["cost_energy"]:
+        if get_energy(raw_player_data) < blessing_info["cost_energy"]:
             await i.response.send_message(
                 f"Energia insuficiente para ativar a **{blessing_info['name']}** ({blessing_info['cost_energy']} energia)!",
                 ephemeral=True,
@@ -82,11 +88,11 @@ class BlessingCommands(commands.Cog):
             return
 
         # Activate blessing
-        raw_player_data["energy"] -= blessing_info["cost_energy"]
-        raw_player_data[active_key] = True
-        raw_player_data[f"{bencao_id.value}_end_time"] = (
-            datetime.now().timestamp() + blessing_info["duration_seconds"]
-        )
+        change_energy(i.user.id, -blessing_info["cost_energy"])
+        end_time = datetime.now().timestamp() + blessing_info["duration_seconds"]
+        mutate_player(i.user.id, active_key, "set", True)
+        mutate_player(i.user.id, f"{bencao_id.value}_end_time", "set", end_time)
+        schedule_blessing_expiry(i.user.id, bencao_id.value, end_time)
 
         embed = Embed(
             title=f"{blessing_info['emoji']} {blessing_info['name']}! {blessing_info['emoji']}",
@@ -104,7 +110,6 @@ class BlessingCommands(commands.Cog):
             embed.set_thumbnail(url="https://c.tenor.com/A6j4yvK8J-oAAAAC/tenor.gif")
 
         await i.response.send_message(embed=embed)
-        save_data()
 
     @app_commands.command(
         name="desativar_bencao",
@@ -140,8 +145,9 @@ class BlessingCommands(commands.Cog):
             blessing_name = blessing_info.get("name", "Bênção Desconhecida")
 
             if raw_player_data.get(active_key):
-                raw_player_data[active_key] = False
-                raw_player_data[end_time_key] = 0
+                mutate_player(i.user.id, active_key, "set", False)
+                mutate_player(i.user.id, end_time_key, "set", 0)
+                cancel_buff_expiry(i.user.id, b_id)
                 deactivated_any = True
                 messages.append(f"A **{blessing_name}** foi desativada.")
             elif (
@@ -153,8 +159,7 @@ class BlessingCommands(commands.Cog):
                 return
 
         if deactivated_any:
-            raw_player_data["energy"] = min(MAX_ENERGY, raw_player_data["energy"] + 1)
-            save_data()
+            change_energy(i.user.id, 1)
             messages.append("Você recuperou 1 de energia.")
             await i.response.send_message("\n".join(messages))
         elif bencao_id.value == "all_blessings":
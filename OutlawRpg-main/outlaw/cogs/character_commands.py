@@ -3,7 +3,12 @@ import discord
 from discord.ext import commands
 from discord import app_commands, Embed, Color, Interaction
 
-from data_manager import get_player_data, save_data, player_database
+from data_manager import (
+    get_player_data,
+    bump_stats_version,
+    mutate_player,
+    top_players,
+)
 from config import (
     INITIAL_HP,
     INITIAL_ATTACK,
@@ -90,20 +95,19 @@ class CharacterCommands(commands.Cog):
             return
         else:
             cost = REVIVE_COST
-            player_data["money"] -= cost
+            mutate_player(i.user.id, "money", "add", -cost)
             revive_message = f"Você pagou ${REVIVE_COST} e trapaceou a morte."
 
         # OLD: player_data["hp"] = player_data["max_hp"] # This used the base max_hp
 
         # NEW: Get the effective max_hp before setting current hp
         effective_stats = calculate_effective_stats(player_data)
-        player_data["hp"] = effective_stats[
-            "max_hp"
-        ]  # Set current hp to the full effective max_hp
+        mutate_player(
+            i.user.id, "hp", "set", effective_stats["max_hp"]
+        )  # Set current hp to the full effective max_hp
 
-        player_data["status"] = "online"
-        player_data["amulet_used_since_revive"] = False
-        save_data()
+        mutate_player(i.user.id, "status", "set", "online")
+        mutate_player(i.user.id, "amulet_used_since_revive", "set", False)
         await i.response.send_message(
             embed=Embed(
                 title="✨ De Volta à Vida",
@@ -145,19 +149,20 @@ class CharacterCommands(commands.Cog):
                 f"Você só tem {available_points} pontos.", ephemeral=True
             )
             return
-        player_data["attribute_points"] -= quantidade
+        mutate_player(i.user.id, "attribute_points", "add", -quantidade)
         if atributo.value == "attack":
-            player_data["base_attack"] += quantidade * 2
+            mutate_player(i.user.id, "base_attack", "add", quantidade * 2)
+            bump_stats_version(i.user.id)
         elif atributo.value == "special_attack":
-            player_data["base_special_attack"] += quantidade * 3
+            mutate_player(i.user.id, "base_special_attack", "add", quantidade * 3)
+            bump_stats_version(i.user.id)
         elif atributo.value == "hp":
-            player_data["max_hp"] += quantidade * 5  # This increases the base max_hp
+            mutate_player(i.user.id, "max_hp", "add", quantidade * 5)  # This increases the base max_hp
             # After increasing base max_hp, recalculate effective max_hp and set current hp
             effective_stats_after_distribute = calculate_effective_stats(player_data)
-            player_data["hp"] = effective_stats_after_distribute[
-                "max_hp"
-            ]  # Set current hp to new effective max_hp
-        save_data()
+            mutate_player(
+                i.user.id, "hp", "set", effective_stats_after_distribute["max_hp"]
+            )  # Set current hp to new effective max_hp
         await i.response.send_message(
             embed=Embed(
                 title="📈 Atributos Aprimorados",
@@ -171,32 +176,13 @@ class CharacterCommands(commands.Cog):
         description="Mostra o ranking de MVPs (Mais Abates) do servidor.",
     )
     async def ranking(self, i: Interaction):
-        if not player_database:
+        top_entries = top_players(10)  # Índice ordenado mantido pelo data_manager
+        if not top_entries:
             await i.response.send_message(
                 "Nenhum jogador no ranking ainda.", ephemeral=True
             )
             return
 
-        await i.response.defer()
-
-        guild_members = {}
-        if i.guild:
-            try:
-                async for member in i.guild.fetch_members(limit=None):
-                    guild_members[member.id] = member
-            except discord.Forbidden:
-                print(
-                    f"Bot lacks 'Members Intent' or 'Read Members' permission in guild {i.guild.name}. Cannot fetch all members for ranking."
-                )
-            except Exception as e:
-                print(f"Error fetching guild members for ranking: {e}")
-
-        sorted_players = sorted(
-            player_database.values(),
-            key=lambda p: (p.get("kills", 0), p.get("level", 1), p.get("money", 0)),
-            reverse=True,
-        )
-
         embed = Embed(
             title="🏆 Ranking de MVPs - OUTLAWS 🏆",
             description="Os fora-da-lei mais temidos do servidor.",
@@ -204,18 +190,13 @@ class CharacterCommands(commands.Cog):
         )
 
         rank_entries = []
-        for idx, player_data in enumerate(sorted_players[:10]):
-            player_id_str = None
-            for uid_str, data_val in player_database.items():
-                if data_val == player_data:
-                    player_id_str = uid_str
-                    break
-
-            if not player_id_str:
-                continue
-
-            player_id = int(player_id_str)
-            member = guild_members.get(player_id)
+        for idx, (player_id_str, player_data) in enumerate(top_entries):
+            # Membros vêm do cache do gateway (intent de membros), sem buscar a lista via REST
+            member = (
+                i.guild.get_member(int(player_id_str))
+                if i.guild and player_id_str.isdigit()
+                else None
+            )
 
             player_display_name = (
                 member.display_name
@@ -241,4 +222,4 @@ class CharacterCommands(commands.Cog):
             embed.description = "Nenhum jogador no ranking ainda."
 
         embed.set_footer(text="A glória aguarda os mais audazes!")
-        await i.edit_original_response(embed=embed)
+        await i.response.send_message(embed=embed)
@@ -8,6 +8,7 @@ from datetime import datetime, time as dt_time, timedelta
 
 import data_manager
 import config
+from models import Clan
 from utils import (
     display_money,
 )
@@ -62,8 +63,12 @@ class DistributeMoneyConfirmView(discord.ui.View):
         # Envia uma mensagem temporária de "processando" para melhor UX
         await interaction.followup.send("Processando distribuição...", ephemeral=True)
 
-        # Chamada da nova função de distribuição
-        await self.cog._distribute_clan_money(interaction, clan_data)
+        # Chamada da nova função de distribuição. Segura os locks do clã e dos
+        # membros: a tesouraria é lida depois dos awaits acima.
+        async with data_manager.acquire_locks(
+            player_ids=clan_data.get("members", []), clan_ids=[self.clan_id]
+        ):
+            await self.cog._distribute_clan_money(interaction, clan_data)
 
         # Remove a view da mensagem, se desejar que ela desapareça completamente após a ação
         if self.message:
@@ -89,30 +94,8 @@ class ClanCommands(commands.Cog):
 
     async def _find_clan_by_name(self, name: str) -> Optional[dict]:
         """Encontra um clã pelo seu nome (sem diferenciar maiúsculas/minúsculas)."""
-        name_lower = name.lower()
-        for clan_data in data_manager.clan_database.values():
-            if clan_data["name"].lower() == name_lower:
-                return clan_data
-        return None
-
-    async def _get_user_display_name(self, user_id: int) -> str:
-        """Busca com segurança o nome de exibição de um usuário, tratando possíveis erros."""
-        try:
-            # Tenta pegar da cache primeiro para eficiência
-            user = self.bot.get_user(user_id)
-            if user:
-                return user.display_name
-
-            # Se não estiver na cache, tenta buscar via API
-            user = await self.bot.fetch_user(user_id)
-            return user.display_name
-        except discord.NotFound:
-            return "Usuário Desconhecido"
-        except discord.HTTPException:
-            return "Erro ao Buscar Usuário"
-        except Exception as e:
-            print(f"Erro inesperado em _get_user_display_name para {user_id}: {e}")
-            return "Erro Interno"
+        found = data_manager.find_clan_by_name(name)  # Índice por nome mantido pelo data_manager
+        return found[1] if found else None
 
     # --- TAREFA DE RECOMPENSA SEMANAL ---
 
@@ -236,18 +219,17 @@ class ClanCommands(commands.Cog):
         )  # Caso o dinheiro não seja divisível igualmente
 
         distributed_amounts = {}
-        for member_id_str, player_data in eligible_members:
+        for member_id_str, _ in eligible_members:
             amount_to_give = money_per_member
             if remainder_money > 0:  # Distribui o restante para os primeiros membros
                 amount_to_give += 1
                 remainder_money -= 1
 
-            player_data["money"] = player_data.get("money", 0) + amount_to_give
+            data_manager.mutate_player(member_id_str, "money", "add", amount_to_give)
             distributed_amounts[member_id_str] = amount_to_give
 
         clan_data["money"] = 0  # Zera a tesouraria do clã após a distribuição
-        data_manager.save_clan_data()
-        data_manager.save_data()  # Salva o progresso dos jogadores
+        data_manager.save_clan_data(clan_data.get("id"))
 
         # Embed final de sucesso para a distribuição
         embed = discord.Embed(
@@ -260,16 +242,15 @@ class ClanCommands(commands.Cog):
         sorted_distributed_amounts = sorted(
             distributed_amounts.items(), key=lambda item: item[1], reverse=True
         )
-        count = 0
-        for member_id_str, amount in sorted_distributed_amounts:
-            if count >= 25:  # Limite do Discord para fields em um embed
-                embed.add_field(
-                    name="...", value="E mais membros receberam dinheiro.", inline=False
-                )
-                break
-            member_name = await self._get_user_display_name(int(member_id_str))
-            embed.add_field(name=member_name, value=display_money(amount), inline=True)
-            count += 1
+        # Limite do Discord para fields em um embed: nomes buscados de uma vez só para quem aparece
+        shown = sorted_distributed_amounts[:25]
+        names = await self.bot.names.resolve_many(member_id_str for member_id_str, _ in shown)
+        for member_id_str, amount in shown:
+            embed.add_field(name=names[int(member_id_str)], value=display_money(amount), inline=True)
+        if len(sorted_distributed_amounts) > len(shown):
+            embed.add_field(
+                name="...", value="E mais membros receberam dinheiro.", inline=False
+            )
 
         embed.set_footer(text="Tesouraria do clã zerada para a próxima arrecadação.")
         await interaction.followup.send(embed=embed)
@@ -304,7 +285,7 @@ class ClanCommands(commands.Cog):
                 # Caso o player_data tenha um clan_id, mas o clã não exista mais no banco de dados.
                 # Isso limpa o dado inconsistente do jogador.
                 player_data["clan_id"] = None
-                data_manager.save_data()
+                data_manager.save_data(player_id)
                 await interaction.followup.send(
                     "Seu registro de clã estava inconsistente e foi corrigido. Por favor, tente criar novamente.",
                     ephemeral=True,
@@ -351,10 +332,10 @@ class ClanCommands(commands.Cog):
             "last_ranking_timestamp": 0,
         }
 
-        data_manager.clan_database[clan_id] = new_clan
+        data_manager.clan_database[clan_id] = Clan.from_dict(new_clan)
         player_data["clan_id"] = clan_id
-        data_manager.save_clan_data()
-        data_manager.save_data()
+        data_manager.save_clan_data(clan_id)
+        data_manager.save_data(player_id)
 
         embed = discord.Embed(
             title=f"🛡️ Clã '{nome}' Criado!",
@@ -392,7 +373,7 @@ class ClanCommands(commands.Cog):
             else:
                 # Limpa o clan_id inconsistente do jogador
                 player_data["clan_id"] = None
-                data_manager.save_data()
+                data_manager.save_data(player_id)
                 await interaction.followup.send(
                     "Seu registro de clã estava inconsistente e foi corrigido. Por favor, tente entrar novamente.",
                     ephemeral=True,
@@ -409,7 +390,7 @@ class ClanCommands(commands.Cog):
         # Melhoria de segurança: Garante que 'members' é uma lista
         if not isinstance(clan_data.get("members"), list):
             clan_data["members"] = []  # Reseta para uma lista vazia se for inválido
-            data_manager.save_clan_data()  # Salva a correção
+            data_manager.save_clan_data(clan_data.get("id"))  # Salva a correção
             await interaction.followup.send(
                 "Houve um erro com os dados do clã. Tente novamente em breve.",
                 ephemeral=True,
@@ -425,8 +406,8 @@ class ClanCommands(commands.Cog):
 
         clan_data["members"].append(player_id)
         player_data["clan_id"] = clan_data["id"]
-        data_manager.save_clan_data()
-        data_manager.save_data()
+        data_manager.save_clan_data(clan_data.get("id"))
+        data_manager.save_data(player_id)
 
         embed = discord.Embed(
             title=f"🎉 Entrou no Clã '{clan_data['name']}'!",
@@ -439,14 +420,10 @@ class ClanCommands(commands.Cog):
         # Notifica o líder
         leader_id = clan_data.get("leader")  # Usa .get() aqui também
         if leader_id:
-            leader = self.bot.get_user(int(leader_id))
-            if leader:
-                try:
-                    await leader.send(
-                        f"👥 {interaction.user.display_name} se juntou ao seu clã, **{clan_data['name']}**!"
-                    )
-                except discord.Forbidden:
-                    pass  # Não pode enviar DM, ignora
+            self.bot.notifications.notify(
+                leader_id,
+                f"👥 {interaction.user.display_name} se juntou ao seu clã, **{clan_data['name']}**!",
+            )
 
     @clan.command(name="sair", description="Sai do seu clã atual.")
     async def leave(self, interaction: discord.Interaction):
@@ -466,7 +443,7 @@ class ClanCommands(commands.Cog):
 
         if not clan_data:
             player_data["clan_id"] = None
-            data_manager.save_data()
+            data_manager.save_data(player_id)
             await interaction.followup.send(
                 "Erro: O clã ao qual você estava vinculado não existe mais. Seu registro foi atualizado.",
                 ephemeral=True,
@@ -478,8 +455,8 @@ class ClanCommands(commands.Cog):
             if len(clan_data.get("members", [])) == 1:  # Usa .get() para 'members'
                 del data_manager.clan_database[clan_id]
                 player_data["clan_id"] = None
-                data_manager.save_clan_data()
-                data_manager.save_data()
+                data_manager.save_clan_data(clan_id)
+                data_manager.save_data(player_id)
                 await interaction.followup.send(
                     f"Você saiu do clã **{clan_data['name']}** e, como era o último membro, o clã foi dissolvido. 💔",
                     ephemeral=True,
@@ -498,7 +475,7 @@ class ClanCommands(commands.Cog):
             or player_id not in clan_data["members"]
         ):
             player_data["clan_id"] = None  # Remove o vínculo inconsistente do jogador
-            data_manager.save_data()
+            data_manager.save_data(player_id)
             await interaction.followup.send(
                 "Você não parece ser um membro válido deste clã. Seu registro foi corrigido.",
                 ephemeral=True,
@@ -507,8 +484,8 @@ class ClanCommands(commands.Cog):
 
         clan_data["members"].remove(player_id)
         player_data["clan_id"] = None
-        data_manager.save_clan_data()
-        data_manager.save_data()
+        data_manager.save_clan_data(clan_id)
+        data_manager.save_data(player_id)
 
         embed = discord.Embed(
             title=f"🚶 Saiu do Clã '{clan_data['name']}'",
@@ -519,14 +496,10 @@ class ClanCommands(commands.Cog):
 
         # Notificar o líder
         if leader_id and leader_id != player_id:
-            leader = self.bot.get_user(int(leader_id))
-            if leader:
-                try:
-                    await leader.send(
-                        f"💔 {interaction.user.display_name} saiu do seu clã, **{clan_data['name']}**."
-                    )
-                except discord.Forbidden:
-                    pass
+            self.bot.notifications.notify(
+                leader_id,
+                f"💔 {interaction.user.display_name} saiu do seu clã, **{clan_data['name']}**.",
+            )
 
     @clan.command(
         name="info", description="Exibe informações sobre o seu clã ou outro clã."
@@ -551,7 +524,7 @@ class ClanCommands(commands.Cog):
             if not clan_data:
                 # Dados inconsistentes, limpa o clan_id do jogador
                 player_data["clan_id"] = None
-                data_manager.save_data()
+                data_manager.save_data(player_id)
                 await interaction.followup.send(
                     "Erro: O clã ao qual você estava vinculado não existe mais. Seu registro foi atualizado.",
                     ephemeral=True,
@@ -566,34 +539,27 @@ class ClanCommands(commands.Cog):
 
         # TRATAMENTO PARA KeyError: 'leader', 'members', 'money', 'xp', 'created_at'
         leader_id = clan_data.get("leader")
+        member_ids = clan_data.get(
+            "members", []
+        )  # Garante que é uma lista vazia se 'members' não existir
+
+        # Todos os nomes (líder e membros) de uma vez, com as buscas na API em paralelo
+        names = await self.bot.names.resolve_many(
+            list(member_ids) + ([leader_id] if leader_id else [])
+        )
         if not leader_id:
             leader_name = "Líder Desconhecido (Dados Corrompidos)"
             # Tenta encontrar um líder entre os membros se não houver um 'leader' explícito
-            if clan_data.get("members"):
-                leader_name = (
-                    await self._get_user_display_name(int(clan_data["members"][0]))
-                    + " (Líder Padrão)"
-                )
+            if member_ids:
+                leader_id = member_ids[0]
+                leader_name = names[int(leader_id)] + " (Líder Padrão)"
         else:
-            leader_name = await self._get_user_display_name(int(leader_id))
+            leader_name = names[int(leader_id)]
 
-        member_ids = clan_data.get(
-            "members", []
-        )  # Garante que é uma lista vazia se 'members' não existir
-        member_names = []
-        for member_id in member_ids:
-            member_names.append(await self._get_user_display_name(int(member_id)))
-
-        # Ordenar membros e líderes para exibição
-        # Evita adicionar "Líder Desconhecido" na lista de membros normais se for um fallback
-        display_members = [
-            name
-            for name in member_names
-            if name != leader_name
-            and name
-            != (await self._get_user_display_name(int(leader_id)) if leader_id else "")
-        ]
-        display_members_sorted = sorted(display_members)
+        # Ordenar membros para exibição (o líder aparece só na primeira linha)
+        display_members_sorted = sorted(
+            names[int(member_id)] for member_id in member_ids if member_id != leader_id
+        )
 
         members_list_str = f"👑 {leader_name} (Líder)\n" + "\n".join(
             [f"👤 {m}" for m in display_members_sorted]
@@ -649,11 +615,8 @@ class ClanCommands(commands.Cog):
             )
             return
 
-        sorted_clans = sorted(
-            data_manager.clan_database.values(),
-            key=lambda x: x.get("xp", 0),  # Usa .get() para XP
-            reverse=True,
-        )
+        # Índice ordenado por XP mantido pelo data_manager
+        sorted_clans = [clan_data for _, clan_data in data_manager.top_clans(10)]
 
         embed = discord.Embed(
             title="🏆 Ranking dos Clãs Mais Fortes 🏆",
@@ -664,24 +627,24 @@ class ClanCommands(commands.Cog):
         if not sorted_clans:
             embed.description = "Nenhum clã para ranquear."
         else:
-            for i, clan_data in enumerate(sorted_clans[:10]):
+            # Líder de cada clã: o 'leader' ou, se faltar, o primeiro membro
+            leader_ids = []
+            for clan_data in sorted_clans:
                 leader_id = clan_data.get("leader")
-                leader_name = "Líder Desconhecido"  # Default value
+                members = clan_data.get("members")
+                if not leader_id and isinstance(members, list) and members:
+                    leader_id = members[0]
+                leader_ids.append(leader_id)
+            names = await self.bot.names.resolve_many(
+                leader_id for leader_id in leader_ids if leader_id
+            )
 
+            for i, (clan_data, leader_id) in enumerate(zip(sorted_clans, leader_ids)):
+                leader_name = "Líder Desconhecido"  # Default value
                 if leader_id:
-                    leader_name = await self._get_user_display_name(int(leader_id))
-                elif clan_data.get("members"):
-                    # Fallback: if 'leader' is missing, try to use the first member
-                    # Ensure 'members' is a list and not empty before trying to access index 0
-                    if (
-                        isinstance(clan_data.get("members"), list)
-                        and clan_data["members"]
-                    ):
-                        first_member_id = clan_data["members"][0]
-                        leader_name = (
-                            await self._get_user_display_name(int(first_member_id))
-                            + " (Líder Padrão)"
-                        )
+                    leader_name = names[int(leader_id)]
+                    if not clan_data.get("leader"):
+                        leader_name += " (Líder Padrão)"
                 # else, it remains "Líder Desconhecido" if no leader_id and no members
 
                 embed.add_field(
@@ -746,8 +709,8 @@ class ClanCommands(commands.Cog):
         if target_player_data:
             target_player_data["clan_id"] = None
 
-        data_manager.save_clan_data()
-        data_manager.save_data()
+        data_manager.save_clan_data(clan_id)
+        data_manager.save_data(target_id)
 
         embed = discord.Embed(
             title="🚫 Membro Expulso",
@@ -756,12 +719,10 @@ class ClanCommands(commands.Cog):
         )
         await interaction.followup.send(embed=embed)
 
-        try:
-            await membro.send(
-                f"Você foi expulso do clã **{clan_data['name']}** pelo líder {interaction.user.display_name}."
-            )
-        except discord.Forbidden:
-            pass
+        self.bot.notifications.notify(
+            membro.id,
+            f"Você foi expulso do clã **{clan_data['name']}** pelo líder {interaction.user.display_name}.",
+        )
 
     @clan.command(
         name="transferir",
@@ -813,7 +774,7 @@ class ClanCommands(commands.Cog):
         new_leader_name = novo_lider.display_name
 
         clan_data["leader"] = new_leader_id
-        data_manager.save_clan_data()
+        data_manager.save_clan_data(clan_id)
 
         embed = discord.Embed(
             title="👑 Liderança Transferida!",
@@ -825,12 +786,10 @@ class ClanCommands(commands.Cog):
         )
         await interaction.followup.send(embed=embed)
 
-        try:
-            await novo_lider.send(
-                f"Parabéns! Você é o novo líder do clã **{clan_data['name']}**!"
-            )
-        except discord.Forbidden:
-            pass
+        self.bot.notifications.notify(
+            novo_lider.id,
+            f"Parabéns! Você é o novo líder do clã **{clan_data['name']}**!",
+        )
 
     @app_commands.command(
         name="forcar_recompensa",
@@ -6,6 +6,7 @@ from datetime import datetime
 
 from data_manager import (
     get_player_data,
+    get_energy,
     save_data,
     player_database,
 )
@@ -25,6 +26,7 @@ from config import (
 from custom_checks import (
     check_player_exists,
     is_in_wilderness,
+    user_cooldown,
 )
 from utils import (
     calculate_effective_stats,
@@ -42,7 +44,7 @@ class CombatCommands(commands.Cog):
     )
     @app_commands.check(check_player_exists)
     @app_commands.check(is_in_wilderness)
-    @app_commands.checks.cooldown(1, 15, key=lambda i: i.user.id)
+    @user_cooldown("cacar", 15)
     async def cacar(self, i: Interaction):
         player_data = get_player_data(i.user.id)
         if player_data.get("status") == "dead":
@@ -61,14 +63,14 @@ class CombatCommands(commands.Cog):
 
         enemy_template = random.choice(location_enemies)
         enemy = enemy_template.copy()
-        await run_turn_based_combat(self.bot, i, player_data, enemy)
+        await run_turn_based_combat(self.bot, i, i.user.id, enemy)
 
     @app_commands.command(
         name="batalhar",
         description="Enfrenta um Ex-Cavaleiro para testar sua força (combate por turnos).",
     )
     @app_commands.check(check_player_exists)
-    @app_commands.checks.cooldown(1, 30, key=lambda i: i.user.id)
+    @user_cooldown("batalhar", 30)
     @app_commands.describe(
         primeiro_ataque="Escolha seu ataque inicial: Básico ou Especial."
     )
@@ -96,7 +98,7 @@ class CombatCommands(commands.Cog):
                 ),
             )
 
-            if player_data.get("energy", 0) < cost_energy_special:
+            if get_energy(player_data) < cost_energy_special:
                 await i.response.send_message(
                     f"Você não tem energia suficiente ({cost_energy_special}) para um Ataque Especial inicial! Use Ataque Básico ou recupere energia.",
                     ephemeral=True,
@@ -113,7 +115,7 @@ class CombatCommands(commands.Cog):
             "money": 400,
             "thumb": "https://c.tenor.com/ebFt6wJWEu8AAAAC/tenor.gif",
         }
-        await run_turn_based_combat(self.bot, i, player_data, enemy)
+        await run_turn_based_combat(self.bot, i, i.user.id, enemy)
 
     @app_commands.command(name="atacar", description="Ataca outro jogador em um duelo.")
     @app_commands.check(check_player_exists)
@@ -22,20 +22,26 @@ import random # Needed for random selection in get_random_relic
 from data_manager import (
     get_player_data,
     save_data,
+    mutate_player,
+    player_lock,
     player_database,
+    wait_until_loaded,
     add_item_to_inventory,
     add_user_money,
     add_user_energy,
     check_and_add_keys,
     get_time_until_next_key_claim,
+    get_relic_keys,
+    next_key_time,
 )
 from config import (
-    ITEMS_DATA, # Used to get relic info by ID in /inventory
+    KEY_READY_DM_ENABLED,
 )
 from custom_checks import check_player_exists
 
-from relics import relics # Assuming relics.py exports a list named 'relics'
-from game_logic.relic_mechanics import get_random_relic # This function should pull from the 'relics' list
+from game_logic.relic_catalog import relic_catalog # Relíquias por ID/nome/tier
+from game_logic.relic_mechanics import get_random_relic # Sorteia entradas do catálogo (com "id" e "name")
+from game_logic.timers import TimerQueue
 
 from utils import (
     format_cooldown, # Retained for displaying key cooldowns
@@ -72,6 +78,11 @@ class OpenChestView(View):
             )
             return
 
+        # Um baú por vez para o mesmo jogador (a chave é consumida após o await do defer)
+        async with player_lock(self.user_id):
+            await self._open_chest(interaction)
+
+    async def _open_chest(self, interaction: discord.Interaction):
         await interaction.response.defer()
 
         user_data = get_player_data(str(self.user_id))
@@ -86,11 +97,11 @@ class OpenChestView(View):
             self.stop()
             return
 
-        user_data["relic_keys"] = user_data.get("relic_keys", 0) - 1
-        save_data()
+        mutate_player(self.user_id, "relic_keys", "add", -1)
+        self.relic_commands_cog.schedule_key_ready(self.user_id)  # Saiu do limite: volta a acumular
 
         # Add the relic to inventory and grant rewards
-        # Assuming gained_relic has an 'id' field that matches ITEMS_DATA keys
+        # gained_relic é uma entrada do relic_catalog ("id" estável)
         add_item_to_inventory(str(self.user_id), self.gained_relic["id"], 1)
         add_user_money(str(self.user_id), self.gained_relic.get("valor_moedas", 0))
         add_user_energy(str(self.user_id), self.gained_relic.get("energia_concedida", 0))
@@ -143,48 +154,52 @@ class OpenChestView(View):
 class RelicCommands(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.key_generation_task.start()
+        # As chaves são calculadas na leitura (get_relic_keys/check_and_add_keys).
+        # Esta fila só guarda, por jogador, quando a próxima chave fica pronta,
+        # para o aviso opcional por DM; não há varredura periódica dos jogadores.
+        self.key_timers = TimerQueue()
+        self.key_timer_task = None
+
+    async def cog_load(self):
+        if not KEY_READY_DM_ENABLED:
+            return
+        self.key_timer_task = asyncio.create_task(self._run_key_timers())
+
+    async def _run_key_timers(self):
+        await wait_until_loaded()  # Os jogadores carregam em segundo plano
+        for user_id_str, user_data in player_database.items():
+            self.schedule_key_ready(user_id_str, user_data)
+        await self.key_timers.run(self._on_key_ready)
 
     def cog_unload(self):
-        self.key_generation_task.cancel()
-
-    @tasks.loop(minutes=1)
-    async def key_generation_task(self):
-        all_user_data = player_database
-
-        # Iterate over a copy of keys to avoid RuntimeError: dictionary changed size during iteration if player_database is modified
-        user_ids_to_check = list(all_user_data.keys()) #
-
-        for user_id_str in user_ids_to_check:
-            if not user_id_str.isdigit(): #
-                print(f"AVISO: Chave inválida encontrada no player_database durante geração de chaves: '{user_id_str}'. Ignorando.") #
-                continue #
-            user_id = int(user_id_str) #
-            keys_added = check_and_add_keys(user_id)
-
-            if keys_added > 0:
-                print(f"Adicionadas {keys_added} chaves para o usuário {user_id}")
-                user = self.bot.get_user(user_id)
-                if user is None:
-                    try:
-                        user = await self.bot.fetch_user(user_id)
-                    except discord.NotFound:
-                        user = None
-
-                if user:
-                    try:
-                        await user.send(
-                            f"Você recebeu {keys_added} chaves de baú! Use-as com `/bau`."
-                        )
-                    except discord.Forbidden:
-                        print(f"Não foi possível enviar DM para {user.name} ({user.id}).")
-                    except Exception as e:
-                        print(f"Erro ao enviar DM para {user.id}): {e}")
-
-    @key_generation_task.before_loop
-    async def before_key_generation(self):
+        if self.key_timer_task:
+            self.key_timer_task.cancel()
+
+    def schedule_key_ready(self, user_id, user_data: dict = None):
+        """(Re)agenda o aviso da próxima chave do jogador, ou o cancela se ele estiver no limite."""
+        if not KEY_READY_DM_ENABLED:
+            return
+        user_id_str = str(user_id)
+        if user_data is None:
+            user_data = player_database.get(user_id_str)
+        due = next_key_time(user_data) if user_data else None
+        if due is None:
+            self.key_timers.cancel(user_id_str)
+        else:
+            self.key_timers.schedule(user_id_str, due)
+
+    async def _on_key_ready(self, user_id_str: str, payload):
         await self.bot.wait_until_ready()
-        print("Tarefa de geração de chaves iniciada e aguardando bot pronto.")
+        if not user_id_str.isdigit():
+            return
+        keys_added = check_and_add_keys(user_id_str)
+        self.schedule_key_ready(user_id_str)
+
+        if keys_added > 0:
+            # Fila de DMs: o envio (e o fetch_user, se preciso) não segura os timers
+            self.bot.notifications.notify(
+                user_id_str, f"Você recebeu {keys_added} chaves de baú! Use-as com `/bau`."
+            )
 
     def _get_tier_color(self, tier: str) -> Color:
         """Returns a color for the embed based on the relic's tier."""
@@ -211,6 +226,7 @@ class RelicCommands(commands.Cog):
 
         # Ensure keys are updated before checking
         check_and_add_keys(interaction.user.id)
+        self.schedule_key_ready(interaction.user.id)
         user_data = get_player_data(user_id)
 
         keys_available = user_data.get("relic_keys", 0)
@@ -233,9 +249,8 @@ class RelicCommands(commands.Cog):
             await interaction.edit_original_response(embed=no_keys_embed)
             return
 
-        # Get a random relic from the 'relics' list (from relics.py)
-        # Assuming get_random_relic correctly picks from `relics` and formats it
-        gained_relic = get_random_relic(relics) # Pass the relics list to the function
+        # Sorteia uma relíquia do catálogo (sorteador padrão, montado na importação)
+        gained_relic = get_random_relic()
         
         # Ensure gained_relic has expected keys, provide defaults if not
         relic_tier = gained_relic.get("tier", "Básica")
@@ -270,33 +285,26 @@ class RelicCommands(commands.Cog):
         user_id = str(interaction.user.id)
         user_data = get_player_data(user_id)
         
-        # Now inventory should pull from 'relics_inventory'
-        inventory_relic_ids = user_data.get("relics_inventory", []) 
+        # relics_inventory: {ID do catálogo: quantidade}
+        relic_counts = user_data.get("relics_inventory", {})
 
-        if not inventory_relic_ids:
+        if not relic_counts:
             embed = Embed(
                 title="Seu Inventário de Relíquias",
                 description="Você ainda não possui nenhuma relíquia. Use `/bau` para tentar a sorte!",
                 color=Color.blue(),
             )
         else:
-            relic_counts = {}
-            for relic_id in inventory_relic_ids:
-                relic_counts[relic_id] = relic_counts.get(relic_id, 0) + 1
-
             display_items = []
             for relic_id, count in relic_counts.items():
-                relic_info = ITEMS_DATA.get(relic_id) # Get relic info from ITEMS_DATA
-                if relic_info:
+                relic_info = relic_catalog.get(relic_id)
+                if relic_info and count > 0:
                     display_items.append(
-                        {"name": relic_info.get('name', relic_id), "count": count, "tier": relic_info.get('tier', 'Desconhecido')}
+                        {"name": relic_info["name"], "count": count, "tier": relic_info["tier"], "index": relic_info["index"]}
                     )
 
-            tier_order = {
-                "Mítica": 6, "Épica": 5, "Rara": 4, "Incomum": 3, "Comum": 2, "Básica": 1, "Desconhecido": 0
-            }
-            # Sort by tier (descending), then by name (ascending)
-            display_items.sort(key=lambda x: (tier_order.get(x["tier"], 0), x["name"]), reverse=True)
+            # Sort by tier (descending), then by name (ascending); a posição no catálogo desfaz empates
+            display_items.sort(key=lambda x: (-relic_catalog.tier_rank(x["tier"]), x["name"], x["index"]))
 
             inventory_text = ""
             for item in display_items:
@@ -310,6 +318,7 @@ class RelicCommands(commands.Cog):
                 color=Color.blue(),
             )
 
+        embed.set_footer(text=f"Chaves de baú: {get_relic_keys(user_data)}. Use /bau para abrir um baú.")
         await interaction.response.send_message(embed=embed)
 
 
@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands, Embed, Color, Interaction
 from datetime import timedelta, datetime
 
-from data_manager import get_player_data, save_data
+from data_manager import get_player_data, mutate_player
 from custom_checks import check_player_exists
 from views.help_view import HelpView
 from config import ITEMS_DATA, CLASS_TRANSFORMATIONS
@@ -72,8 +72,7 @@ class UtilityCommands(commands.Cog):
             await i.response.send_message("Você já está em modo AFK.", ephemeral=True)
             return
 
-        player_data["status"] = "afk"
-        save_data()
+        mutate_player(i.user.id, "status", "set", "afk")
         await i.response.send_message(
             "🌙 Você entrou em modo AFK. Use `/voltar` para ficar online."
         )
@@ -94,9 +93,8 @@ class UtilityCommands(commands.Cog):
             await i.response.send_message("Você não está em modo AFK.", ephemeral=True)
             return
 
-        player_data["status"] = "online"
-        player_data["cooldowns"]["afk_cooldown"] = datetime.now().timestamp()
-        save_data()
+        mutate_player(i.user.id, "status", "set", "online")
+        mutate_player(i.user.id, "cooldowns", "set", datetime.now().timestamp(), key="afk_cooldown")
         await i.response.send_message(
             "🟢 Você está online novamente! O cooldown para usar `/afk` outra vez começou."
         )
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 
 from data_manager import ( # Changed from ..data_manager to data_manager
     get_player_data,
-    save_data,
+    mutate_player,
     player_database,
 )
 from config import ( # Changed from ..config to config
@@ -18,6 +18,7 @@ from custom_checks import ( # Changed from ..custom_checks to custom_checks
     check_player_exists,
     is_in_city,
     is_not_in_city,
+    user_cooldown,
 ) # Alterado para importação relativa
 from utils import ( # Changed from ..utils to utils
     format_cooldown,
@@ -35,7 +36,7 @@ class WorldCommands(commands.Cog):
     )
     @app_commands.check(check_player_exists)
     @app_commands.check(is_in_city)
-    @app_commands.checks.cooldown(1, 60, key=lambda i: i.user.id)  # 1 minuto de cooldown
+    @user_cooldown("viajar", 60)  # 1 minuto de cooldown
     async def viajar(self, i: Interaction, destino: str):
         player_data = get_player_data(i.user.id)
         current_location_name = player_data.get("location")
@@ -96,9 +97,8 @@ class WorldCommands(commands.Cog):
                 )
                 return
 
-        player_data["location"] = destino
-        player_data["hp"] = player_data["max_hp"]  # Cura completa ao viajar
-        save_data()
+        mutate_player(i.user.id, "location", "set", destino)
+        mutate_player(i.user.id, "hp", "set", player_data["max_hp"])  # Cura completa ao viajar
 
         embed = Embed(
             title=f"🗺️ Viagem Concluída!",
@@ -167,7 +167,7 @@ class WorldCommands(commands.Cog):
     )
     @app_commands.check(check_player_exists)
     @app_commands.check(is_not_in_city)
-    @app_commands.checks.cooldown(1, 300, key=lambda i: i.user.id) # 5 minutos de cooldown para renascer
+    @user_cooldown("renascer", 300) # 5 minutos de cooldown para renascer
     async def renascer(self, i: Interaction): # Renamed function as well
         player_data = get_player_data(i.user.id)
 
@@ -175,10 +175,9 @@ class WorldCommands(commands.Cog):
             await i.response.send_message("Você não está morto!", ephemeral=True)
             return
 
-        player_data["hp"] = player_data["max_hp"] # Restaura HP
-        player_data["status"] = "online" # Altera status para online
-        player_data["location"] = STARTING_LOCATION # Retorna ao Abrigo dos Foras-da-Lei
-        save_data()
+        mutate_player(i.user.id, "hp", "set", player_data["max_hp"]) # Restaura HP
+        mutate_player(i.user.id, "status", "set", "online") # Altera status para online
+        mutate_player(i.user.id, "location", "set", STARTING_LOCATION) # Retorna ao Abrigo dos Foras-da-Lei
 
         embed = Embed(
             title="✨ Você Renasceu!",
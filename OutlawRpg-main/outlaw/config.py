@@ -3,6 +3,8 @@
 # --- CONFIGURAÇÕES DE GAME DESIGN ---
 XP_PER_LEVEL_BASE = 150
 XP_PER_MESSAGE_COOLDOWN_SECONDS = 60
+XP_PER_MESSAGE = 1  # XP base por mensagem no chat (antes dos multiplicadores)
+XP_PER_MESSAGE_FLUSH_SECONDS = 5  # O XP do chat é aplicado em lote a cada 5 segundos
 ATTRIBUTE_POINTS_PER_LEVEL = 2
 CRITICAL_CHANCE = 0.10
 CRITICAL_MULTIPLIER = 1.5
@@ -14,11 +16,49 @@ REVIVE_COST = 55
 BOUNTY_PERCENTAGE = 0.20
 TRANSFORM_COST = 2
 MAX_ENERGY = 10
+ENERGY_REGEN_SECONDS = 60  # 1 de energia a cada 60 segundos (calculado na leitura, veja data_manager.get_energy)
 STARTING_LOCATION = "Abrigo dos Foras-da-Lei"
 
 # NEW: Relic System Configuration (Added these two lines!)
 HOURS_BETWEEN_KEY_CLAIMS = 1 # Players can claim a new relic key every 1 hour
 MAX_RELIC_KEYS = 3          # Maximum number of relic keys a player can hold
+KEY_READY_DM_ENABLED = True  # Envia DM quando uma nova chave fica disponível (agendado por jogador)
+
+# NOVO: Persistência write-behind (data_manager.flush)
+SAVE_FLUSH_INTERVAL_SECONDS = 60  # Grava os registros modificados pelo menos a cada 60 segundos
+SAVE_DIRTY_THRESHOLD = 200  # ...ou antes, assim que houver 200 registros modificados
+SAVE_CHECK_TICK_SECONDS = 5  # Frequência com que o bot verifica se deve gravar
+
+# NOVO: Backend de armazenamento ("json" ou "sqlite").
+# Para migrar os dados existentes: python -m storage.migrate_json_to_sqlite
+STORAGE_BACKEND = "json"
+SQLITE_DATABASE_FILE = "outlaws.db"  # Relativo à pasta 'outlaw'
+
+# NOVO: Snapshots do backend JSON
+SNAPSHOT_ENCODING = "json"  # "json" (indentado), "compact" (sem indentação/orjson) ou "msgpack"
+SNAPSHOT_GENERATIONS = 3  # Cópias anteriores mantidas como outlaws_data.json.1, .2, ...
+
+# NOVO: Journal de alterações dos jogadores (reaplicado sobre o snapshot ao iniciar)
+JOURNAL_ENABLED = True
+JOURNAL_FSYNC = False  # True: fsync a cada alteração (sobrevive a queda de energia, mais lento)
+JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024  # Grava um snapshot quando o journal passar de 4 MB
+
+# NOVO: Carregamento dos jogadores (data_manager.load_data/load_data_async)
+LOAD_PLAYERS_IN_BACKGROUND = True  # O bot conecta e atende os jogadores já lidos enquanto o resto carrega
+LOAD_BATCH_SIZE = 2000  # Registros lidos por vez na thread de carregamento
+LOAD_PROGRESS_INTERVAL_SECONDS = 2  # Intervalo entre as mensagens de progresso
+
+# NOVO: Fila de DMs (notifications.py)
+DM_WORKERS = 2  # Envios de DM em paralelo
+DM_GLOBAL_RATE_PER_SECOND = 5  # Limite de DMs por segundo para todo o bot
+DM_PER_USER_INTERVAL_SECONDS = 10  # Intervalo mínimo entre DMs para o mesmo jogador (avisos juntados em uma)
+DM_CLOSED_RETRY_SECONDS = 6 * 3600  # Quem não aceita DMs só é tentado de novo depois de 6 horas
+DM_METRICS_INTERVAL_MINUTES = 30  # Intervalo do resumo da fila de DMs no log
+DM_SHUTDOWN_DRAIN_SECONDS = 5  # Ao desligar, tempo máximo esperando a fila de DMs esvaziar
+
+# NOVO: Cache de nomes de exibição (name_resolver.py)
+NAME_CACHE_SIZE = 5000  # Nomes buscados na API mantidos em memória (os menos usados saem primeiro)
+NAME_CACHE_TTL_SECONDS = 600  # Validade de um nome em cache (mudanças de nome aparecem em até 10 minutos)
 
 # NEW: Clan System Configuration
 CLAN_RANK_REWARDS = {  # XP and Money rewards for top 3 clans
@@ -676,6 +716,7 @@ LEVEL_ROLES = {
 }
 
 NEW_CHARACTER_ROLE_ID = 1388628499182518352
+ROLE_SYNC_EDIT_INTERVAL_SECONDS = 1  # Intervalo entre edições de cargos (uma edição por membro)
 
 DEFAULT_PLAYER_BOSS_DATA = {}  # Conteúdo removido e vazio
 
@@ -1,6 +1,7 @@
 from discord import app_commands, Interaction
-from data_manager import get_player_data
+from data_manager import PlayerDataLoading, get_player_data
 from config import WORLD_MAP, STARTING_LOCATION
+from game_logic.cooldowns import cooldown_store
 
 
 class NotInCity(app_commands.CheckFailure):
@@ -15,9 +16,43 @@ class NotInWilderness(app_commands.CheckFailure):
     pass
 
 
+class DataLoading(app_commands.CheckFailure):
+    """Raised when the player's data has not been loaded yet (background load still running)."""
+
+    pass
+
+
+def _get_player(i: Interaction):
+    """get_player_data for checks: a player not loaded yet becomes a CheckFailure."""
+    try:
+        return get_player_data(i.user.id)
+    except PlayerDataLoading:
+        raise DataLoading(
+            "⏳ Os dados dos jogadores ainda estão carregando. Tente novamente em alguns segundos."
+        ) from None
+
+
+def user_cooldown(name: str, seconds: float):
+    """
+    Per-user cooldown check backed by the shared CooldownStore `name`.
+    Replaces app_commands.checks.cooldown, whose cache is swept in full on
+    every use; raises the same CommandOnCooldown for the global error handler.
+    """
+    store = cooldown_store(name, seconds)
+    cooldown = app_commands.Cooldown(1, seconds)
+
+    def predicate(i: Interaction):
+        retry_after = store.acquire(i.user.id)
+        if retry_after:
+            raise app_commands.CommandOnCooldown(cooldown, retry_after)
+        return True
+
+    return app_commands.check(predicate)
+
+
 def check_player_exists(i: Interaction):
     """Checks if the interacting user has a character profile and is not AFK."""
-    p = get_player_data(i.user.id)
+    p = _get_player(i)
     if not p:
         raise app_commands.CheckFailure(
             "Você não possui uma ficha de personagem. Crie uma com `/criar_ficha`!"
@@ -31,7 +66,7 @@ def check_player_exists(i: Interaction):
 
 def is_in_city(i: Interaction):
     """Checks if the player's current location is a 'city' type."""
-    player_data = get_player_data(i.user.id)
+    player_data = _get_player(i)
     if not player_data:
         raise app_commands.CheckFailure("Você não possui uma ficha de personagem.")
 
@@ -47,7 +82,7 @@ def is_in_city(i: Interaction):
 
 def is_in_wilderness(i: Interaction):
     """Checks if the player's current location is a 'wilderness' type."""
-    player_data = get_player_data(i.user.id)
+    player_data = _get_player(i)
     if not player_data:
         raise app_commands.CheckFailure("Você não possui uma ficha de personagem.")
 
@@ -63,7 +98,7 @@ def is_in_wilderness(i: Interaction):
 
 def is_not_in_city(i: Interaction):
     """Checks if the player's current location is NOT a 'city' type."""
-    player_data = get_player_data(i.user.id)
+    player_data = _get_player(i)
     if not player_data:
         raise app_commands.CheckFailure("Você não possui uma ficha de personagem.")
 
@@ -1,100 +1,880 @@
 # File: OutlawRpg-main/outlaw/data_manager.py
 
-import json
+import asyncio
+import contextlib
+import gc
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
 # Importar constantes do arquivo de configuração
 from config import (
-    INITIAL_MONEY,
-    INITIAL_HP,
-    INITIAL_ATTACK,
-    INITIAL_SPECIAL_ATTACK,
     MAX_ENERGY,
+    ENERGY_REGEN_SECONDS,
     STARTING_LOCATION,
     NEW_CHARACTER_ROLE_ID,
     DEFAULT_CLAN_XP,
     INITIAL_CLAN_DATA,
-    ATTRIBUTE_POINTS_PER_LEVEL, # Added this, as it's used in get_player_data
     HOURS_BETWEEN_KEY_CLAIMS, # Added for check_and_add_keys and get_time_until_next_key_claim
     MAX_RELIC_KEYS, # Added for check_and_add_keys
+    SAVE_FLUSH_INTERVAL_SECONDS,
+    SAVE_DIRTY_THRESHOLD,
+    STORAGE_BACKEND,
+    SQLITE_DATABASE_FILE,
+    SNAPSHOT_ENCODING,
+    SNAPSHOT_GENERATIONS,
+    JOURNAL_ENABLED,
+    JOURNAL_FSYNC,
+    JOURNAL_COMPACT_BYTES,
+    LOAD_BATCH_SIZE,
+    LOAD_PROGRESS_INTERVAL_SECONDS,
 )
+from game_logic.relic_catalog import relic_catalog
+from models import Clan, Player, Record, to_plain
+from storage.indexes import GroupIndex, Leaderboard
+from storage.journal import Journal, apply_mutation
+from storage.migrations import SCHEMA_VERSION_KEY, MigrationRegistry
+from storage.json_backend import JsonBackend
 
 
 # Caminhos dos arquivos de dados
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PLAYER_DATA_FILE = os.path.join(SCRIPT_DIR, "outlaws_data.json")
 CLAN_DATA_FILE = os.path.join(SCRIPT_DIR, "clans_data.json")
+SQLITE_DATA_FILE = os.path.join(SCRIPT_DIR, SQLITE_DATABASE_FILE)
+JOURNAL_PREFIX = os.path.join(SCRIPT_DIR, "outlaws_journal")
 
 # Bancos de dados em memória
 player_database = {}
 clan_database = {}
-data_lock = threading.Lock()  # Para evitar condições de corrida ao salvar/carregar
+
+# --- Modelo de concorrência ---
+# Todo o jogo roda na thread do event loop. Uma função síncrona deste módulo
+# (sem await) nunca é interrompida por outra corrotina, então não precisa de
+# lock. Os locks abaixo servem para:
+#   - _snapshot_lock: seções curtas que capturam/substituem os bancos inteiros
+#     (carregar, preparar um snapshot, fechar). É um threading.Lock porque
+#     flush() também pode ser chamado fora do loop (scripts, desligamento).
+#   - player_lock()/clan_lock()/acquire_locks(): asyncio.Lock por jogador/clã
+#     (tabela com LOCK_STRIPES posições) para fluxos que leem, esperam algo
+#     (await) e depois alteram os dados. Nunca bloqueiam o event loop.
+LOCK_STRIPES = 1024
+_snapshot_lock = threading.Lock()
+_player_locks = {}
+_clan_locks = {}
+
+# Controle de escrita (write-behind): registros modificados desde o último flush()
+_dirty_players = set()
+_dirty_clans = set()
+_all_players_dirty = False  # save_data() chamado sem ID: regrava todos os jogadores
+_all_clans_dirty = False  # save_clan_data() chamado sem ID: regrava todos os clãs
+_last_flush_time = time.monotonic()
+
+# Gravações rodam em uma única thread, na ordem em que foram preparadas
+_write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="outlaw-save")
+_save_task = None  # Gravação assíncrona em andamento
+_save_pending = None  # Próxima gravação (no máximo uma na fila)
+
+# Leitura dos jogadores em segundo plano (load_data_async)
+_load_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="outlaw-load")
+
+# Estado do carregamento: nada é lido do disco ao importar o módulo
+_players_loaded = False
+_players_loading = False
+_clans_loaded = False
+_player_load = None  # _PlayerLoad em andamento
+_pending_journal = {}  # ID -> entradas do journal ainda não aplicadas (carregamento em andamento)
+_load_waiters = []  # Futures de wait_until_loaded()
+_LOAD_INSERT_CHUNK = 250  # Jogadores inseridos entre duas pausas do event loop (load_data_async)
+
+# Versão dos atributos efetivos de cada jogador (veja utils.calculate_effective_stats).
+# Toda alteração que muda os atributos precisa chamar bump_stats_version().
+_stats_versions = {}
+
+# Campos do jogador lidos por calculate_effective_stats (além de "<bênção>_active")
+STATS_FIELDS = frozenset((
+    "class", "max_hp", "attack", "special_attack", "strength", "agility",
+    "intelligence", "constitution", "dexterity", "power_style", "inventory",
+    "equipped_items", "current_transformation",
+))
+
+# Modelo de durabilidade:
+#   - Jogadores: toda alteração feita por comandos, views e tarefas passa por
+#     mutate_player() ou create_player() e entra no journal na hora; depois de
+#     uma queda, load_data() a reaplica sobre o último snapshot.
+#   - Campos de jogador só no snapshot (SNAPSHOT_ONLY_PLAYER_FIELDS): alterados
+#     direto no registro + save_data(), gravados no próximo flush (no máximo
+#     SAVE_FLUSH_INTERVAL_SECONDS depois). Uma queda volta ao último snapshot.
+#   - Clãs: só no snapshot (save_clan_data()); o journal é por jogador. Numa
+#     queda, tesouraria, XP e membros do clã voltam ao último flush.
+#   - Migrações de esquema não vão para o journal: são refeitas ao carregar.
+SNAPSHOT_ONLY_PLAYER_FIELDS = frozenset((
+    # Vínculo com o clã: espelho de clan["members"]. Fica só no snapshot, como o
+    # clã, para os dois lados voltarem juntos (gravados no mesmo flush).
+    "clan_id",
+    # Estado de um único combate, zerado no começo de cada batalha
+    "second_chance_used",
+))
+
+# Rankings mantidos a cada save_data()/save_clan_data() (veja storage/indexes.py)
+player_leaderboard = Leaderboard(
+    lambda p: (p.get("kills", 0) or 0, p.get("level", 1) or 0, p.get("money", 0) or 0)
+)
+clan_leaderboard = Leaderboard(lambda c: (c.get("xp", 0) or 0,))
+
+# Índices secundários, atualizados junto com os rankings
+clans_by_name = GroupIndex(lambda c: (c.get("name") or "").casefold() or None)
+players_by_clan = GroupIndex(lambda p: p.get("clan_id") or None)
+players_by_location = GroupIndex(lambda p: p.get("location") or STARTING_LOCATION)
+
+
+def _create_backend():
+    """Instancia o backend de armazenamento configurado em STORAGE_BACKEND."""
+    if STORAGE_BACKEND == "sqlite":
+        from storage.sqlite_backend import SqliteBackend
+
+        return SqliteBackend(SQLITE_DATA_FILE)
+    if STORAGE_BACKEND != "json":
+        print(f"AVISO: STORAGE_BACKEND '{STORAGE_BACKEND}' desconhecido. Usando 'json'.")
+    return JsonBackend(
+        PLAYER_DATA_FILE, CLAN_DATA_FILE, SNAPSHOT_ENCODING, SNAPSHOT_GENERATIONS
+    )
+
+
+_backend = _create_backend()
+_journal = Journal(JOURNAL_PREFIX, JOURNAL_FSYNC) if JOURNAL_ENABLED else None
 
 # --- Funções de Carregamento e Salvamento de Dados ---
+# Nada é carregado ao importar o módulo. O bot chama load_clan_data() e
+# load_data_async(), que lê os jogadores em lotes numa thread e já atende os
+# que foram lidos enquanto o resto do arquivo carrega. Scripts podem chamar
+# load_data(); sem nenhuma chamada, o primeiro acesso pelas funções deste
+# módulo carrega tudo (ensure_loaded). Os bancos são sempre preenchidos no
+# lugar: outros módulos importam player_database/clan_database pelo nome.
+
+
+class PlayerDataLoading(Exception):
+    """O jogador ainda não foi lido do disco (carregamento em segundo plano em andamento)."""
+
+    def __init__(self, user_id: str):
+        super().__init__(f"Os dados do jogador {user_id} ainda estão carregando.")
+        self.user_id = user_id
+
+
+class _PlayerLoad:
+    """
+    Um carregamento dos jogadores. next_batch() lê e converte os registros
+    (pode rodar em outra thread); add()/drain() os inserem no banco (thread
+    do event loop), cada um já com as alterações do journal que são dele.
+    """
+
+    def __init__(self):
+        global _players_loaded, _players_loading, _player_load
+        with _snapshot_lock:
+            _players_loaded = False
+            _players_loading = True
+            _player_load = self
+            player_database.clear()
+            _dirty_players.clear()
+            _pending_journal.clear()
+        self.started = time.perf_counter()
+        self._last_report = self.started
+        self.held = []  # Lidos antes de o seq do journal ser conhecido
+        self.journal_ready = False
+        self.journal_applied = self.journal_skipped = 0
+        self.records = _backend.iter_players(self._report)
+        self._read_journal()  # SQLite: o seq já é conhecido antes da leitura
+
+    def _report(self, fraction: float):
+        now = time.perf_counter()
+        if fraction < 1.0 and now - self._last_report >= LOAD_PROGRESS_INTERVAL_SECONDS:
+            self._last_report = now
+            print(f"Carregando jogadores: {fraction:.0%} ({now - self.started:.1f}s)")
+
+    def next_batch(self, size: int) -> list:
+        """Lê até `size` jogadores, já convertidos em Player. Lista vazia no fim."""
+        batch = []
+        for user_id, player_data in self.records:
+            batch.append((user_id, Player.from_dict(player_data)))
+            if len(batch) >= size:
+                break
+        return batch
+
+    def _read_journal(self) -> bool:
+        """Separa por jogador as entradas do journal posteriores ao snapshot, assim que o seq for conhecido."""
+        if not self.journal_ready:
+            snapshot_seq = _backend.load_journal_seq()
+            if snapshot_seq is None:
+                return False
+            if _journal is not None:
+                for entry in _journal.read_entries(snapshot_seq):
+                    _pending_journal.setdefault(entry["uid"], []).append(entry)
+            self.journal_ready = True
+        return True
+
+    def add(self, batch: list):
+        """Guarda um lote lido por next_batch() para drain()."""
+        self.held.extend(batch)
+
+    def drain(self, limit: int, refresh_indexes: bool = True) -> int:
+        """
+        Insere até `limit` jogadores guardados. Retorna quantos foram
+        inseridos (0 enquanto o seq do journal não for conhecido).
+        """
+        if not self.held or not self._read_journal():
+            return 0
+        chunk = self.held[:limit]
+        del self.held[:limit]
+        for user_id, player_data in chunk:
+            if user_id in player_database:
+                continue  # Já lido sob demanda (_load_missing_player)
+            player_database[user_id] = player_data
+            self._apply_journal(user_id)
+            if refresh_indexes:
+                _refresh_player_indexes(user_id)
+        return len(chunk)
+
+    def _apply_journal(self, user_id: str):
+        applied, skipped = _apply_pending_journal(user_id)
+        self.journal_applied += applied
+        self.journal_skipped += skipped
+
+    def finish(self, rebuild_indexes: bool = False):
+        """Aplica o que sobrou do journal (jogadores criados depois do snapshot) e libera as gravações."""
+        global _players_loaded, _players_loading, _player_load
+        self.drain(len(self.held), refresh_indexes=not rebuild_indexes)
+        for user_id in list(_pending_journal):
+            self._apply_journal(user_id)
+            if not rebuild_indexes:
+                _refresh_player_indexes(user_id)
+        if rebuild_indexes:
+            _rebuild_player_indexes()
+        _players_loaded = True
+        _players_loading = False
+        _player_load = None
+        elapsed = time.perf_counter() - self.started
+        print(f"Dados de {len(player_database)} jogadores carregados em {elapsed:.1f}s.")
+        if self.journal_applied or self.journal_skipped:
+            print(
+                f"Journal: {self.journal_applied} alterações reaplicadas "
+                f"({self.journal_skipped} ignoradas, jogador inexistente)."
+            )
+        for waiter in _load_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        _load_waiters.clear()
+
+
+def _apply_pending_journal(user_id: str) -> tuple:
+    """
+    Reaplica ao jogador as entradas do journal separadas durante o
+    carregamento. Retorna (aplicadas, ignoradas por o jogador não existir).
+    """
+    entries = _pending_journal.pop(user_id, None)
+    if not entries:
+        return 0, 0
+    # Migrações de esquema: aplicadas no primeiro acesso (get_player_data/mutate_player)
+    # ou por migrate_all_players(), e antes de reaplicar o journal de cada jogador.
+    applied = 0
+    for entry in entries:
+        if apply_mutation(player_database, _upgrade_journal_entry(entry)):
+            applied += 1
+    if applied:
+        if not isinstance(player_database[user_id], Record):
+            player_database[user_id] = Player.from_dict(player_database[user_id])  # Criado pelo journal
+        _dirty_players.add(user_id)
+    return applied, len(entries) - applied
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """
+    Suspende o coletor de ciclos durante o carregamento: cada lote cria
+    milhares de objetos que sobrevivem, e isso dispararia coletas completas
+    (que percorrem todos os jogadores já carregados) várias vezes.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 
 def load_data():
-    """Carrega dados dos jogadores do arquivo JSON."""
-    global player_database
-    with data_lock:
-        if os.path.exists(PLAYER_DATA_FILE):
-            try:
-                with open(PLAYER_DATA_FILE, "r", encoding="utf-8") as f:
-                    player_database = json.load(f)
-                print(f"Dados de {len(player_database)} jogadores carregados.")
-            except json.JSONDecodeError as e:
-                print(f"Erro ao decodificar JSON de player_data.json: {e}")
-                player_database = {}  # Resetar para evitar dados corrompidos
-            except Exception as e:
-                print(f"Erro ao carregar player_data.json: {e}")
-                player_database = {}
-        else:
-            player_database = {}
-            print("Arquivo outlaws_data.json não encontrado. Iniciando um novo.")
+    """Carrega todos os jogadores do backend configurado, bloqueando até terminar."""
+    with _gc_paused():
+        load = _PlayerLoad()
+        while True:
+            batch = load.next_batch(LOAD_BATCH_SIZE)
+            if not batch:
+                break
+            load.add(batch)
+            load.drain(len(load.held), refresh_indexes=False)
+        load.finish(rebuild_indexes=True)
 
 
-def save_data():
-    """Salva dados dos jogadores no arquivo JSON."""
-    with data_lock:
-        try:
-            with open(PLAYER_DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(player_database, f, indent=4)
-            # print("Dados dos jogadores salvos.") # Desativado para reduzir spam no console
-        except Exception as e:
-            print(f"Erro ao salvar player_data.json: {e}")
+async def load_data_async(batch_size: int = LOAD_BATCH_SIZE) -> int:
+    """
+    Carrega os jogadores sem travar o event loop: a leitura roda em uma
+    thread, em lotes de `batch_size`, e cada lote fica disponível assim que
+    chega (o próximo já está sendo lido enquanto isso). Enquanto o
+    carregamento não termina, get_player_data() lê sob demanda os jogadores
+    que ainda não chegaram (SQLite) ou lança PlayerDataLoading, e nada dos
+    jogadores é gravado. Retorna quantos jogadores foram carregados.
+    """
+    loop = asyncio.get_running_loop()
+    with _gc_paused():
+        load = _PlayerLoad()
+        pending = loop.run_in_executor(_load_executor, load.next_batch, batch_size)
+        while True:
+            batch = await pending
+            if not batch:
+                break
+            pending = loop.run_in_executor(_load_executor, load.next_batch, batch_size)
+            load.add(batch)
+            while load.drain(_LOAD_INSERT_CHUNK):
+                await asyncio.sleep(0)
+        # Arquivos antigos: o seq do journal só aparece no fim e tudo foi guardado até aqui
+        while load.drain(_LOAD_INSERT_CHUNK):
+            await asyncio.sleep(0)
+        load.finish()
+    return len(player_database)
+
+
+async def wait_until_loaded():
+    """Espera o fim do carregamento dos jogadores."""
+    if _players_loaded:
+        return
+    waiter = asyncio.get_running_loop().create_future()
+    _load_waiters.append(waiter)
+    await waiter
+
+
+def players_loaded() -> bool:
+    """Indica se todos os jogadores já foram carregados."""
+    return _players_loaded
+
+
+def ensure_loaded():
+    """Carrega clãs e jogadores se ninguém os carregou ainda (primeiro acesso em scripts)."""
+    if not _clans_loaded:
+        load_clan_data()
+    if not _players_loaded and not _players_loading:
+        load_data()
+
+
+def _load_missing_player(user_id: str):
+    """
+    Jogador que não está no banco antes do fim do carregamento. Sem
+    carregamento em andamento, carrega tudo (primeiro acesso). Durante o
+    carregamento em segundo plano, lê só esse jogador se o backend tiver
+    leitura individual, ou lança PlayerDataLoading. Retorna o jogador, ou
+    None se ele não existe.
+    """
+    if not _players_loading:
+        ensure_loaded()
+        return player_database.get(user_id)
+    if _player_load is None or not _player_load.journal_ready:
+        raise PlayerDataLoading(user_id)
+    try:
+        player_data = _backend.load_player(user_id)
+    except NotImplementedError:
+        raise PlayerDataLoading(user_id) from None
+    if player_data is not None:
+        player_database[user_id] = Player.from_dict(player_data)
+    _apply_pending_journal(user_id)  # Inclui jogadores criados depois do snapshot
+    if user_id in player_database:
+        _refresh_player_indexes(user_id)
+    return player_database.get(user_id)
+
+
+# --- Migrações de esquema dos jogadores (storage/migrations.py) ---
+
+player_migrations = MigrationRegistry("jogadores")
+
+
+@player_migrations.register(1)
+def _add_record_id(user_id: str, player_data):
+    """Perfis antigos não guardavam o próprio ID."""
+    player_data.setdefault("id", user_id)
+
+
+@player_migrations.register(2)
+def _count_relics_inventory(user_id: str, player_data):
+    """relics_inventory: lista com uma entrada por relíquia -> {ID: quantidade}."""
+    relics_inventory = player_data.get("relics_inventory")
+    if isinstance(relics_inventory, list):
+        player_data["relics_inventory"] = relic_catalog.count_relics(relics_inventory)
+
+
+@player_migrations.register(3)
+def _init_relic_rarity_points(user_id: str, player_data):
+    """Pontos de raridade da coleção, mantidos por add_item_to_inventory a partir daqui."""
+    if "relic_rarity_points" not in player_data:
+        player_data["relic_rarity_points"] = relic_catalog.rarity_points(player_data.get("relics_inventory", {}))
+
+
+@player_migrations.register(4)
+def _drop_last_message_xp_time(user_id: str, player_data):
+    """O cooldown do XP do chat fica só em memória (game_logic/cooldowns.py)."""
+    player_data.pop("last_message_xp_time", None)
+
+
+def _migrate_player(user_id: str, player_data) -> bool:
+    """Aplica as migrações pendentes do jogador e o marca para gravação. Custo O(1) se já estiver atualizado."""
+    if player_data.get(SCHEMA_VERSION_KEY, 0) >= player_migrations.latest:
+        return False
+    player_migrations.migrate(user_id, player_data)
+    _dirty_players.add(user_id)
+    return True
+
+
+async def migrate_all_players(batch_size: int = 500) -> int:
+    """
+    Migra em segundo plano todos os jogadores que ainda não estão na versão
+    atual do esquema, cedendo o event loop a cada `batch_size` registros.
+    Retorna quantos foram migrados.
+    """
+    migrated = 0
+    for index, user_id in enumerate(list(player_database)):
+        player_data = player_database.get(user_id)
+        if player_data is not None and _migrate_player(user_id, player_data):
+            migrated += 1
+        if index % batch_size == batch_size - 1:
+            await asyncio.sleep(0)
+    if migrated:
+        print(f"Migrações de esquema: {migrated} jogadores atualizados para a versão {player_migrations.latest}.")
+    return migrated
+
+
+def _upgrade_journal_entry(entry: dict) -> dict:
+    """
+    Prepara uma entrada do journal para ser reaplicada: o jogador é migrado
+    antes (as entradas foram gravadas sobre registros já migrados) e entradas
+    anteriores a relics_inventory virar {ID: quantidade} são convertidas.
+    """
+    player_data = player_database.get(entry["uid"]) if entry["op"] != "create" else None
+    if player_data is not None:
+        player_migrations.migrate(entry["uid"], player_data)
+    if entry.get("field") == "relics_inventory" and entry["op"] == "append" and "key" not in entry:
+        relic = relic_catalog.resolve(entry["v"])
+        relic_id = relic["id"] if relic else entry["v"]
+        if relic and player_data is not None:
+            # O código antigo não mantinha os pontos de raridade (já calculados pela migração 3)
+            player_data["relic_rarity_points"] = player_data.get("relic_rarity_points", 0) + relic["rarity_points"]
+        return {"seq": entry["seq"], "uid": entry["uid"], "field": "relics_inventory", "op": "add", "key": relic_id, "v": 1}
+    return entry
+
+
+def save_data(user_id=None):
+    """
+    Marca dados de jogadores como modificados. A gravação em disco acontece
+    em lote no próximo flush(). Sem `user_id`, todos os jogadores são marcados.
+    """
+    global _all_players_dirty
+    if user_id is None:
+        _all_players_dirty = True
+        _rebuild_player_indexes()
+    else:
+        user_id = str(user_id)
+        _dirty_players.add(user_id)
+        _refresh_player_indexes(user_id)
+
+
+def mutate_player(user_id, field: str, op: str, value, key: str = None):
+    """
+    Aplica uma alteração pequena ao jogador e a registra no journal, para que
+    sobreviva a uma queda antes do próximo snapshot. Custo O(1): uma linha
+    acrescentada ao journal. Operações: "set", "add", "append", "remove"
+    (veja storage/journal.py). Com `key`, altera player[field][key]. Campos em
+    SNAPSHOT_ONLY_PLAYER_FIELDS não passam por aqui (veja o modelo de
+    durabilidade acima).
+    """
+    user_id = str(user_id)
+    player_data = player_database.get(user_id)
+    if player_data is None:
+        return
+    _migrate_player(user_id, player_data)  # O journal só recebe alterações sobre registros atualizados
+    entry = {"uid": user_id, "field": field, "op": op, "v": value}
+    if key is not None:
+        entry["key"] = key
+    apply_mutation(player_database, entry)
+    if _journal is not None:
+        _journal.append(entry)
+    if field in STATS_FIELDS or field.endswith("_active"):
+        bump_stats_version(user_id)
+    save_data(user_id)
+
+
+def bump_stats_version(user_id):
+    """
+    Invalida os atributos efetivos em cache do jogador. Chame depois de
+    alterar atributos, itens equipados, inventário, transformação ou bênçãos.
+    """
+    user_id = str(user_id)
+    _stats_versions[user_id] = _stats_versions.get(user_id, 0) + 1
+
+
+def get_stats_version(user_id) -> int:
+    """Versão atual dos atributos do jogador (muda a cada bump_stats_version)."""
+    return _stats_versions.get(str(user_id), 0)
 
 
 def load_clan_data():
-    """Carrega dados dos clãs do arquivo JSON."""
-    global clan_database
-    with data_lock:
-        if os.path.exists(CLAN_DATA_FILE):
-            try:
-                with open(CLAN_DATA_FILE, "r", encoding="utf-8") as f:
-                    clan_database = json.load(f)
-                print(f"Dados de {len(clan_database)} clãs carregados.")
-            except json.JSONDecodeError as e:
-                print(f"Erro ao decodificar JSON de clans_data.json: {e}")
-                clan_database = {}  # Resetar para evitar dados corrompidos
-            except Exception as e:
-                print(f"Erro ao carregar clans_data.json: {e}")
-                clan_database = {}
+    """Carrega dados dos clãs do backend configurado."""
+    global _clans_loaded
+    with _snapshot_lock:
+        clans = {clan_id: Clan.from_dict(clan_data) for clan_id, clan_data in _backend.load_clans().items()}
+        clan_database.clear()
+        clan_database.update(clans)
+        print(f"Dados de {len(clan_database)} clãs carregados.")
+        _dirty_clans.clear()
+        _rebuild_clan_indexes()
+        _clans_loaded = True
+
+
+def save_clan_data(clan_id=None):
+    """
+    Marca dados de clãs como modificados. A gravação em disco acontece
+    em lote no próximo flush(). Sem `clan_id`, todos os clãs são marcados.
+    """
+    global _all_clans_dirty
+    if clan_id is None:
+        _all_clans_dirty = True
+        _rebuild_clan_indexes()
+    else:
+        clan_id = str(clan_id)
+        _dirty_clans.add(clan_id)
+        _refresh_clan_indexes(clan_id)
+
+
+# --- Índices ---
+# Acompanham os registros marcados com save_data()/save_clan_data(): toda
+# alteração já precisa passar por lá para ser gravada, então os índices ficam
+# tão atualizados quanto o que vai para o disco.
+
+
+PLAYER_INDEXES = (player_leaderboard, players_by_clan, players_by_location)
+CLAN_INDEXES = (clan_leaderboard, clans_by_name)
+
+
+def _rebuild_player_indexes():
+    for index in PLAYER_INDEXES:
+        index.rebuild(player_database)
+
+
+def _refresh_player_indexes(user_id: str):
+    player_data = player_database.get(user_id)
+    for index in PLAYER_INDEXES:
+        if player_data is None:
+            index.remove(user_id)
+        else:
+            index.update(user_id, player_data)
+
+
+def _rebuild_clan_indexes():
+    for index in CLAN_INDEXES:
+        index.rebuild(clan_database)
+
+
+def _refresh_clan_indexes(clan_id: str):
+    clan_data = clan_database.get(clan_id)
+    for index in CLAN_INDEXES:
+        if clan_data is None:
+            index.remove(clan_id)
         else:
-            clan_database = {}
-            print("Arquivo clans_data.json não encontrado. Iniciando um novo.")
+            index.update(clan_id, clan_data)
+
+
+def find_clan_by_name(name: str):
+    """Retorna (clan_id, dados) do clã com esse nome (sem diferenciar maiúsculas/minúsculas), ou None."""
+    ensure_loaded()
+    for clan_id in sorted(clans_by_name.get(name.casefold())):
+        if clan_id in clan_database:
+            return clan_id, clan_database[clan_id]
+    return None
+
+
+def get_clan_member_ids(clan_id: str) -> frozenset:
+    """IDs dos jogadores cujo clan_id aponta para `clan_id`."""
+    return players_by_clan.get(str(clan_id))
+
+
+def get_players_in_location(location: str) -> frozenset:
+    """IDs dos jogadores que estão em `location`."""
+    return players_by_location.get(location)
+
+
+def verify_indexes(repair: bool = False) -> list:
+    """
+    Confere os índices contra os bancos e a lista "members" de cada clã
+    contra o clan_id dos jogadores. Retorna uma lista de problemas (vazia se
+    estiver tudo consistente). Com `repair`, reconstrói os índices divergentes;
+    divergências de membros só são relatadas.
+    """
+    ensure_loaded()
+    problems = []
+    player_indexes = (
+        ("player_leaderboard", player_leaderboard),
+        ("players_by_clan", players_by_clan),
+        ("players_by_location", players_by_location),
+    )
+    for label, index in player_indexes:
+        if not index.verify(player_database):
+            problems.append(f"Índice {label} divergente dos jogadores.")
+            if repair:
+                index.rebuild(player_database)
+    for label, index in (("clan_leaderboard", clan_leaderboard), ("clans_by_name", clans_by_name)):
+        if not index.verify(clan_database):
+            problems.append(f"Índice {label} divergente dos clãs.")
+            if repair:
+                index.rebuild(clan_database)
+
+    for clan_id, clan_data in clan_database.items():
+        listed = set(clan_data.get("members") or [])
+        indexed = players_by_clan.get(clan_id)
+        for user_id in sorted(listed - indexed):
+            if user_id not in player_database:
+                problems.append(f"Clã {clan_id} lista {user_id} como membro, mas o jogador não existe.")
+            else:
+                problems.append(f"Clã {clan_id} lista {user_id} como membro, mas o jogador não aponta para ele.")
+        for user_id in sorted(indexed - listed):
+            problems.append(f"Jogador {user_id} aponta para o clã {clan_id}, mas não está na lista de membros.")
+    for clan_id in players_by_clan.keys():
+        if clan_id not in clan_database:
+            problems.append(f"Jogadores apontam para o clã inexistente {clan_id}.")
+    return problems
 
 
-def save_clan_data():
-    """Salva dados dos clãs no arquivo JSON."""
-    with data_lock:
+def top_players(count: int = 10) -> list:
+    """Os `count` melhores jogadores por (abates, nível, dinheiro): [(user_id, dados), ...]."""
+    ensure_loaded()
+    return [
+        (user_id, player_database[user_id])
+        for user_id in player_leaderboard.top(count)
+        if user_id in player_database
+    ]
+
+
+def top_clans(count: int = 10) -> list:
+    """Os `count` clãs com mais XP: [(clan_id, dados), ...]."""
+    ensure_loaded()
+    return [
+        (clan_id, clan_database[clan_id])
+        for clan_id in clan_leaderboard.top(count)
+        if clan_id in clan_database
+    ]
+
+
+def _collect_changes(table: dict, dirty_ids: set, all_dirty: bool) -> tuple:
+    """Separa os IDs marcados em registros alterados e registros apagados."""
+    if all_dirty:
+        changed = {key: to_plain(record) for key, record in table.items()}
+    else:
+        changed = {key: to_plain(table[key]) for key in dirty_ids if key in table}
+    removed = {key for key in dirty_ids if key not in table}
+    return changed, removed
+
+
+def dirty_count() -> int:
+    """Retorna quantos registros (jogadores + clãs) aguardam gravação."""
+    return len(_dirty_players) + len(_dirty_clans)
+
+
+def _prepare_write() -> list:
+    """
+    Captura as alterações pendentes e limpa as marcações. Roda na thread do
+    event loop: o custo é proporcional ao número de registros alterados, e o
+    resultado não referencia os dicionários vivos, então pode ser gravado em
+    outra thread enquanto o jogo continua modificando os dados.
+    """
+    global _all_players_dirty, _all_clans_dirty, _last_flush_time
+    jobs = []
+    with _snapshot_lock:
+        pending_journal = _journal is not None and _journal.has_segments()
+        # Antes do fim do carregamento o snapshot sairia incompleto: as
+        # alterações esperam (e as dos jogadores já estão no journal)
+        if _players_loaded and (_all_players_dirty or _dirty_players or pending_journal):
+            changed, removed = _collect_changes(player_database, _dirty_players, _all_players_dirty)
+            ids = None if _all_players_dirty else set(_dirty_players)
+            # Compactação: o snapshot passa a incluir tudo o que está no journal até aqui
+            journal_seq, segments = _journal.seal() if _journal is not None else (None, [])
+            jobs.append((
+                "player_data", _backend.write_players,
+                _backend.prepare_players(changed, removed, journal_seq), ids, save_data, segments,
+            ))
+            _all_players_dirty = False
+            _dirty_players.clear()
+        if _clans_loaded and (_all_clans_dirty or _dirty_clans):
+            changed, removed = _collect_changes(clan_database, _dirty_clans, _all_clans_dirty)
+            ids = None if _all_clans_dirty else set(_dirty_clans)
+            jobs.append((
+                "clans_data", _backend.write_clans,
+                _backend.prepare_clans(changed, removed), ids, save_clan_data, [],
+            ))
+            _all_clans_dirty = False
+            _dirty_clans.clear()
+        _last_flush_time = time.monotonic()
+    return jobs
+
+
+def _write_jobs(jobs: list) -> list:
+    """Executa as gravações preparadas (thread de gravação). Retorna se cada uma funcionou."""
+    results = []
+    for label, writer, prepared, *_ in jobs:
         try:
-            with open(CLAN_DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(clan_database, f, indent=4)
-            # print("Dados dos clãs salvos.") # Desativado para reduzir spam no console
+            writer(prepared)
+            results.append(True)
         except Exception as e:
-            print(f"Erro ao salvar clans_data.json: {e}")
+            print(f"Erro ao salvar {label}: {e}")
+            results.append(False)
+    return results
+
+
+def _finish_write(jobs: list, results: list) -> bool:
+    """
+    Depois da gravação: apaga os segmentos do journal incluídos nos snapshots
+    gravados e marca novamente os registros cuja gravação falhou.
+    """
+    for (label, writer, prepared, ids, mark, segments), ok in zip(jobs, results):
+        if ok:
+            if segments:
+                _journal.discard(segments)
+        elif ids is None:
+            mark()
+        else:
+            for key in ids:
+                mark(key)
+    return all(results)
+
+
+def flush():
+    """
+    Grava em disco todos os registros marcados como modificados, bloqueando
+    até terminar. Usado no desligamento; durante o jogo prefira save_async().
+    """
+    jobs = _prepare_write()
+    if jobs:
+        # Passa pela mesma thread de gravação para respeitar a ordem das escritas
+        _finish_write(jobs, _write_executor.submit(_write_jobs, jobs).result())
+
+
+async def _run_save(previous=None) -> bool:
+    """Executa uma gravação assíncrona; se estava na fila, espera a anterior."""
+    global _save_task, _save_pending
+    if previous is not None:
+        await asyncio.wait([previous])
+        # Esta gravação deixa a fila e passa a ser a gravação em andamento
+        _save_task, _save_pending = _save_pending, None
+    jobs = _prepare_write()
+    if not jobs:
+        return True
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(_write_executor, _write_jobs, jobs)
+    return _finish_write(jobs, results)
+
+
+async def save_async() -> bool:
+    """
+    Grava as alterações pendentes sem bloquear o event loop: os registros
+    alterados são capturados aqui e a serialização/escrita roda em uma thread.
+
+    Pedidos simultâneos são agrupados: no máximo uma gravação roda por vez e
+    uma segunda fica na fila. Quem chamar enquanto já existe uma na fila
+    apenas aguarda essa gravação, que captura os dados no momento em que
+    começa e por isso inclui todas as alterações feitas até lá.
+    Retorna False se alguma gravação falhou (os registros continuam marcados).
+    """
+    global _save_task, _save_pending
+    if _save_pending is not None:
+        return await asyncio.shield(_save_pending)
+    if _save_task is not None and not _save_task.done():
+        _save_pending = asyncio.ensure_future(_run_save(_save_task))
+        return await asyncio.shield(_save_pending)
+    _save_task = asyncio.ensure_future(_run_save())
+    return await asyncio.shield(_save_task)
+
+
+def close_storage():
+    """Fecha o backend de armazenamento. Chame flush() antes."""
+    _load_executor.shutdown(wait=False, cancel_futures=True)
+    _write_executor.shutdown(wait=True)
+    with _snapshot_lock:
+        if _journal is not None:
+            _journal.close()
+        _backend.close()
+
+
+def is_flush_due() -> bool:
+    """
+    Indica se há alterações pendentes e se o intervalo configurado passou,
+    o número de registros modificados atingiu o limite ou o journal cresceu
+    além de JOURNAL_COMPACT_BYTES.
+    """
+    if _journal is not None and _journal.pending_bytes >= JOURNAL_COMPACT_BYTES:
+        return True
+    if not (_all_players_dirty or _all_clans_dirty or _dirty_players or _dirty_clans):
+        return False
+    elapsed = time.monotonic() - _last_flush_time
+    return elapsed >= SAVE_FLUSH_INTERVAL_SECONDS or dirty_count() >= SAVE_DIRTY_THRESHOLD
+
+
+# --- Locks por jogador/clã ---
+
+
+def _stripe(key) -> int:
+    """Posição da tabela de locks usada por um ID."""
+    return hash(str(key)) % LOCK_STRIPES
+
+
+def _lock_at(table: dict, index: int) -> asyncio.Lock:
+    """Retorna o asyncio.Lock de uma posição da tabela."""
+    lock = table.get(index)
+    if lock is None:
+        # Criado sob demanda, já dentro do event loop que vai usá-lo
+        lock = table[index] = asyncio.Lock()
+    return lock
+
+
+def player_lock(user_id) -> asyncio.Lock:
+    """
+    Lock do jogador, para fluxos que leem os dados, fazem await e depois
+    alteram. Uso: `async with player_lock(user_id): ...`.
+    Não é reentrante; para segurar mais de um lock, use acquire_locks().
+    """
+    return _lock_at(_player_locks, _stripe(user_id))
+
+
+def clan_lock(clan_id) -> asyncio.Lock:
+    """Lock do clã (veja player_lock)."""
+    return _lock_at(_clan_locks, _stripe(clan_id))
+
+
+@contextlib.asynccontextmanager
+async def acquire_locks(player_ids=(), clan_ids=()):
+    """
+    Segura os locks de vários jogadores e clãs ao mesmo tempo. Os locks são
+    sempre adquiridos na mesma ordem (clãs e depois jogadores, por posição na
+    tabela), o que impede deadlock entre fluxos que envolvem as mesmas
+    entidades. IDs que caem na mesma posição compartilham um único lock.
+    """
+    locks = []
+    for table, ids in ((_clan_locks, clan_ids), (_player_locks, player_ids)):
+        for index in sorted({_stripe(key) for key in ids}):
+            locks.append(_lock_at(table, index))
+    acquired = []
+    try:
+        for lock in locks:
+            await lock.acquire()
+            acquired.append(lock)
+        yield
+    finally:
+        for lock in reversed(acquired):
+            lock.release()
 
 
 # --- Funções de Acesso e Inicialização de Dados do Jogador ---
@@ -104,84 +884,155 @@ def get_player_data(user_id: str) -> dict:
     """
     Retorna os dados de um jogador. Se o jogador não existir, inicializa com dados padrão.
     A inicialização agora inclui os novos campos de relíquias e chaves.
+    Lança PlayerDataLoading se o jogador ainda não foi lido do disco.
     """
-    with data_lock:
-        if user_id not in player_database:
-            player_database[user_id] = {
-                "id": user_id,
-                "created_at": int(time.time()),
-                "name": None,  # Será definido após a escolha da classe
-                "level": 1,
-                "xp": 0,
-                "attribute_points": ATTRIBUTE_POINTS_PER_LEVEL,
-                "hp": INITIAL_HP,
-                "max_hp": INITIAL_HP,
-                "attack": INITIAL_ATTACK,
-                "special_attack": INITIAL_SPECIAL_ATTACK,
-                "money": INITIAL_MONEY,
-                "inventory": {},
-                "location": STARTING_LOCATION,
-                "energy": MAX_ENERGY,
-                "kills": 0,
-                "deaths": 0,
-                "bounty": 0,
-                "status": "online",  # online, afk, dead
-                "last_attack_time": 0,
-                "last_special_attack_time": 0,
-                "last_message_xp_time": 0,
-                "rebirths": 0,  # Contador de renascimentos
-                "equipped_items": {},  # Itens equipados (ex: {"weapon": "espada_lendaria"})
-                "current_transformation": None,  # Classe de transformação ativa
-                "transform_end_time": 0,  # Quando a transformação termina (timestamp)
-                "blessings": {},  # Ativação/expiração de bênçãos
-                "relics": {},  # NOVO: Relíquias possuídas (id_reliquia: True/False)
-                "relic_energy": 0,  # NOVO: Energia separada para relíquias
-                "relic_keys": 0,  # NOVO: Chaves para abrir câmaras de relíquias
-                "last_key_claim_time": 0, # NOVO: Timestamp da última reivindicação de chave
-                "relics_inventory": [], # NOVO: Lista de IDs de relíquias obtidas, for /bau
-                "active_relic_chamber": None, # NOVO: ID da câmara de relíquia ativa
-                "relic_chamber_found_time": 0, # NOVO: Timestamp de quando a câmara foi encontrada
-                "clan_id": None,  # ID do clã ao qual o jogador pertence
-            }
-            # Ensure 'blessings' is initialized correctly
-            if "blessings" not in player_database[user_id]:
-                player_database[user_id]["blessings"] = {}
-
-            # Initialize all blessing-related fields from ITEMS_DATA as False
-            # Note: INITIAL_CLAN_DATA is not the right place for blessing info.
-            # You'll need to iterate over ITEMS_DATA or a dedicated BLESSINGS_DATA if you have one.
-            # Assuming ITEMS_DATA is where blessing types are defined.
-            # This part below is likely incorrect based on what INITIAL_CLAN_DATA implies.
-            # It should likely be iterating over a list of actual blessing item IDs.
-            # For now, I'm commenting out the problematic part to avoid error.
-            # for item_id, item_info in INITIAL_CLAN_DATA.items():
-            #     if item_info.get("type") == "blessing_unlock":
-            #         player_database[user_id][f"{item_id}_active"] = False
-            #         player_database[user_id][f"{item_id}_end_time"] = 0
-            save_data()  # Salva o novo perfil
-        return player_database[user_id]
+    user_id = str(user_id)
+    if user_id not in player_database and not _players_loaded:
+        _load_missing_player(user_id)
+    if user_id not in player_database:
+        player_database[user_id] = Player.new(user_id, int(time.time()))
+        player_database[user_id][SCHEMA_VERSION_KEY] = player_migrations.latest
+        if _journal is not None:
+            _journal.append({"uid": user_id, "op": "create", "v": player_database[user_id].to_dict()})
+        save_data(user_id)  # Marca o novo perfil para gravação
+    else:
+        _migrate_player(user_id, player_database[user_id])
+    return player_database[user_id]
+
+
+def create_player(user_id: str, fields: dict) -> bool:
+    """
+    Cria a ficha de um jogador novo com `fields` e a registra no journal.
+    Retorna False se o jogador já tem ficha. Lança PlayerDataLoading se o
+    jogador ainda não foi lido do disco.
+    """
+    user_id = str(user_id)
+    if user_id not in player_database and not _players_loaded:
+        _load_missing_player(user_id)
+    if user_id in player_database:
+        return False
+    player_data = Player.from_dict({**fields, "id": user_id})
+    player_data[SCHEMA_VERSION_KEY] = player_migrations.latest
+    player_database[user_id] = player_data
+    if _journal is not None:
+        _journal.append({"uid": user_id, "op": "create", "v": player_data.to_dict()})
+    bump_stats_version(user_id)  # Ficha nova: descarta atributos em cache
+    save_data(user_id)
+    return True
 
 
 def update_player_data(user_id: str, key: str, value):
     """Atualiza um campo específico nos dados do jogador."""
-    with data_lock:
-        if user_id in player_database:
-            player_database[user_id][key] = value
-            save_data()
+    mutate_player(user_id, key, "set", value)
 
 def add_user_money(user_id: str, amount: int):
     """Adiciona dinheiro ao jogador."""
-    with data_lock:
-        player_data = get_player_data(user_id) # Ensures player data is initialized
-        player_data["money"] = player_data.get("money", 0) + amount
-        save_data()
+    get_player_data(user_id) # Ensures player data is initialized
+    mutate_player(user_id, "money", "add", amount)
+
+def _energy_state(player_data: dict, now: float) -> tuple:
+    """Retorna (energia atual, segundos já acumulados para o próximo ponto)."""
+    energy = player_data.get("energy", 0)
+    if energy >= MAX_ENERGY:
+        return energy, 0
+    # Sem energy_timestamp (perfis antigos): considera a regeneração completa
+    elapsed = max(0, now - player_data.get("energy_timestamp", 0))
+    regenerated, progress = divmod(elapsed, ENERGY_REGEN_SECONDS)
+    energy += int(regenerated)
+    if energy >= MAX_ENERGY:
+        return MAX_ENERGY, 0
+    return energy, progress
+
+
+def get_energy(player_data: dict, now: float = None) -> int:
+    """
+    Energia atual do jogador. A energia não é mais incrementada por uma
+    tarefa a cada minuto: o registro guarda o valor em "energy" no instante
+    "energy_timestamp" e a regeneração (1 a cada ENERGY_REGEN_SECONDS) é
+    calculada na leitura. Use sempre esta função em vez de player_data["energy"].
+    """
+    now = time.time() if now is None else now
+    return _energy_state(player_data, now)[0]
+
+
+def change_energy(user_id, amount: int, now: float = None) -> int:
+    """
+    Soma `amount` (negativo para gastar) à energia atual, limitado a
+    [0, MAX_ENERGY]. Só aqui a energia é gravada. Retorna a nova energia.
+    """
+    user_id = str(user_id)
+    now = time.time() if now is None else now
+    energy, progress = _energy_state(get_player_data(user_id), now)
+    new_energy = max(0, min(MAX_ENERGY, energy + amount))
+    # Mantém o progresso parcial do próximo ponto; cheia, o relógio recomeça ao gastar
+    mutate_player(user_id, "energy", "set", new_energy)
+    mutate_player(user_id, "energy_timestamp", "set", now - progress)
+    return new_energy
+
 
 def add_user_energy(user_id: str, amount: int):
     """Adiciona energia ao jogador, limitado ao MAX_ENERGY."""
-    with data_lock:
-        player_data = get_player_data(user_id) # Ensures player data is initialized
-        player_data["energy"] = min(player_data.get("energy", 0) + amount, MAX_ENERGY)
-        save_data()
+    change_energy(user_id, amount)
+
+def _key_accrual(player_data: dict, current_time: float) -> tuple:
+    """
+    Calcula, sem alterar nada, quantas chaves o jogador acumulou desde a
+    última reivindicação. Retorna (chaves a adicionar, novo last_key_claim_time).
+    """
+    last_claim_time = player_data.get("last_key_claim_time", 0)
+    
+    # Calculate how many full claim periods have passed
+    time_since_last_claim = current_time - last_claim_time
+    
+    # Convert HOURS_BETWEEN_KEY_CLAIMS to seconds
+    claim_interval_seconds = HOURS_BETWEEN_KEY_CLAIMS * 3600
+    
+    keys_to_add = 0
+    new_last_claim_time = last_claim_time
+    
+    if claim_interval_seconds > 0: # Avoid division by zero
+        # Check if it's the first time claiming or enough time has passed
+        if last_claim_time == 0:
+            # If first time, grant one key immediately and set last claim time
+            keys_to_add = 1
+            new_last_claim_time = current_time
+        elif time_since_last_claim >= claim_interval_seconds:
+            # Calculate how many keys should be added based on elapsed time
+            # It grants one key per full interval passed since the last claim.
+            num_intervals_passed = int(time_since_last_claim / claim_interval_seconds)
+            keys_to_add = min(num_intervals_passed, MAX_RELIC_KEYS - player_data.get("relic_keys", 0))
+            
+            # Update last_key_claim_time based on how many intervals were claimed
+            new_last_claim_time = last_claim_time + keys_to_add * claim_interval_seconds
+
+    return keys_to_add, new_last_claim_time
+
+
+def get_relic_keys(player_data: dict, now: float = None) -> int:
+    """
+    Chaves disponíveis para o jogador, incluindo as acumuladas desde a última
+    reivindicação. Não grava nada: as chaves só são materializadas por
+    check_and_add_keys() quando o jogador vai usá-las (/bau).
+    """
+    now = datetime.now().timestamp() if now is None else now
+    keys_to_add, _ = _key_accrual(player_data, now)
+    current_keys = player_data.get("relic_keys", 0)
+    return min(current_keys + keys_to_add, MAX_RELIC_KEYS)
+
+
+def next_key_time(player_data: dict):
+    """
+    Timestamp em que o jogador ganha a próxima chave (usado para agendar o aviso
+    por DM), ou None se ele já está no limite de chaves.
+    """
+    claim_interval_seconds = HOURS_BETWEEN_KEY_CLAIMS * 3600
+    if claim_interval_seconds <= 0 or player_data.get("relic_keys", 0) >= MAX_RELIC_KEYS:
+        return None
+    last_claim_time = player_data.get("last_key_claim_time", 0)
+    if last_claim_time == 0:
+        return 0
+    return last_claim_time + claim_interval_seconds
+
 
 def check_and_add_keys(user_id: int) -> int:
     """
@@ -190,46 +1041,22 @@ def check_and_add_keys(user_id: int) -> int:
     Retorna o número de chaves adicionadas.
     """
     user_id_str = str(user_id)
-    with data_lock:
-        player_data = get_player_data(user_id_str)
-        
-        last_claim_time = player_data.get("last_key_claim_time", 0)
-        current_time = datetime.now().timestamp()
-        
-        # Calculate how many full claim periods have passed
-        time_since_last_claim = current_time - last_claim_time
-        
-        # Convert HOURS_BETWEEN_KEY_CLAIMS to seconds
-        claim_interval_seconds = HOURS_BETWEEN_KEY_CLAIMS * 3600
-        
-        keys_to_add = 0
-        
-        if claim_interval_seconds > 0: # Avoid division by zero
-            # Check if it's the first time claiming or enough time has passed
-            if last_claim_time == 0:
-                # If first time, grant one key immediately and set last claim time
-                keys_to_add = 1
-                player_data["last_key_claim_time"] = current_time
-            elif time_since_last_claim >= claim_interval_seconds:
-                # Calculate how many keys should be added based on elapsed time
-                # It grants one key per full interval passed since the last claim.
-                num_intervals_passed = int(time_since_last_claim / claim_interval_seconds)
-                keys_to_add = min(num_intervals_passed, MAX_RELIC_KEYS - player_data.get("relic_keys", 0))
-                
-                # Update last_key_claim_time based on how many intervals were claimed
-                player_data["last_key_claim_time"] += keys_to_add * claim_interval_seconds
-
-        # Add keys, but don't exceed MAX_RELIC_KEYS
-        current_keys = player_data.get("relic_keys", 0)
-        new_keys = min(current_keys + keys_to_add, MAX_RELIC_KEYS)
-        
-        keys_actually_added = new_keys - current_keys
-        player_data["relic_keys"] = new_keys
-        
-        if keys_actually_added > 0 or last_claim_time == 0: # Save if keys were added or if it's a new player's first claim
-            save_data()
-        
-        return keys_actually_added
+    player_data = get_player_data(user_id_str)
+    
+    last_claim_time = player_data.get("last_key_claim_time", 0)
+    keys_to_add, new_last_claim_time = _key_accrual(player_data, datetime.now().timestamp())
+    if new_last_claim_time != last_claim_time:
+        mutate_player(user_id_str, "last_key_claim_time", "set", new_last_claim_time)
+
+    # Add keys, but don't exceed MAX_RELIC_KEYS
+    current_keys = player_data.get("relic_keys", 0)
+    new_keys = min(current_keys + keys_to_add, MAX_RELIC_KEYS)
+    
+    keys_actually_added = new_keys - current_keys
+    if keys_actually_added != 0:
+        mutate_player(user_id_str, "relic_keys", "add", keys_actually_added)
+    
+    return keys_actually_added
 
 
 def get_time_until_next_key_claim(user_id: int) -> int:
@@ -237,115 +1064,126 @@ def get_time_until_next_key_claim(user_id: int) -> int:
     Retorna o tempo restante em segundos até que o usuário possa reivindicar a próxima chave.
     """
     user_id_str = str(user_id)
-    with data_lock:
-        player_data = get_player_data(user_id_str)
-        last_claim_time = player_data.get("last_key_claim_time", 0)
-        current_time = datetime.now().timestamp()
+    player_data = get_player_data(user_id_str)
+    last_claim_time = player_data.get("last_key_claim_time", 0)
+    current_time = datetime.now().timestamp()
+    
+    claim_interval_seconds = HOURS_BETWEEN_KEY_CLAIMS * 3600
+    
+    if last_claim_time == 0:
+        return 0 # Can claim immediately if never claimed before
+    
+    time_elapsed_since_last_claim = current_time - last_claim_time
+    
+    # If enough time has passed for a key, the remaining time for the *next* key
+    if time_elapsed_since_last_claim >= claim_interval_seconds:
+        # Calculate how many full intervals have passed
+        num_intervals_passed = int(time_elapsed_since_last_claim / claim_interval_seconds)
+        # The last claimable time would be last_claim_time + (num_intervals_passed * interval)
+        # The time until the *next* claim is from that point.
+        next_claim_due_time = last_claim_time + (num_intervals_passed * claim_interval_seconds) + claim_interval_seconds
         
-        claim_interval_seconds = HOURS_BETWEEN_KEY_CLAIMS * 3600
-        
-        if last_claim_time == 0:
-            return 0 # Can claim immediately if never claimed before
-        
-        time_elapsed_since_last_claim = current_time - last_claim_time
-        
-        # If enough time has passed for a key, the remaining time for the *next* key
-        if time_elapsed_since_last_claim >= claim_interval_seconds:
-            # Calculate how many full intervals have passed
-            num_intervals_passed = int(time_elapsed_since_last_claim / claim_interval_seconds)
-            # The last claimable time would be last_claim_time + (num_intervals_passed * interval)
-            # The time until the *next* claim is from that point.
-            next_claim_due_time = last_claim_time + (num_intervals_passed * claim_interval_seconds) + claim_interval_seconds
-            
-            remaining = next_claim_due_time - current_time
-            return max(0, int(remaining))
-        else:
-            remaining = claim_interval_seconds - time_elapsed_since_last_claim
-            return max(0, int(remaining))
+        remaining = next_claim_due_time - current_time
+        return max(0, int(remaining))
+    else:
+        remaining = claim_interval_seconds - time_elapsed_since_last_claim
+        return max(0, int(remaining))
+
+
+def get_relic_rarity_points(player_data: dict) -> int:
+    """Pontos de raridade da coleção de relíquias (mantidos a cada relíquia adicionada)."""
+    if "relic_rarity_points" in player_data:
+        return player_data["relic_rarity_points"]
+    return relic_catalog.rarity_points(player_data.get("relics_inventory", {}))  # Ainda não migrado
 
 
 def add_item_to_inventory(user_id: str, item_id: str, quantity: int = 1):
     """Adiciona um item ao inventário do jogador. Se o item é uma relíquia, adiciona a relics_inventory."""
-    with data_lock:
-        player_data = get_player_data(user_id)
-        
-        # Check if the item is a relic based on ITEMS_DATA (if ITEMS_DATA has a 'type' for relics)
-        item_info = ITEMS_DATA.get(item_id)
-        if item_info and item_info.get("type") == "relic": # Assuming 'type': 'relic' in ITEMS_DATA
-            if "relics_inventory" not in player_data:
-                player_data["relics_inventory"] = []
-            for _ in range(quantity): # Add quantity times
-                player_data["relics_inventory"].append(item_id)
-        else:
-            # For non-relic items, use the existing inventory structure
-            player_data["inventory"][item_id] = (
-                player_data["inventory"].get(item_id, 0) + quantity
-            )
-        save_data()
+    get_player_data(user_id)  # Garante o perfil (e as migrações de esquema)
+
+    # Relíquias são identificadas pelo ID do catálogo (game_logic/relic_catalog.py)
+    relic = relic_catalog.get(item_id)
+    if relic is not None:
+        mutate_player(user_id, "relics_inventory", "add", quantity, key=item_id)
+        mutate_player(user_id, "relic_rarity_points", "add", relic["rarity_points"] * quantity)
+    else:
+        # For non-relic items, use the existing inventory structure
+        mutate_player(user_id, "inventory", "add", quantity, key=item_id)
+
+
+def remove_relic_from_inventory(user_id: str, relic_id: str, quantity: int = 1) -> int:
+    """
+    Remove até `quantity` unidades de uma relíquia do jogador. Retorna quantas
+    foram removidas (0 se ele não tinha nenhuma).
+    """
+    player_data = get_player_data(user_id)
+    owned = player_data.get("relics_inventory", {}).get(relic_id, 0)
+    removed = min(owned, max(0, quantity))
+    if removed == 0:
+        return 0
+    if removed == owned:
+        mutate_player(user_id, "relics_inventory", "pop", None, key=relic_id)
+    else:
+        mutate_player(user_id, "relics_inventory", "add", -removed, key=relic_id)
+    relic = relic_catalog.get(relic_id)
+    if relic is not None:
+        mutate_player(user_id, "relic_rarity_points", "add", -relic["rarity_points"] * removed)
+    return removed
 
 # --- Funções de Acesso e Inicialização de Dados do Clã ---
 
 
 def get_clan_data(clan_id: str) -> dict:
     """Retorna os dados de um clã. Se o clã não existir, retorna um dicionário vazio."""
-    with data_lock:
-        return clan_database.get(clan_id, {})
+    ensure_loaded()
+    return clan_database.get(clan_id, {})
 
 
 def create_clan(clan_id: str, clan_name: str, leader_id: str):
     """Cria um novo clã com os dados iniciais."""
-    with data_lock:
-        if clan_id not in clan_database:
-            new_clan_data = INITIAL_CLAN_DATA.copy()
-            new_clan_data["name"] = clan_name
-            new_clan_data["leader_id"] = leader_id
-            new_clan_data["members"].append(leader_id)
-            clan_database[clan_id] = new_clan_data
-            save_clan_data()
-            return True
-        return False
+    if clan_id not in clan_database:
+        new_clan_data = INITIAL_CLAN_DATA.copy()
+        new_clan_data["name"] = clan_name
+        new_clan_data["leader_id"] = leader_id
+        new_clan_data["members"].append(leader_id)
+        clan_database[clan_id] = Clan.from_dict(new_clan_data)
+        save_clan_data(clan_id)
+        return True
+    return False
 
 
 def add_member_to_clan(clan_id: str, user_id: str):
     """Adiciona um membro a um clã existente."""
-    with data_lock:
-        if clan_id in clan_database:
-            if user_id not in clan_database[clan_id]["members"]:
-                clan_database[clan_id]["members"].append(user_id)
-                save_clan_data()
-                return True
-        return False
+    if clan_id in clan_database:
+        if user_id not in clan_database[clan_id]["members"]:
+            clan_database[clan_id]["members"].append(user_id)
+            save_clan_data(clan_id)
+            return True
+    return False
 
 
 def remove_member_from_clan(clan_id: str, user_id: str):
     """Remove um membro de um clã."""
-    with data_lock:
-        if clan_id in clan_database:
-            if user_id in clan_database[clan_id]["members"]:
-                clan_database[clan_id]["members"].remove(user_id)
-                # Se o líder for removido, e houver outros membros, transferir liderança
-                if clan_database[clan_id]["leader_id"] == user_id:
-                    if clan_database[clan_id]["members"]:
-                        clan_database[clan_id]["leader_id"] = clan_database[clan_id][
-                            "members"
-                        ][0]
-                    else:
-                        del clan_database[clan_id]  # Apagar clã se não houver membros
-                save_clan_data()
-                return True
-        return False
+    if clan_id in clan_database:
+        if user_id in clan_database[clan_id]["members"]:
+            clan_database[clan_id]["members"].remove(user_id)
+            # Se o líder for removido, e houver outros membros, transferir liderança
+            if clan_database[clan_id]["leader_id"] == user_id:
+                if clan_database[clan_id]["members"]:
+                    clan_database[clan_id]["leader_id"] = clan_database[clan_id][
+                        "members"
+                    ][0]
+                else:
+                    del clan_database[clan_id]  # Apagar clã se não houver membros
+            save_clan_data(clan_id)
+            return True
+    return False
 
 
 def delete_clan(clan_id: str):
     """Deleta um clã."""
-    with data_lock:
-        if clan_id in clan_database:
-            del clan_database[clan_id]
-            save_clan_data()
-            return True
-        return False
-
-
-# Carregar dados ao iniciar o módulo
-load_data()
-load_clan_data()
\ No newline at end of file
+    if clan_id in clan_database:
+        del clan_database[clan_id]
+        save_clan_data(clan_id)
+        return True
+    return False
@@ -0,0 +1,49 @@
+# File: OutlawRpg-main/outlaw/game_logic/chat_xp.py
+#
+# XP por mensagem no chat. on_message só consulta o cooldown do autor (o
+# CooldownStore "chat_xp" de game_logic.cooldowns, sem criar perfil e sem
+# calcular atributos) e conta a mensagem; o XP acumulado é aplicado em lote a cada
+# XP_PER_MESSAGE_FLUSH_SECONDS por utils.apply_chat_xp(), que também aponta
+# quem atingiu o próximo nível. Benchmark de carga: bench/chat_xp.py.
+
+from config import XP_PER_MESSAGE_COOLDOWN_SECONDS
+from game_logic.cooldowns import cooldown_store
+
+
+class ChatXpBuffer:
+    """
+    Cooldown e contagem das mensagens que valem XP, por ID (int) do autor.
+    `players` é o banco de jogadores: só quem já tem perfil ganha XP, e
+    ninguém ganha um perfil por conversar.
+    """
+
+    def __init__(self, players, cooldown_seconds: float = XP_PER_MESSAGE_COOLDOWN_SECONDS):
+        self.players = players
+        self.cooldowns = cooldown_store("chat_xp", cooldown_seconds)
+        self._pending = {}  # ID do autor -> mensagens que valeram XP desde o último lote
+        self._messages = {}  # ID do autor -> última dessas mensagens (canal/autor do aviso de nível)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, author_id: int, message=None, now: float = None) -> bool:
+        """
+        Conta uma mensagem de `author_id`. Retorna True se ela vale XP. Dentro
+        do cooldown custa uma consulta ao CooldownStore e não aloca nada. Quem
+        não tem perfil também entra no cooldown, para que as próximas
+        mensagens dele caiam nesse mesmo caminho barato.
+        """
+        if self.cooldowns.acquire(author_id, now):
+            return False
+        if str(author_id) not in self.players:
+            return False
+        self._pending[author_id] = self._pending.get(author_id, 0) + 1
+        self._messages[author_id] = message
+        return True
+
+    def drain(self) -> tuple:
+        """Retira o lote acumulado: ({ID do autor: mensagens}, {ID do autor: última mensagem})."""
+        pending, messages = self._pending, self._messages
+        self._pending, self._messages = {}, {}
+        return pending, messages
+
@@ -0,0 +1,110 @@
+# File: OutlawRpg-main/outlaw/game_logic/combat.py
+#
+# Núcleo do combate por turnos, sem nenhuma dependência do Discord.
+# utils.run_turn_based_combat usa estas funções e só cuida das mensagens e
+# da persistência; o simulador em lote (combat_sim.py) segue as mesmas regras.
+
+import math
+import random
+
+from config import CRITICAL_CHANCE, CRITICAL_MULTIPLIER, ITEMS_DATA
+
+
+# Fração do HP máximo recuperada pela segunda chance do Amuleto de Pedra
+SECOND_CHANCE_HP_FRACTION = 0.30
+
+# Eventos registrados durante o combate (primeiro elemento de cada tupla)
+EVENT_PLAYER_ATTACK = "player_attack"  # (evento, dano, crítico)
+EVENT_ENEMY_DEFEATED = "enemy_defeated"  # (evento,)
+EVENT_ENEMY_ATTACK = "enemy_attack"  # (evento, dano)
+EVENT_LIFESTEAL = "lifesteal"  # (evento, hp_roubado)
+EVENT_EVADE = "evade"  # (evento,)
+EVENT_SECOND_CHANCE = "second_chance"  # (evento,)
+EVENT_PLAYER_DEFEATED = "player_defeated"  # (evento,)
+
+
+def combat_modifiers(player_data: dict) -> tuple:
+    """
+    Extrai do jogador as regras especiais do combate:
+    (tem Amuleto de Pedra, porcentagem de roubo de HP da Bênção de Drácula).
+    """
+    has_amulet = "amuleto_de_pedra" in player_data.get("inventory", {})
+    lifesteal_percent = 0.0
+    if player_data.get("bencao_dracula_active"):
+        lifesteal_percent = ITEMS_DATA.get("bencao_dracula", {}).get("hp_steal_percent_on_evade", 0)
+    return has_amulet, lifesteal_percent
+
+
+def resolve_combat(
+    player_hp: int,
+    player_stats: dict,
+    enemy: dict,
+    has_amulet: bool = False,
+    lifesteal_percent: float = 0.0,
+    rng=random,
+) -> dict:
+    """
+    Simula um combate completo e retorna um dicionário com:
+      "won": se o jogador venceu
+      "player_hp": HP final do jogador (pode ser <= 0 em caso de derrota)
+      "turns": quantos ataques o jogador fez
+      "second_chance_used": se o Amuleto de Pedra foi consumido
+      "events": lista de eventos para montar o log (veja EVENT_*)
+
+    As regras e a ordem dos sorteios são as mesmas do combate original, então
+    o mesmo `rng` (semente) produz exatamente o mesmo combate.
+    """
+    player_current_hp = player_hp
+    enemy_current_hp = enemy["hp"]
+    evasion_chance = player_stats["evasion_chance"]
+    second_chance_used = False
+    turns = 0
+    events = []
+
+    while player_current_hp > 0 and enemy_current_hp > 0:
+        # Turno do Jogador
+        turns += 1
+        player_hit_chance = rng.random()
+        is_player_critical = rng.random() < CRITICAL_CHANCE
+        player_damage = player_stats["attack"]
+        if is_player_critical:
+            player_damage = math.floor(player_damage * CRITICAL_MULTIPLIER)
+        events.append((EVENT_PLAYER_ATTACK, player_damage, is_player_critical))
+        enemy_current_hp -= player_damage
+
+        if enemy_current_hp <= 0:
+            events.append((EVENT_ENEMY_DEFEATED,))
+            break
+
+        # Turno do Inimigo
+        enemy_hit_chance = rng.random()
+        if enemy_hit_chance > evasion_chance:  # Verifica se o jogador desviou
+            enemy_damage = enemy["attack"]
+            events.append((EVENT_ENEMY_ATTACK, enemy_damage))
+            player_current_hp -= enemy_damage
+
+            # Roubo de HP da Bênção de Drácula: condicional ao sorteio de desvio do turno do jogador
+            if lifesteal_percent > 0 and player_hit_chance <= evasion_chance:
+                hp_stolen = math.floor(enemy_damage * lifesteal_percent)
+                player_current_hp = min(player_stats["hp"], player_current_hp + hp_stolen)
+                events.append((EVENT_LIFESTEAL, hp_stolen))
+        else:
+            events.append((EVENT_EVADE,))
+
+        if player_current_hp <= 0:
+            # Segunda chance do Amuleto de Pedra
+            if has_amulet and not second_chance_used:
+                player_current_hp = math.floor(player_stats["hp"] * SECOND_CHANCE_HP_FRACTION)
+                second_chance_used = True
+                events.append((EVENT_SECOND_CHANCE,))
+            else:
+                events.append((EVENT_PLAYER_DEFEATED,))
+                break
+
+    return {
+        "won": enemy_current_hp <= 0,
+        "player_hp": player_current_hp,
+        "turns": turns,
+        "second_chance_used": second_chance_used,
+        "events": events,
+    }
@@ -0,0 +1,218 @@
+# File: OutlawRpg-main/outlaw/game_logic/combat_sim.py
+#
+# Simulador de combates em lote para balanceamento. Usa as mesmas regras de
+# game_logic.combat (crítico, esquiva, segunda chance do Amuleto de Pedra e
+# roubo de HP da Bênção de Drácula), mas sorteia todos os combates de uma vez
+# com NumPy. Sem NumPy instalado, cai para o núcleo em Python puro (lento).
+#
+#     python -m game_logic.combat_sim <user_id> [--fights 100000] [--seed 1]
+
+import argparse
+import math
+import os
+import random
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # Dependência opcional
+    np = None
+
+# Permite executar como script a partir de qualquer pasta
+OUTLAW_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if OUTLAW_DIR not in sys.path:
+    sys.path.insert(0, OUTLAW_DIR)
+
+from config import CRITICAL_CHANCE, CRITICAL_MULTIPLIER, ENEMIES  # noqa: E402
+from game_logic.combat import (  # noqa: E402
+    SECOND_CHANCE_HP_FRACTION,
+    combat_modifiers,
+    resolve_combat,
+)
+
+
+def _summary(fights: int, wins_by_turn: list, losses_by_turn: list) -> dict:
+    wins = sum(wins_by_turn)
+    total_turns = sum(t * c for t, c in enumerate(wins_by_turn)) + sum(
+        t * c for t, c in enumerate(losses_by_turn)
+    )
+    return {
+        "fights": fights,
+        "wins": wins,
+        "win_rate": wins / fights if fights else 0.0,
+        "mean_turns": total_turns / fights if fights else 0.0,
+        # Histogramas: índice = número de ataques do jogador até o fim do combate
+        "wins_by_turn": wins_by_turn,
+        "losses_by_turn": losses_by_turn,
+    }
+
+
+def _simulate_python(player_hp, player_stats, enemy, fights, has_amulet, lifesteal_percent, seed):
+    rng = random.Random(seed)
+    wins_by_turn, losses_by_turn = [], []
+    for _ in range(fights):
+        result = resolve_combat(player_hp, player_stats, enemy, has_amulet, lifesteal_percent, rng)
+        histogram = wins_by_turn if result["won"] else losses_by_turn
+        while len(histogram) <= result["turns"]:
+            histogram.append(0)
+        histogram[result["turns"]] += 1
+    size = max(len(wins_by_turn), len(losses_by_turn))
+    wins_by_turn += [0] * (size - len(wins_by_turn))
+    losses_by_turn += [0] * (size - len(losses_by_turn))
+    return _summary(fights, wins_by_turn, losses_by_turn)
+
+
+def _simulate_numpy(player_hp, player_stats, enemy, fights, has_amulet, lifesteal_percent, seed):
+    rng = np.random.default_rng(seed)
+    attack = player_stats["attack"]
+    critical_damage = math.floor(attack * CRITICAL_MULTIPLIER)
+    evasion_chance = player_stats["evasion_chance"]
+    max_hp = player_stats["hp"]
+    enemy_attack = enemy["attack"]
+    hp_stolen = math.floor(enemy_attack * lifesteal_percent)
+    second_chance_hp = math.floor(max_hp * SECOND_CHANCE_HP_FRACTION)
+    # Reviver com 0 de HP encerra o combate como derrota, igual a não ter o amuleto
+    has_amulet = has_amulet and second_chance_hp > 0
+
+    wins_by_turn, losses_by_turn = [0], [0]
+    if player_hp <= 0:
+        losses_by_turn[0] = fights
+        return _summary(fights, wins_by_turn, losses_by_turn)
+
+    # Só os combates ainda em andamento ficam nos vetores; os encerrados
+    # entram nos histogramas e são removidos a cada turno
+    player = np.full(fights, player_hp, dtype=np.int64)
+    enemy_hp = np.full(fights, enemy["hp"], dtype=np.int64)
+    amulet = np.full(fights, has_amulet, dtype=bool)
+
+    while player.size:
+        hit_roll, critical_roll, enemy_roll = rng.random((3, player.size))
+
+        # Turno do Jogador
+        enemy_hp -= np.where(critical_roll < CRITICAL_CHANCE, critical_damage, attack)
+        alive = enemy_hp > 0
+        wins_by_turn.append(player.size - int(np.count_nonzero(alive)))
+        player, enemy_hp, amulet = player[alive], enemy_hp[alive], amulet[alive]
+        hit_roll, enemy_roll = hit_roll[alive], enemy_roll[alive]
+
+        # Turno do Inimigo
+        struck = enemy_roll > evasion_chance
+        player -= struck * enemy_attack
+        if hp_stolen > 0:
+            stealing = struck & (hit_roll <= evasion_chance)
+            player = np.where(stealing, np.minimum(max_hp, player + hp_stolen), player)
+
+        # Segunda chance do Amuleto de Pedra
+        down = player <= 0
+        revived = down & amulet
+        player[revived] = second_chance_hp
+        amulet[revived] = False
+        standing = ~(down & ~revived)
+        losses_by_turn.append(player.size - int(np.count_nonzero(standing)))
+        player, enemy_hp, amulet = player[standing], enemy_hp[standing], amulet[standing]
+
+    return _summary(fights, wins_by_turn, losses_by_turn)
+
+
+def simulate_fights(
+    player_hp: int,
+    player_stats: dict,
+    enemy: dict,
+    fights: int,
+    has_amulet: bool = False,
+    lifesteal_percent: float = 0.0,
+    seed=None,
+) -> dict:
+    """
+    Simula `fights` combates independentes do mesmo jogador contra o mesmo
+    inimigo. Retorna vitórias, taxa de vitória, média de turnos e os
+    histogramas de turnos de vitórias e derrotas.
+    """
+    if np is None:
+        return _simulate_python(
+            player_hp, player_stats, enemy, fights, has_amulet, lifesteal_percent, seed
+        )
+    return _simulate_numpy(
+        player_hp, player_stats, enemy, fights, has_amulet, lifesteal_percent, seed
+    )
+
+
+def simulate_location(player_data: dict, location: str, fights_per_enemy: int = 100_000, seed=None) -> dict:
+    """
+    Simula o jogador contra cada inimigo de `location` (com o HP atual dele) e
+    calcula o XP e o dinheiro esperados por combate. O comando /batalhar
+    sorteia o inimigo de forma uniforme, então a média da localização é a
+    média simples entre os inimigos.
+    """
+    # Importação local: utils depende do discord, o núcleo do combate não
+    from utils import calculate_effective_stats, get_player_effective_xp_gain
+
+    player_stats = calculate_effective_stats(player_data)
+    has_amulet, lifesteal_percent = combat_modifiers(player_data)
+    seeds = np.random.SeedSequence(seed).spawn(len(ENEMIES[location])) if np is not None else None
+
+    enemies = []
+    for index, enemy in enumerate(ENEMIES[location]):
+        enemy_seed = seeds[index] if seeds is not None else (None if seed is None else seed + index)
+        result = simulate_fights(
+            player_data["hp"], player_stats, enemy, fights_per_enemy,
+            has_amulet, lifesteal_percent, enemy_seed,
+        )
+        xp_per_win = get_player_effective_xp_gain(player_data, enemy["xp"])
+        money_per_win = math.floor(enemy["money"] * player_stats["money_multiplier"])
+        result["name"] = enemy["name"]
+        result["expected_xp"] = result["win_rate"] * xp_per_win
+        result["expected_money"] = result["win_rate"] * money_per_win
+        enemies.append(result)
+
+    count = len(enemies)
+    return {
+        "location": location,
+        "win_rate": sum(e["win_rate"] for e in enemies) / count,
+        "mean_turns": sum(e["mean_turns"] for e in enemies) / count,
+        "expected_xp": sum(e["expected_xp"] for e in enemies) / count,
+        "expected_money": sum(e["expected_money"] for e in enemies) / count,
+        "enemies": enemies,
+    }
+
+
+def simulate_player(player_data: dict, fights_per_enemy: int = 100_000, seed=None) -> list:
+    """Executa simulate_location() para todas as localizações de ENEMIES."""
+    return [
+        simulate_location(player_data, location, fights_per_enemy, seed)
+        for location in ENEMIES
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simula combates de um jogador em todas as localizações.")
+    parser.add_argument("user_id", help="ID do jogador no banco de dados.")
+    parser.add_argument("--fights", type=int, default=100_000, help="Combates por inimigo.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    from data_manager import load_data, player_database
+
+    load_data()
+    player_data = player_database.get(args.user_id)
+    if not player_data:
+        print(f"Jogador {args.user_id} não encontrado.")
+        sys.exit(1)
+
+    if np is None:
+        print("AVISO: numpy não está instalado; usando o simulador em Python puro (lento).")
+    for report in simulate_player(player_data, args.fights, args.seed):
+        print(
+            f"{report['location']}: vitória {report['win_rate']:.1%}, "
+            f"{report['mean_turns']:.1f} turnos, "
+            f"XP esperado {report['expected_xp']:.1f}, dinheiro esperado ${report['expected_money']:.1f}"
+        )
+        for enemy in report["enemies"]:
+            print(
+                f"    {enemy['name']}: vitória {enemy['win_rate']:.1%}, "
+                f"{enemy['mean_turns']:.1f} turnos"
+            )
+
+
+if __name__ == "__main__":
+    main()
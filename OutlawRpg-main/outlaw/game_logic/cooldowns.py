@@ -0,0 +1,75 @@
+# File: OutlawRpg-main/outlaw/game_logic/cooldowns.py
+#
+# Cooldowns por usuário em memória, compartilhados pelo XP do chat e pelos
+# comandos com espera (/cacar, /batalhar, /viajar, /renascer). Cada cooldown
+# é um CooldownStore com duração fixa: como todas as entradas duram o mesmo
+# tempo, elas vencem na ordem em que foram criadas, e uma fila FIFO basta para
+# descartar as vencidas. acquire() é O(1) amortizado e o store só guarda quem
+# está em cooldown agora (antes: um dicionário que crescia com cada usuário
+# que já falou no servidor, e o cache do discord.py, varrido inteiro a cada
+# uso do comando). Medição de memória e tempo: bench/cooldowns.py.
+
+import time
+from collections import deque
+
+
+class CooldownStore:
+    """
+    Mapa chave -> fim do cooldown (relógio monotonic) com duração fixa de
+    `seconds`. As entradas vencidas saem do mapa nas próximas chamadas.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self._expires = {}  # chave -> instante em que o cooldown termina
+        self._order = deque()  # chaves na ordem de criação (= ordem de vencimento)
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def __contains__(self, key) -> bool:
+        return self.remaining(key) > 0
+
+    def _evict(self, now: float):
+        """Descarta as entradas vencidas até `now` (só olha o começo da fila)."""
+        order, expires = self._order, self._expires
+        while order and expires[order[0]] <= now:
+            del expires[order.popleft()]
+
+    def remaining(self, key, now: float = None) -> float:
+        """Segundos de cooldown restantes para `key` (0 se livre)."""
+        now = time.monotonic() if now is None else now
+        due = self._expires.get(key)
+        return due - now if due is not None and due > now else 0
+
+    def acquire(self, key, now: float = None) -> float:
+        """
+        Verifica e inicia o cooldown de `key` numa única operação. Retorna 0
+        se estava livre (e o cooldown começa agora), ou os segundos que
+        faltam, sem alterar nada.
+        """
+        now = time.monotonic() if now is None else now
+        due = self._expires.get(key)
+        if due is not None:
+            if due > now:
+                return due - now
+            self._evict(now)  # A entrada vencida de `key` está no começo da fila
+        self._expires[key] = now + self.seconds
+        self._order.append(key)
+        if len(self._order) > 1:
+            self._evict(now)  # Limpeza amortizada: cada entrada sai da fila uma vez
+        return 0
+
+
+_stores = {}  # Nome -> CooldownStore
+
+
+def cooldown_store(name: str, seconds: float) -> CooldownStore:
+    """CooldownStore compartilhado com o nome `name` (criado no primeiro uso)."""
+    store = _stores.get(name)
+    if store is None:
+        store = _stores[name] = CooldownStore(seconds)
+    elif store.seconds != seconds:
+        raise ValueError(f"Cooldown {name} já existe com {store.seconds}s (pedido: {seconds}s).")
+    return store
+
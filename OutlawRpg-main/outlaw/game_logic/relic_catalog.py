@@ -0,0 +1,150 @@
+# File: OutlawRpg-main/outlaw/game_logic/relic_catalog.py
+#
+# Catálogo das relíquias montado uma vez ao importar, a partir da lista de
+# relics.py: IDs estáveis, busca por ID/nome em O(1), listas por tier, pesos
+# acumulados por tier e pontos de raridade de cada relíquia.
+
+import re
+import unicodedata
+
+from relics import relics
+
+
+# Tiers do mais comum para o mais raro
+TIER_ORDER = ("Básica", "Comum", "Incomum", "Rara", "Épica", "Mítica")
+
+# Pontos de raridade da coleção por tier (exibidos no perfil)
+TIER_RARITY_POINTS = {
+    "Básica": 1,
+    "Comum": 2,
+    "Incomum": 5,
+    "Rara": 10,
+    "Épica": 25,
+    "Mítica": 50,
+}
+
+# Níveis da coleção: (pontos mínimos, nome), do maior para o menor
+RARITY_LEVELS = (
+    (500, "Lendário"),
+    (200, "Mestre Relicário"),
+    (50, "Colecionador"),
+    (10, "Aventureiro"),
+    (0, "Novato"),
+)
+
+
+def slugify(text: str) -> str:
+    """'Orbe do Caos Abissal' -> 'orbe_do_caos_abissal' (sem acentos)."""
+    ascii_text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "_", ascii_text.lower()).strip("_")
+
+
+def rarity_level(points: int) -> str:
+    """Nome do nível de coleção para `points` pontos de raridade."""
+    for minimum, name in RARITY_LEVELS:
+        if points >= minimum:
+            return name
+    return RARITY_LEVELS[-1][1]
+
+
+class RelicCatalog:
+    """
+    Índice imutável das relíquias. O ID de cada relíquia é o nome sem
+    acentos em minúsculas ('caco_de_telha'); nomes repetidos em tiers
+    diferentes recebem o tier como sufixo em todas as ocorrências
+    ('orbe_do_caos_abissal_incomum'), para que nenhum ID dependa da ordem
+    da lista.
+    """
+
+    def __init__(self, relic_list: list):
+        name_counts = {}
+        for relic in relic_list:
+            name_counts[relic["nome"]] = name_counts.get(relic["nome"], 0) + 1
+
+        entries = []
+        self.by_id = {}
+        self.by_name = {}  # Nome -> primeira relíquia com esse nome
+        for index, relic in enumerate(relic_list):
+            relic_id = slugify(relic["nome"])
+            if name_counts[relic["nome"]] > 1:
+                relic_id = f"{relic_id}_{slugify(relic.get('tier', ''))}"
+            if relic_id in self.by_id:
+                raise ValueError(f"ID de relíquia repetido: {relic_id}")
+            tier = relic.get("tier", "Básica")
+            entry = dict(relic)
+            entry.update(
+                id=relic_id,
+                name=relic["nome"],
+                tier=tier,
+                index=index,
+                rarity_points=TIER_RARITY_POINTS.get(tier, 0),
+            )
+            entries.append(entry)
+            self.by_id[relic_id] = entry
+            self.by_name.setdefault(relic["nome"], entry)
+        self.relics = tuple(entries)
+
+        self.by_tier = {tier: tuple(e for e in entries if e["tier"] == tier) for tier in TIER_ORDER}
+        for entry in entries:  # Tiers fora de TIER_ORDER ficam no fim
+            if entry["tier"] not in self.by_tier:
+                self.by_tier[entry["tier"]] = tuple(e for e in entries if e["tier"] == entry["tier"])
+
+        # Chance total de cada tier e a soma acumulada na ordem dos tiers
+        self.tier_chances = {
+            tier: sum(e["chance_obter_percentual"] for e in tier_entries)
+            for tier, tier_entries in self.by_tier.items()
+        }
+        self.cumulative_tier_chances = []
+        running = 0.0
+        for tier, chance in self.tier_chances.items():
+            running += chance
+            self.cumulative_tier_chances.append((tier, running))
+
+    def __len__(self) -> int:
+        return len(self.relics)
+
+    def __contains__(self, relic_id) -> bool:
+        return relic_id in self.by_id
+
+    def get(self, relic_id: str):
+        """Relíquia pelo ID, ou None."""
+        return self.by_id.get(relic_id)
+
+    def resolve(self, key: str):
+        """Relíquia pelo ID ou, para inventários antigos, pelo nome."""
+        return self.by_id.get(key) or self.by_name.get(key)
+
+    def tier_rank(self, tier: str) -> int:
+        """Posição do tier em TIER_ORDER (tiers desconhecidos ficam em -1)."""
+        return TIER_ORDER.index(tier) if tier in TIER_ORDER else -1
+
+    def count_relics(self, relic_keys) -> dict:
+        """
+        Converte uma lista de IDs/nomes de relíquias (formato antigo de
+        relics_inventory) em {ID: quantidade}, na ordem do catálogo. Chaves
+        desconhecidas são mantidas no fim, para não perder nada.
+        """
+        counts = {}
+        unknown = {}
+        for key in relic_keys:
+            relic = self.resolve(key)
+            if relic:
+                counts[relic["id"]] = counts.get(relic["id"], 0) + 1
+            else:
+                unknown[key] = unknown.get(key, 0) + 1
+        ordered = dict(sorted(counts.items(), key=lambda item: self.by_id[item[0]]["index"]))
+        ordered.update(unknown)
+        return ordered
+
+    def rarity_points(self, relic_counts: dict) -> int:
+        """Soma dos pontos de raridade de um inventário {ID/nome: quantidade}."""
+        total = 0
+        for key, count in relic_counts.items():
+            relic = self.resolve(key)
+            if relic:
+                total += relic["rarity_points"] * count
+        return total
+
+
+# Catálogo usado pelo bot
+relic_catalog = RelicCatalog(relics)
@@ -1,33 +1,187 @@
 # File: OutlawRpg-main/outlaw/game_logic/relic_mechanics.py
-# Crie esta nova pasta 'game_logic' dentro de 'outlaw' e este arquivo 'relic_mechanics.py'.
+#
+# Sorteio de relíquias pelo método alias (Vose): as tabelas são montadas uma
+# vez e cada sorteio custa O(1) (dois números aleatórios), em vez de recriar a
+# lista de pesos e fazer a soma acumulada a cada /bau. Os pesos são
+# convertidos para inteiros exatos, então até 0.00000001% tem a
+# probabilidade certa. Verificação das frequências (qui-quadrado):
+# tests/test_relic_mechanics.py.
 
+import math
 import random
+from decimal import Decimal
 
 # Importa a lista de relíquias do seu novo arquivo de dados
-from relics import relics  # Corrigido: Importação direta
+from relics import relics
+from game_logic.relic_catalog import relic_catalog
 
 
-def get_random_relic():
+def integer_weights(weights) -> list:
+    """
+    Converte pesos decimais (ex: 80.0, 0.00000001) em inteiros com exatamente
+    a mesma proporção entre si, usando o valor decimal escrito no código.
+    """
+    decimals = [Decimal(str(weight)) for weight in weights]
+    if any(value < 0 for value in decimals):
+        raise ValueError("Pesos não podem ser negativos.")
+    places = max((-value.as_tuple().exponent for value in decimals), default=0)
+    scaled = [int(value.scaleb(max(places, 0))) for value in decimals]
+    divisor = math.gcd(*scaled) if any(scaled) else 1
+    return [value // divisor for value in scaled]
+
+
+class AliasSampler:
+    """
+    Sorteador com reposição pelo método alias de Vose, em aritmética inteira.
+    Montagem O(n); cada sorteio é O(1).
+    """
+
+    def __init__(self, items: list, weights: list):
+        if len(items) != len(weights):
+            raise ValueError("items e weights precisam ter o mesmo tamanho.")
+        weights = integer_weights(weights)
+        total = sum(weights)
+        if not items or total == 0:
+            raise ValueError("É preciso ao menos um item com peso positivo.")
+
+        count = len(items)
+        self.items = list(items)
+        self.weights = weights
+        self.total = total
+        # Cada coluna i tem "altura" total; a parte abaixo de threshold[i] é do
+        # item i e o resto do item alias[i]. Tudo multiplicado por n para ficar inteiro.
+        scaled = [weight * count for weight in weights]
+        threshold = [total] * count
+        alias = list(range(count))
+        small = [i for i, value in enumerate(scaled) if value < total]
+        large = [i for i, value in enumerate(scaled) if value >= total]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            threshold[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= total - scaled[less]
+            if scaled[more] < total:
+                small.append(more)
+            else:
+                large.append(more)
+        # Sobras ficam com a coluna inteira (sem erro de arredondamento, a soma fecha exata)
+        for i in small + large:
+            threshold[i] = total
+        self._threshold = threshold
+        self._alias = alias
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def probability(self, index: int) -> float:
+        """Probabilidade exata do item na posição `index`."""
+        return self.weights[index] / self.total
+
+    def draw_index(self, rng=random) -> int:
+        """Sorteia a posição de um item."""
+        column = rng.randrange(len(self._threshold))
+        if rng.randrange(self.total) < self._threshold[column]:
+            return column
+        return self._alias[column]
+
+    def draw_one(self, rng=random):
+        """Sorteia um item."""
+        return self.items[self.draw_index(rng)]
+
+    def draw(self, k: int = 1, rng=random) -> list:
+        """Sorteia `k` itens (com reposição)."""
+        count = len(self._threshold)
+        total = self.total
+        threshold = self._threshold
+        alias = self._alias
+        items = self.items
+        randrange = rng.randrange
+        drawn = []
+        for _ in range(k):
+            column = randrange(count)
+            drawn.append(items[column if randrange(total) < threshold[column] else alias[column]])
+        return drawn
+
+
+def _override_indexes(relic_list: list, overrides: dict) -> dict:
+    """
+    Posição em `relic_list` de cada relíquia citada em `overrides` -> peso.
+    As chaves são IDs do catálogo ('orbe_do_caos_abissal_incomum'); um nome
+    só é aceito quando identifica uma única relíquia da lista. Nomes
+    repetidos, chaves desconhecidas e duas chaves para a mesma relíquia
+    levantam ValueError.
+    """
+    by_id = {}
+    by_name = {}
+    for index, relic in enumerate(relic_list):
+        if "id" in relic:
+            by_id[relic["id"]] = index
+        by_name.setdefault(relic["nome"], []).append(index)
+
+    resolved = {}
+    for key, weight in overrides.items():
+        if key in by_id:
+            index = by_id[key]
+        elif len(by_name.get(key, ())) == 1:
+            index = by_name[key][0]
+        elif key in by_name:
+            ids = ", ".join(str(relic_list[i].get("id", relic_list[i].get("tier"))) for i in by_name[key])
+            raise ValueError(f"Override ambíguo: '{key}' é o nome de {len(by_name[key])} relíquias ({ids}); use o ID.")
+        else:
+            raise ValueError(f"Override para uma relíquia que não está na lista: '{key}'.")
+        if index in resolved:
+            raise ValueError(f"Override repetido para a relíquia '{relic_list[index]['nome']}' (chave '{key}').")
+        resolved[index] = weight
+    return resolved
+
+
+def relic_weights(relic_list: list, tier_multipliers: dict = None, overrides: dict = None) -> list:
+    """
+    Pesos de sorteio das relíquias: 'chance_obter_percentual', com ajustes
+    opcionais de evento. `tier_multipliers` multiplica os pesos de um tier
+    (ex: {"Mítica": 2}) e `overrides` substitui o peso de relíquias pelo ID
+    do catálogo (ex: {"orbe_do_caos_abissal_epica": 0.5}).
+    """
+    tier_multipliers = tier_multipliers or {}
+    overrides = _override_indexes(relic_list, overrides or {})
+    weights = []
+    for index, relic in enumerate(relic_list):
+        if index in overrides:
+            weights.append(Decimal(str(overrides[index])))
+            continue
+        weight = Decimal(str(relic["chance_obter_percentual"]))
+        multiplier = tier_multipliers.get(relic.get("tier"))
+        if multiplier is not None:
+            weight *= Decimal(str(multiplier))
+        weights.append(weight)
+    return weights
+
+
+def build_relic_sampler(relic_list: list = None, tier_multipliers: dict = None, overrides: dict = None) -> AliasSampler:
+    """
+    Monta um sorteador para `relic_list` (padrão: as relíquias do catálogo,
+    já com "id" e "name") com ajustes de evento.
+    """
+    relic_list = relic_catalog.relics if relic_list is None else relic_list
+    return AliasSampler(relic_list, relic_weights(relic_list, tier_multipliers, overrides))
+
+
+# Sorteador padrão, montado uma vez ao importar
+relic_sampler = build_relic_sampler() if relic_catalog.relics else None
+
+
+def get_random_relic(relic_list: list = None):
     """
     Sorteia uma relíquia com base nas chances de obtenção definidas na lista 'relics'.
     Garante um sorteio preciso mesmo com porcentagens muito pequenas.
+    Retorna a entrada do catálogo (com "id" e "name"). Outra lista pode ser
+    passada em `relic_list` (o sorteador é montado na hora).
     """
-    if not relics:
-        return None  # Retorna None se a lista de relíquias estiver vazia
-
-    # Criar uma lista de pesos onde cada peso é a 'chance_obter_percentual'
-    weights = [relic["chance_obter_percentual"] for relic in relics]
-
-    # random.choices fará o sorteio com base nesses pesos.
-    # Ele pode lidar com floats pequenos, mas se você encontrar problemas de precisão
-    # para números *extremamente* pequenos ou uma quantidade *muito grande* de itens,
-    # uma alternativa é escalar os pesos para inteiros grandes:
-    # Por exemplo:
-    # max_decimal_places = 8 # A maior quantidade de casas decimais em suas chances (0.00000001 tem 8)
-    # scale_factor = 10**max_decimal_places
-    # scaled_weights = [int(w * scale_factor) for w in weights]
-    # chosen_relic = random.choices(relics, weights=scaled_weights, k=1)[0]
-
-    # Para o seu conjunto atual de dados, usar os floats diretamente deve funcionar bem:
-    chosen_relic = random.choices(relics, weights=weights, k=1)[0]
-    return chosen_relic
+    if relic_list is None or relic_list is relics:
+        if relic_sampler is None:
+            return None  # Retorna None se a lista de relíquias estiver vazia
+        return relic_sampler.draw_one()
+    if not relic_list:
+        return None
+    return build_relic_sampler(relic_list).draw_one()
@@ -0,0 +1,229 @@
+# File: OutlawRpg-main/outlaw/game_logic/stat_modifiers.py
+#
+# Tabelas de modificadores de atributos compiladas uma vez, ao importar, a
+# partir de ITEMS_DATA e CLASS_TRANSFORMATIONS. Cada modificador é uma tupla
+# de (índice do atributo, soma, multiplicador) e é aplicado como
+# valor = (valor + soma) * multiplicador, na mesma ordem do cálculo antigo,
+# então os resultados são idênticos (inclusive no arredondamento). A
+# equivalência é conferida por tests/test_stats_golden.py.
+
+import math
+
+from config import CLASS_TRANSFORMATIONS, ITEMS_DATA
+
+
+# Índices do vetor de atributos efetivos
+HP = 0
+ATTACK = 1
+SPECIAL_ATTACK = 2
+XP_MULTIPLIER = 3
+MONEY_MULTIPLIER = 4
+HEALING_MULTIPLIER = 5
+COOLDOWN_REDUCTION = 6
+EVASION_CHANCE = 7
+
+STAT_NAMES = (
+    "hp",
+    "attack",
+    "special_attack",
+    "xp_multiplier",
+    "money_multiplier",
+    "healing_multiplier",
+    "cooldown_reduction_percent",
+    "evasion_chance",
+)
+
+# Descrição que identifica o item de cura (cajado do Curandeiro) no ITEMS_DATA
+HEALING_ITEM_DESCRIPTION = "Aumenta a eficácia de todas as suas curas em 20%."
+
+
+def _modifier(flat: dict = None, mult: dict = None) -> tuple:
+    """Monta um modificador ((índice, soma, multiplicador), ...) ignorando entradas neutras."""
+    flat = flat or {}
+    mult = mult or {}
+    entries = []
+    for index in sorted(set(flat) | set(mult)):
+        entry = (index, flat.get(index, 0.0), mult.get(index, 1.0))
+        if entry[1] != 0.0 or entry[2] != 1.0:
+            entries.append(entry)
+    return tuple(entries)
+
+
+# Bônus por classe: (índice, atributo do jogador, coeficiente); soma atributo * coeficiente
+CLASS_MODIFIERS = {
+    "Lutador": ((HP, "strength", 1.5), (ATTACK, "strength", 0.8)),
+    "Espadachim": ((ATTACK, "agility", 1.2), (HP, "agility", 0.5)),
+    "Atirador": ((SPECIAL_ATTACK, "intelligence", 1.5), (ATTACK, "intelligence", 0.5)),
+    "Curandeiro": ((HEALING_MULTIPLIER, "intelligence", 0.02), (HP, "constitution", 1.0)),
+    "Vampiro": (
+        (ATTACK, "strength", 0.7),
+        (SPECIAL_ATTACK, "intelligence", 1.0),
+        (HEALING_MULTIPLIER, "dexterity", 0.015),  # Roubo de vida
+    ),
+    "Domador": (
+        (ATTACK, "strength", 0.6),
+        (HP, "constitution", 0.7),
+        (XP_MULTIPLIER, "dexterity", 0.005),  # Bônus de XP de caça
+    ),
+    "Corpo Seco": ((HP, "constitution", 1.8), (ATTACK, "strength", 0.5)),
+}
+
+# Bônus de estilo de poder (só com o item "Habilidade Inata" no inventário)
+STYLE_MODIFIERS = {
+    "Força": _modifier(mult={ATTACK: 1.05, HP: 1.02}),
+    "Agilidade": _modifier(flat={EVASION_CHANCE: 0.03}, mult={ATTACK: 1.03}),
+    "Inteligência": _modifier(flat={COOLDOWN_REDUCTION: 0.03}, mult={SPECIAL_ATTACK: 1.07}),
+    "Constituição": _modifier(mult={HP: 1.07}),
+    "Destreza": _modifier(flat={XP_MULTIPLIER: 0.05, MONEY_MULTIPLIER: 0.05}),
+}
+
+
+def _equip_modifier(item_info: dict) -> tuple:
+    flat, mult = {}, {}
+    if "attack_bonus_percent" in item_info:
+        mult[ATTACK] = 1 + item_info["attack_bonus_percent"]
+    if "hp_bonus_flat" in item_info:
+        flat[HP] = item_info["hp_bonus_flat"]
+    if "special_attack_bonus_percent" in item_info:
+        mult[SPECIAL_ATTACK] = 1 + item_info["special_attack_bonus_percent"]
+    if "cooldown_reduction_percent" in item_info:
+        flat[COOLDOWN_REDUCTION] = item_info["cooldown_reduction_percent"]
+    if "effect_multiplier" in item_info and item_info.get("description") == HEALING_ITEM_DESCRIPTION:
+        mult[HEALING_MULTIPLIER] = item_info["effect_multiplier"]
+    if "hp_penalty_percent" in item_info:
+        # A soma do HP fixo vem antes da penalidade, como em (hp + soma) * multiplicador
+        mult[HP] = 1 - item_info["hp_penalty_percent"]
+    return _modifier(flat, mult)
+
+
+# Itens equipáveis: item_id -> (classe exigida ou None, modificador)
+EQUIP_MODIFIERS = {
+    item_id: (item_info.get("class_restriction") or None, _equip_modifier(item_info))
+    for item_id, item_info in ITEMS_DATA.items()
+    if item_info.get("type") == "equipable"
+}
+
+
+def _universe_heart_modifier() -> tuple:
+    item_info = ITEMS_DATA.get("coracao_do_universo")
+    if not item_info:
+        return ()
+    return _modifier(
+        flat={
+            XP_MULTIPLIER: item_info.get("xp_multiplier_passive", 0),
+            MONEY_MULTIPLIER: item_info.get("money_multiplier_passive", 0),
+            COOLDOWN_REDUCTION: item_info.get("cooldown_reduction_percent", 0),
+        },
+        mult={
+            ATTACK: 1 + item_info.get("attack_multiplier", 0) / 100,
+            HP: 1 + item_info.get("max_hp_multiplier", 0) / 100,
+        },
+    )
+
+
+# Coração do Universo (passivo, basta estar no inventário)
+UNIVERSE_HEART_MODIFIER = _universe_heart_modifier()
+
+# Transformações: (classe, nome da transformação) -> modificador
+TRANSFORMATION_MODIFIERS = {
+    (player_class, transform_name): _modifier(
+        flat={
+            COOLDOWN_REDUCTION: transform_info.get("cooldown_reduction_percent", 0.0),
+            EVASION_CHANCE: transform_info.get("evasion_chance_bonus", 0.0),
+        },
+        mult={
+            ATTACK: transform_info.get("attack_multiplier", 1.0),
+            SPECIAL_ATTACK: transform_info.get("special_attack_multiplier", 1.0),
+            HP: transform_info.get("hp_multiplier", 1.0),
+            HEALING_MULTIPLIER: transform_info.get("healing_multiplier", 1.0),
+        },
+    )
+    for player_class, transformations in CLASS_TRANSFORMATIONS.items()
+    for transform_name, transform_info in transformations.items()
+}
+
+
+def _blessing_modifier(item_info: dict) -> tuple:
+    flat, mult = {}, {}
+    if "attack_multiplier" in item_info:
+        mult[ATTACK] = item_info["attack_multiplier"]
+    if "special_attack_multiplier" in item_info:
+        mult[SPECIAL_ATTACK] = item_info["special_attack_multiplier"]
+    if "max_hp_multiplier" in item_info:
+        mult[HP] = item_info["max_hp_multiplier"]
+    if "cooldown_reduction_percent" in item_info:
+        flat[COOLDOWN_REDUCTION] = item_info["cooldown_reduction_percent"]
+    if "evasion_chance" in item_info:
+        flat[EVASION_CHANCE] = item_info["evasion_chance"]
+    return _modifier(flat, mult)
+
+
+# Bênçãos que alteram atributos, na ordem do ITEMS_DATA: (campo "<id>_active", modificador)
+BLESSING_MODIFIERS = tuple(
+    (f"{item_id}_active", modifier)
+    for item_id, item_info in ITEMS_DATA.items()
+    if item_info.get("type") == "blessing_unlock"
+    for modifier in (_blessing_modifier(item_info),)
+    if modifier
+)
+
+# Fatores extras de XP usados em utils.get_player_effective_xp_gain
+INNATE_XP_FACTOR = 1 + ITEMS_DATA.get("habilidade_inata", {}).get("xp_multiplier_passive", 0)
+UNIVERSE_HEART_XP_FACTOR = 1 + ITEMS_DATA.get("coracao_do_universo", {}).get("xp_multiplier_passive", 0)
+
+
+def _apply(values: list, modifier: tuple):
+    for index, flat, mult in modifier:
+        values[index] = (values[index] + flat) * mult
+
+
+def compute_effective_stats(player_data: dict) -> dict:
+    """
+    Calcula os atributos efetivos do jogador aplicando, em ordem: classe,
+    estilo (Habilidade Inata), itens equipados, Coração do Universo,
+    transformação e bênçãos ativas.
+    """
+    values = [
+        player_data["max_hp"],
+        player_data["attack"],
+        player_data["special_attack"],
+        1.0,  # xp_multiplier
+        1.0,  # money_multiplier
+        1.0,  # healing_multiplier
+        0.0,  # cooldown_reduction_percent
+        0.0,  # evasion_chance
+    ]
+    player_class = player_data["class"]
+    for index, attribute, coefficient in CLASS_MODIFIERS.get(player_class, ()):
+        values[index] += player_data[attribute] * coefficient
+
+    inventory = player_data.get("inventory", {})
+    if "habilidade_inata" in inventory:
+        _apply(values, STYLE_MODIFIERS.get(player_data.get("power_style"), ()))
+
+    for item_id in player_data.get("equipped_items", {}).values():
+        equip = EQUIP_MODIFIERS.get(item_id)
+        if equip is not None and (equip[0] is None or equip[0] == player_class):
+            _apply(values, equip[1])
+
+    if "coracao_do_universo" in inventory:
+        _apply(values, UNIVERSE_HEART_MODIFIER)
+
+    transform_name = player_data.get("current_transformation")
+    if transform_name:
+        _apply(values, TRANSFORMATION_MODIFIERS.get((player_class, transform_name), ()))
+
+    for active_key, modifier in BLESSING_MODIFIERS:
+        if player_data.get(active_key):
+            _apply(values, modifier)
+
+    return {
+        "hp": max(1, math.floor(values[HP])),
+        "attack": max(1, math.floor(values[ATTACK])),
+        "special_attack": max(1, math.floor(values[SPECIAL_ATTACK])),
+        "xp_multiplier": values[XP_MULTIPLIER],
+        "money_multiplier": values[MONEY_MULTIPLIER],
+        "healing_multiplier": values[HEALING_MULTIPLIER],
+        "cooldown_reduction_percent": min(0.95, values[COOLDOWN_REDUCTION]), # Limitar redução de cooldown
+        "evasion_chance": min(0.75, values[EVASION_CHANCE]), # Limitar chance de esquiva
+    }
@@ -0,0 +1,133 @@
+# File: OutlawRpg-main/outlaw/game_logic/timers.py
+#
+# Agendador de expirações baseado em heap. Em vez de varrer todos os jogadores
+# a cada minuto, cada bênção/transformação ativa vira uma entrada com o
+# horário em que termina; o agendador dorme até a próxima e dispara na hora.
+
+import asyncio
+import heapq
+import itertools
+import time
+
+from config import ITEMS_DATA
+
+
+# Chave usada para a transformação (as bênçãos usam o próprio ID do item)
+TRANSFORMATION_TIMER = "transformation"
+
+# IDs das bênçãos, calculados uma vez (antes: varridos para cada jogador a cada minuto)
+BLESSING_IDS = tuple(
+    item_id
+    for item_id, item_info in ITEMS_DATA.items()
+    if item_info.get("type") == "blessing_unlock"
+)
+
+
+class TimerQueue:
+    """
+    Fila de timers ordenada pelo horário de disparo (timestamp Unix).
+
+    Cada timer tem uma chave (ex: (user_id, "bencao_dracula")). Agendar de
+    novo a mesma chave substitui o timer anterior e cancel() o descarta; as
+    entradas antigas continuam no heap, mas são ignoradas ao sair dele.
+    Sem timers pendentes, run() fica parado sem custo algum.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._due = {}  # chave -> horário atual do timer
+        self._counter = itertools.count()  # Desempate estável no heap
+        self._wakeup = None
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def schedule(self, key, due: float, payload=None):
+        """Agenda (ou reagenda) o timer `key` para o timestamp `due`."""
+        self._due[key] = due
+        heapq.heappush(self._heap, (due, next(self._counter), key, payload))
+        if self._heap[0][2] == key and self._wakeup is not None:
+            self._wakeup.set()  # Ficou antes do próximo: acorda o run() para recalcular a espera
+
+    def cancel(self, key):
+        """Cancela o timer `key`, se existir."""
+        self._due.pop(key, None)
+
+    def due_time(self, key):
+        """Horário agendado para `key`, ou None."""
+        return self._due.get(key)
+
+    def _discard_stale(self):
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def next_due(self):
+        """Horário do próximo timer válido, ou None se a fila estiver vazia."""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float = None) -> list:
+        """Remove e retorna [(chave, payload), ...] dos timers vencidos até `now`."""
+        now = time.time() if now is None else now
+        fired = []
+        while self.next_due() is not None and self._heap[0][0] <= now:
+            due, _, key, payload = heapq.heappop(self._heap)
+            del self._due[key]
+            fired.append((key, payload))
+        return fired
+
+    async def run(self, handler):
+        """
+        Loop de disparo: dorme até o próximo timer e chama `await handler(key, payload)`
+        para cada um que vencer. Deve rodar como uma task do event loop.
+        """
+        self._wakeup = asyncio.Event()
+        while True:
+            next_due = self.next_due()
+            timeout = None if next_due is None else max(0.0, next_due - time.time())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            for key, payload in self.pop_due():
+                try:
+                    await handler(key, payload)
+                except Exception as e:
+                    print(f"Erro ao processar timer {key}: {e}")
+
+
+# Timers de expiração de bênçãos e transformações
+buff_timers = TimerQueue()
+
+
+def schedule_blessing_expiry(user_id, blessing_id: str, end_time: float):
+    """Agenda a expiração de uma bênção ativada em `ativar_bencao`."""
+    buff_timers.schedule((str(user_id), blessing_id), end_time)
+
+
+def schedule_transformation_expiry(user_id, end_time: float):
+    """Agenda a expiração da transformação atual do jogador."""
+    buff_timers.schedule((str(user_id), TRANSFORMATION_TIMER), end_time)
+
+
+def cancel_buff_expiry(user_id, timer_id: str):
+    """Cancela o timer de uma bênção (ID do item) ou da transformação."""
+    buff_timers.cancel((str(user_id), timer_id))
+
+
+def rebuild_buff_timers(player_database: dict) -> int:
+    """
+    Recria os timers a partir dos campos *_end_time persistidos. Chamado uma
+    vez ao iniciar; bênçãos que venceram com o bot desligado disparam logo.
+    Retorna quantos timers foram agendados.
+    """
+    for user_id, player_data in player_database.items():
+        for blessing_id in BLESSING_IDS:
+            if player_data.get(f"{blessing_id}_active"):
+                schedule_blessing_expiry(
+                    user_id, blessing_id, player_data.get(f"{blessing_id}_end_time", 0)
+                )
+        if player_data.get("current_transformation"):
+            schedule_transformation_expiry(user_id, player_data.get("transform_end_time", 0))
+    return len(buff_timers)
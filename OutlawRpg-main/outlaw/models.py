@@ -0,0 +1,374 @@
+# File: OutlawRpg-main/outlaw/models.py
+#
+# Registros de jogador e de clã como dataclasses com slots (sem um dicionário
+# por registro). Os registros aceitam o mesmo acesso de dicionário usado pelo
+# resto do bot (player["money"], .get, in, setdefault), então cogs, views e o
+# journal continuam funcionando sem mudanças; código novo pode usar os
+# atributos tipados (player.money), que são o acesso mais rápido. Campos fora
+# do esquema ficam em `extra`.
+#
+# As bênçãos ficam em Player.blessings ({ID: BlessingState}). As chaves
+# antigas "<bênção>_active" e "<bênção>_end_time" continuam válidas e leem ou
+# escrevem nesses estados. No disco, os registros são dicionários simples
+# (to_dict/from_dict) e as bênçãos são gravadas em "blessings":
+#     {"bencao_dracula": {"active": true, "end_time": 1751675838.0}}
+# Registros antigos, com as chaves soltas, são convertidos ao carregar.
+
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+
+from config import (
+    ATTRIBUTE_POINTS_PER_LEVEL,
+    INITIAL_ATTACK,
+    INITIAL_HP,
+    INITIAL_MONEY,
+    INITIAL_SPECIAL_ATTACK,
+    MAX_ENERGY,
+    STARTING_LOCATION,
+)
+
+
+class _Unset:
+    """Valor dos campos sem dado (equivale a uma chave ausente no dicionário antigo)."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "UNSET"
+
+
+UNSET = _Unset()
+
+
+@dataclass(slots=True)
+class BlessingState:
+    """Estado de uma bênção do jogador."""
+
+    active: bool = False
+    end_time: float = 0
+
+    def to_dict(self) -> dict:
+        return {"active": self.active, "end_time": self.end_time}
+
+
+_blessing_keys = {}  # Cache de _split_blessing_key (o conjunto de chaves usadas é pequeno)
+
+
+def _split_blessing_key(key):
+    """'bencao_dracula_active' -> ('bencao_dracula', 'active'); outras chaves -> (None, None)."""
+    parts = _blessing_keys.get(key)
+    if parts is None:
+        parts = (None, None)
+        if isinstance(key, str):
+            if key.endswith("_active"):
+                parts = (key[:-len("_active")], "active")
+            elif key.endswith("_end_time"):
+                parts = (key[:-len("_end_time")], "end_time")
+        if len(_blessing_keys) < 4096:
+            _blessing_keys[key] = parts
+    return parts
+
+
+class Record(MutableMapping):
+    """
+    Base dos registros. Cada subclasse é uma dataclass com slots cujos
+    campos valem UNSET por padrão; um campo UNSET equivale a uma chave
+    ausente no dicionário antigo. _schema() monta o mapa chave -> campo.
+    """
+
+    __slots__ = ()
+    KEYS = ()  # Chaves persistidas, na ordem dos campos
+    _ATTRS = {}  # Chave -> nome do campo
+    _values = None  # attrgetter de todos os campos de KEYS
+
+    # --- Campos fora do esquema (subclasses podem tratar chaves especiais) ---
+
+    def _get_other(self, key):
+        return self.extra[key]
+
+    def _set_other(self, key, value):
+        self.extra[key] = value
+
+    def _del_other(self, key):
+        del self.extra[key]
+
+    def _has_other(self, key) -> bool:
+        return key in self.extra
+
+    def _iter_other(self):
+        return iter(self.extra)
+
+    # --- Interface de dicionário ---
+
+    def __getitem__(self, key):
+        attr = self._ATTRS.get(key)
+        if attr is not None:
+            value = getattr(self, attr)
+            if value is UNSET:
+                raise KeyError(key)
+            return value
+        return self._get_other(key)
+
+    def __setitem__(self, key, value):
+        attr = self._ATTRS.get(key)
+        if attr is not None:
+            setattr(self, attr, value)
+        else:
+            self._set_other(key, value)
+
+    def __delitem__(self, key):
+        attr = self._ATTRS.get(key)
+        if attr is not None:
+            if getattr(self, attr) is UNSET:
+                raise KeyError(key)
+            setattr(self, attr, UNSET)
+        else:
+            self._del_other(key)
+
+    def __contains__(self, key) -> bool:
+        attr = self._ATTRS.get(key)
+        if attr is not None:
+            return getattr(self, attr) is not UNSET
+        return self._has_other(key)
+
+    def __iter__(self):
+        for key, value in zip(self.KEYS, self._values(self)):
+            if value is not UNSET:
+                yield key
+        yield from self._iter_other()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, key, default=None):
+        # Mais rápido que o get() de MutableMapping, que depende de KeyError
+        attr = self._ATTRS.get(key)
+        if attr is not None:
+            value = getattr(self, attr)
+            return default if value is UNSET else value
+        if self._has_other(key):
+            return self._get_other(key)
+        return default
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    # --- Conversão para persistência ---
+
+    def to_dict(self) -> dict:
+        """Dicionário simples (serializável em JSON) com os dados do registro."""
+        data = {key: value for key, value in zip(self.KEYS, self._values(self)) if value is not UNSET}
+        data.update(self.extra)
+        return data
+
+    @classmethod
+    def from_dict(cls, data) -> "Record":
+        """Monta o registro a partir de um dicionário carregado do disco."""
+        attrs = cls._ATTRS
+        known = {}
+        other = []
+        for key, value in data.items():
+            attr = attrs.get(key)
+            if attr is not None:
+                known[attr] = value
+            else:
+                other.append((key, value))
+        record = cls(**known)
+        for key, value in other:
+            record[key] = value
+        return record
+
+
+def _schema(cls, aliases: dict = None):
+    """Preenche KEYS/_ATTRS/_values de uma subclasse de Record (exceto os campos internos)."""
+    aliases = aliases or {}  # Nome do campo -> chave no registro (ex: player_class -> "class")
+    attrs = [f.name for f in fields(cls) if f.default is UNSET]
+    cls.KEYS = tuple(aliases.get(attr, attr) for attr in attrs)
+    cls._ATTRS = dict(zip(cls.KEYS, attrs))
+    cls._values = attrgetter(*attrs)
+    return cls
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class Player(Record):
+    """Registro de um jogador. Acesse como dicionário ou pelos atributos (player.money)."""
+
+    id: str = UNSET
+    created_at: int = UNSET
+    name: str = UNSET
+    player_class: str = UNSET  # Chave "class"
+    style: str = UNSET
+    power_style: str = UNSET
+    level: int = UNSET
+    xp: int = UNSET
+    attribute_points: int = UNSET
+    hp: int = UNSET
+    max_hp: int = UNSET
+    attack: int = UNSET
+    special_attack: int = UNSET
+    base_attack: int = UNSET
+    base_special_attack: int = UNSET
+    strength: int = UNSET
+    agility: int = UNSET
+    intelligence: int = UNSET
+    constitution: int = UNSET
+    dexterity: int = UNSET
+    money: int = UNSET
+    inventory: dict = UNSET
+    cooldowns: dict = UNSET
+    location: str = UNSET
+    energy: int = UNSET  # Energia no instante energy_timestamp (leia com get_energy)
+    energy_timestamp: float = UNSET
+    kills: int = UNSET
+    deaths: int = UNSET
+    bounty: int = UNSET
+    status: str = UNSET  # online, afk, dead
+    last_attack_time: float = UNSET
+    last_special_attack_time: float = UNSET
+    rebirths: int = UNSET
+    equipped_items: dict = UNSET  # Ex: {"weapon": "espada_lendaria"}
+    current_transformation: str = UNSET
+    transform_end_time: float = UNSET
+    amulet_used_since_revive: bool = UNSET
+    xptriple: bool = UNSET
+    money_double: bool = UNSET
+    relics: dict = UNSET
+    relic_energy: int = UNSET
+    relic_keys: int = UNSET
+    last_key_claim_time: float = UNSET
+    relics_inventory: dict = UNSET  # {ID do catálogo: quantidade}
+    relic_rarity_points: int = UNSET
+    active_relic_chamber: str = UNSET
+    relic_chamber_found_time: float = UNSET
+    clan_id: str = UNSET
+    schema_version: int = UNSET  # Ver storage/migrations.py
+    blessings: dict = field(default_factory=dict)  # ID da bênção -> BlessingState
+    extra: dict = field(default_factory=dict)  # Campos fora do esquema
+
+    @classmethod
+    def new(cls, user_id: str, created_at: int) -> "Player":
+        """Perfil inicial de um jogador novo."""
+        return cls(
+            id=user_id,
+            created_at=created_at,
+            name=None,  # Será definido após a escolha da classe
+            level=1,
+            xp=0,
+            attribute_points=ATTRIBUTE_POINTS_PER_LEVEL,
+            hp=INITIAL_HP,
+            max_hp=INITIAL_HP,
+            attack=INITIAL_ATTACK,
+            special_attack=INITIAL_SPECIAL_ATTACK,
+            money=INITIAL_MONEY,
+            inventory={},
+            location=STARTING_LOCATION,
+            energy=MAX_ENERGY,
+            energy_timestamp=0,
+            kills=0,
+            deaths=0,
+            bounty=0,
+            status="online",
+            last_attack_time=0,
+            last_special_attack_time=0,
+            rebirths=0,
+            equipped_items={},
+            current_transformation=None,
+            transform_end_time=0,
+            relics={},
+            relic_energy=0,
+            relic_keys=0,
+            last_key_claim_time=0,
+            relics_inventory={},
+            relic_rarity_points=0,
+            active_relic_chamber=None,
+            relic_chamber_found_time=0,
+            clan_id=None,
+        )
+
+    # "blessings" e as chaves "<bênção>_active"/"<bênção>_end_time" usam os BlessingState
+
+    def _get_other(self, key):
+        if key == "blessings":
+            return self.blessings
+        blessing_id, part = _split_blessing_key(key)
+        if blessing_id is not None:
+            state = self.blessings.get(blessing_id)
+            if state is not None:
+                return getattr(state, part)
+        return self.extra[key]
+
+    def _set_other(self, key, value):
+        if key == "blessings":
+            self._load_blessings(value)
+            return
+        blessing_id, part = _split_blessing_key(key)
+        if blessing_id is None:
+            self.extra[key] = value
+            return
+        state = self.blessings.get(blessing_id)
+        if state is None:
+            state = self.blessings[blessing_id] = BlessingState()
+        setattr(state, part, value)
+
+    def _del_other(self, key):
+        if key == "blessings":
+            raise KeyError(key)
+        blessing_id, _ = _split_blessing_key(key)
+        if blessing_id is not None and blessing_id in self.blessings:
+            del self.blessings[blessing_id]
+        else:
+            del self.extra[key]
+
+    def _has_other(self, key) -> bool:
+        if key == "blessings":
+            return True
+        blessing_id, _ = _split_blessing_key(key)
+        if blessing_id is not None and blessing_id in self.blessings:
+            return True
+        return key in self.extra
+
+    def _iter_other(self):
+        yield "blessings"
+        yield from self.extra
+
+    def _load_blessings(self, value):
+        self.blessings = {}
+        for blessing_id, state in (value or {}).items():
+            if isinstance(state, BlessingState):
+                self.blessings[blessing_id] = state
+            elif isinstance(state, dict):
+                self.blessings[blessing_id] = BlessingState(state.get("active", False), state.get("end_time", 0))
+
+    def to_dict(self) -> dict:
+        data = Record.to_dict(self)
+        data["blessings"] = {blessing_id: state.to_dict() for blessing_id, state in self.blessings.items()}
+        return data
+
+
+_schema(Player, {"player_class": "class"})
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class Clan(Record):
+    """Registro de um clã. Acesse como dicionário ou pelos atributos (clan.members)."""
+
+    id: str = UNSET
+    name: str = UNSET
+    leader_id: str = UNSET
+    leader: str = UNSET  # Clãs criados por /clan criar
+    members: list = UNSET
+    xp: int = UNSET
+    money: int = UNSET
+    creation_timestamp: int = UNSET
+    created_at: int = UNSET  # Clãs criados por /clan criar
+    last_ranking_timestamp: int = UNSET
+    extra: dict = field(default_factory=dict)  # Campos fora do esquema
+
+
+_schema(Clan)
+
+
+def to_plain(record) -> dict:
+    """Dicionário simples para gravação (aceita registros e dicionários)."""
+    return record.to_dict() if isinstance(record, Record) else record
@@ -0,0 +1,92 @@
+# File: OutlawRpg-main/outlaw/name_resolver.py
+#
+# Resolução de nomes de exibição para embeds (info e ranking de clãs,
+# distribuição da tesouraria). O cache do gateway (get_user) é consultado
+# primeiro; os nomes buscados na API ficam num cache LRU com validade
+# (NAME_CACHE_SIZE, NAME_CACHE_TTL_SECONDS). Pedidos simultâneos do mesmo
+# usuário compartilham uma única chamada a fetch_user, e resolve_many() busca
+# todos os nomes que faltam em paralelo: uma página com N membros custa no
+# máximo uma rodada de fetch_user, em vez de N chamadas em sequência.
+
+import asyncio
+import time
+from collections import OrderedDict
+
+import discord
+
+from config import NAME_CACHE_SIZE, NAME_CACHE_TTL_SECONDS
+
+
+UNKNOWN_USER_NAME = "Usuário Desconhecido"
+FETCH_ERROR_NAME = "Erro ao Buscar Usuário"
+INTERNAL_ERROR_NAME = "Erro Interno"
+
+
+class NameResolver:
+    """Nomes de exibição por ID de usuário, com cache LRU+TTL e busca deduplicada."""
+
+    def __init__(self, bot, max_size: int = NAME_CACHE_SIZE, ttl: float = NAME_CACHE_TTL_SECONDS):
+        self.bot = bot
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cache = OrderedDict()  # ID -> (nome, instante em que vence), do menos para o mais recente
+        self._inflight = {}  # ID -> task de fetch_user em andamento
+        self.fetches = 0  # Chamadas a fetch_user (para medir o cache)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def cached(self, user_id: int):
+        """Nome sem chamar a API (cache do gateway ou LRU), ou None."""
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            return user.display_name
+        entry = self._cache.get(user_id)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._cache[user_id]
+            return None
+        self._cache.move_to_end(user_id)
+        return entry[0]
+
+    def _store(self, user_id: int, name: str):
+        self._cache[user_id] = (name, time.monotonic() + self.ttl)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    async def _fetch(self, user_id: int) -> str:
+        try:
+            self.fetches += 1
+            user = await self.bot.fetch_user(user_id)
+            name = user.display_name
+        except discord.NotFound:
+            name = UNKNOWN_USER_NAME  # Também fica em cache: o usuário não vai aparecer
+        except discord.HTTPException:
+            return FETCH_ERROR_NAME  # Sem cache: tenta de novo no próximo pedido
+        except Exception as e:
+            print(f"Erro inesperado ao buscar o nome do usuário {user_id}: {e}")
+            return INTERNAL_ERROR_NAME
+        finally:
+            self._inflight.pop(user_id, None)
+        self._store(user_id, name)
+        return name
+
+    async def resolve(self, user_id) -> str:
+        """Nome de exibição do usuário. Nunca levanta erro: falhas viram um texto fixo."""
+        user_id = int(user_id)
+        name = self.cached(user_id)
+        if name is not None:
+            return name
+        task = self._inflight.get(user_id)
+        if task is None:
+            task = self._inflight[user_id] = asyncio.ensure_future(self._fetch(user_id))
+        # shield: um comando cancelado não cancela a busca de quem espera o mesmo nome
+        return await asyncio.shield(task)
+
+    async def resolve_many(self, user_ids) -> dict:
+        """{ID (int): nome} para todos os IDs, com os que faltam buscados em paralelo."""
+        unique_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+        names = await asyncio.gather(*(self.resolve(user_id) for user_id in unique_ids))
+        return dict(zip(unique_ids, names))
@@ -0,0 +1,215 @@
+# File: OutlawRpg-main/outlaw/notifications.py
+#
+# Fila central de DMs. Quem avisa o jogador (expiração de bênção ou
+# transformação, chaves de baú, avisos de clã) só chama notify(), que não
+# espera pela API: o texto entra na fila do jogador e um grupo pequeno de
+# workers faz o envio. Avisos do mesmo jogador que chegam antes do envio viram
+# uma única DM (uma linha por aviso). O envio respeita um limite global de
+# DMs por segundo e um intervalo mínimo por jogador (a rota de DM de cada
+# usuário), e quem não aceita DMs fica em cache por DM_CLOSED_RETRY_SECONDS
+# para não ser tentado a cada aviso. metrics() resume fila, envios e latência.
+# Ao desligar, drain() espera a fila esvaziar por um tempo limitado e stop()
+# loga quantos avisos ficaram sem envio.
+
+import asyncio
+import time
+from collections import deque
+
+import discord
+
+from config import (
+    DM_WORKERS,
+    DM_GLOBAL_RATE_PER_SECOND,
+    DM_PER_USER_INTERVAL_SECONDS,
+    DM_CLOSED_RETRY_SECONDS,
+)
+from game_logic.cooldowns import CooldownStore
+
+
+MAX_DM_LENGTH = 2000  # Limite de caracteres de uma mensagem do Discord
+
+
+def _split_message(lines: list) -> list:
+    """Junta os avisos em mensagens de até MAX_DM_LENGTH caracteres."""
+    messages = []
+    current = ""
+    for line in lines:
+        line = line[:MAX_DM_LENGTH]
+        if current and len(current) + 1 + len(line) > MAX_DM_LENGTH:
+            messages.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        messages.append(current)
+    return messages
+
+
+class NotificationQueue:
+    """Fila de DMs com envio em segundo plano. Use notify(); start() inicia os workers."""
+
+    def __init__(
+        self,
+        bot,
+        workers: int = DM_WORKERS,
+        rate_per_second: float = DM_GLOBAL_RATE_PER_SECOND,
+        user_interval: float = DM_PER_USER_INTERVAL_SECONDS,
+        closed_retry: float = DM_CLOSED_RETRY_SECONDS,
+    ):
+        self.bot = bot
+        self.workers = workers
+        self.send_interval = 1 / rate_per_second
+        self._pending = {}  # ID do usuário -> avisos ainda não enviados
+        self._since = {}  # ID do usuário -> instante (monotonic) do aviso mais antigo pendente
+        self._ready = deque()  # Usuários prontos para envio (fora do intervalo por usuário)
+        self._wakeup = asyncio.Event()
+        self._next_send = 0.0  # Próximo horário livre do limite global
+        self._user_interval = CooldownStore(user_interval)  # Último envio de cada usuário
+        self._closed = CooldownStore(closed_retry)  # Usuários com DM fechada (cache negativo)
+        self._latencies = deque(maxlen=1000)  # Segundos entre o aviso e a entrega
+        self._tasks = []
+        self._in_flight = {}  # ID do usuário -> avisos sendo enviados agora
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0  # Avisos juntados a uma DM já na fila
+        self.skipped = 0  # Avisos descartados (DM fechada em cache)
+
+    def start(self):
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Espera até `timeout` segundos que os avisos na fila e em envio sejam
+        entregues. Retorna True se a fila esvaziou.
+        """
+        deadline = time.monotonic() + timeout
+        while self._pending or self._in_flight:
+            if not self._tasks or time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.1)
+        return True
+
+    def stop(self) -> int:
+        """
+        Cancela os workers e descarta o que não foi entregue, logando quantos
+        avisos ficaram sem envio. Retorna esse número.
+        """
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        users = set(self._pending) | set(self._in_flight)
+        dropped = sum(len(lines) for lines in self._pending.values()) + sum(self._in_flight.values())
+        if dropped:
+            print(f"Fila de DMs encerrada: {dropped} avisos para {len(users)} usuário(s) descartados sem envio.")
+        self._pending.clear()
+        self._since.clear()
+        self._ready.clear()
+        self._in_flight.clear()
+        return dropped
+
+    def notify(self, user_id, text: str) -> bool:
+        """
+        Coloca `text` na fila de DMs do usuário. Retorna False se ele está no
+        cache de DMs fechadas. Não espera pelo envio.
+        """
+        user_id = int(user_id)
+        if user_id in self._closed:
+            self.skipped += 1
+            return False
+        lines = self._pending.get(user_id)
+        if lines is not None:
+            lines.append(text)  # Vai junto na DM que já está na fila
+            self.coalesced += 1
+            return True
+        self._pending[user_id] = [text]
+        self._since[user_id] = time.monotonic()
+        delay = self._user_interval.remaining(user_id)
+        if delay > 0:
+            # Recebeu uma DM há pouco: espera o intervalo (e junta o que chegar até lá)
+            asyncio.get_running_loop().call_later(delay, self._push, user_id)
+        else:
+            self._push(user_id)
+        return True
+
+    def _push(self, user_id: int):
+        self._ready.append(user_id)
+        self._wakeup.set()
+
+    async def _worker(self):
+        await self.bot.wait_until_ready()  # get_user depende do cache do gateway
+        while True:
+            while not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            user_id = self._ready.popleft()
+
+            # Limite global: cada envio reserva o próximo horário livre
+            now = time.monotonic()
+            slot = max(now, self._next_send)
+            self._next_send = slot + self.send_interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+
+            lines = self._pending.pop(user_id, None)
+            since = self._since.pop(user_id, None)
+            if not lines:
+                continue
+            self._user_interval.acquire(user_id)
+            self._in_flight[user_id] = self._in_flight.get(user_id, 0) + len(lines)
+            try:
+                await self._deliver(user_id, lines, since)
+            except Exception as e:
+                self.failed += 1
+                print(f"Erro ao enviar DM para {user_id}: {e}")
+            finally:
+                remaining = self._in_flight.get(user_id, 0) - len(lines)
+                if remaining > 0:
+                    self._in_flight[user_id] = remaining
+                else:
+                    self._in_flight.pop(user_id, None)
+
+    async def _deliver(self, user_id: int, lines: list, since: float):
+        try:
+            user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+            for message in _split_message(lines):
+                await user.send(message)
+        except (discord.Forbidden, discord.NotFound):
+            self._closed.acquire(user_id)  # DM fechada ou usuário inexistente: não tenta por um tempo
+            self.failed += 1
+        except discord.HTTPException as e:
+            self.failed += 1
+            print(f"ERRO HTTP ao enviar DM para {user_id}: {e}")
+        else:
+            self.sent += 1
+            self._latencies.append(time.monotonic() - since)
+
+    def metrics(self) -> dict:
+        """Profundidade da fila, contadores e latência de entrega (últimas 1000 DMs)."""
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] if latencies else 0.0
+
+        return {
+            "queued_users": len(self._pending),
+            "queued_messages": sum(len(lines) for lines in self._pending.values()),
+            "ready": len(self._ready),
+            "sent": self.sent,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "skipped": self.skipped,
+            "closed_cached": len(self._closed),
+            "latency_p50": percentile(0.5),
+            "latency_p95": percentile(0.95),
+            "latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+    def summary(self) -> str:
+        m = self.metrics()
+        return (
+            f"DMs: {m['queued_users']} usuários na fila ({m['queued_messages']} avisos), "
+            f"{m['sent']} enviadas, {m['failed']} falhas, {m['coalesced']} avisos juntados, "
+            f"{m['skipped']} descartados ({m['closed_cached']} DMs fechadas em cache); "
+            f"latência p50 {m['latency_p50']:.1f}s, p95 {m['latency_p95']:.1f}s, máx {m['latency_max']:.1f}s."
+        )
@@ -0,0 +1,155 @@
+# File: OutlawRpg-main/outlaw/role_sync.py
+#
+# Sincronização dos cargos de nível por diferença. Cada jogador tem um
+# conjunto desejado de cargos gerenciados (o cargo do maior nível alcançado
+# em LEVEL_ROLES, ou o cargo de novo personagem antes do primeiro cargo de
+# nível), calculado com bisect numa tabela montada uma vez. O RoleSync guarda
+# o último conjunto aplicado de cada membro e só coloca na fila quem mudou:
+# level-up, on_member_update/on_member_join e a passada periódica, que compara
+# o nível de cada jogador com o estado guardado sem chamar a API. A fila é
+# processada com intervalo entre as edições e uma única edição por membro
+# (antes: remove_roles e add_roles separados para cada membro, a cada 5
+# minutos, sem espaçamento).
+
+import asyncio
+from bisect import bisect_right
+from collections import deque
+
+import discord
+
+from config import LEVEL_ROLES, NEW_CHARACTER_ROLE_ID, ROLE_SYNC_EDIT_INTERVAL_SECONDS
+
+
+def _valid_role_id(role_id) -> bool:
+    return isinstance(role_id, int) and role_id > 0
+
+
+# Tabela nível -> cargos desejados: _DESIRED_ROLES[bisect_right(_LEVEL_THRESHOLDS, nível)]
+_LEVEL_THRESHOLDS = sorted(LEVEL_ROLES) if isinstance(LEVEL_ROLES, dict) else []
+_DESIRED_ROLES = [frozenset({NEW_CHARACTER_ROLE_ID}) if _valid_role_id(NEW_CHARACTER_ROLE_ID) else frozenset()]
+_DESIRED_ROLES += [frozenset({LEVEL_ROLES[level]}) for level in _LEVEL_THRESHOLDS]
+
+# Cargos que a sincronização adiciona e remove; os demais cargos do membro não são tocados
+MANAGED_ROLE_IDS = frozenset().union(*_DESIRED_ROLES)
+
+
+def desired_roles(player_data):
+    """
+    IDs dos cargos gerenciados que o jogador deve ter, ou None para não
+    mexer nos cargos dele (modo AFK). Os conjuntos são compartilhados.
+    """
+    if player_data.get("status") == "afk":
+        return None
+    return _DESIRED_ROLES[bisect_right(_LEVEL_THRESHOLDS, player_data.get("level", 1))]
+
+
+def managed_roles(member: discord.Member) -> frozenset:
+    """IDs dos cargos gerenciados que o membro tem agora."""
+    return frozenset(role.id for role in member.roles if role.id in MANAGED_ROLE_IDS)
+
+
+class RoleSync:
+    """
+    Fila de membros a sincronizar. `guild` é uma função que retorna a
+    guilda (ou None) e `players` é o banco de jogadores.
+    """
+
+    def __init__(self, guild, players, edit_interval: float = ROLE_SYNC_EDIT_INTERVAL_SECONDS):
+        self.guild = guild
+        self.players = players
+        self.edit_interval = edit_interval
+        self._applied = {}  # ID do membro -> cargos gerenciados que ele tem no Discord
+        self._queue = deque()
+        self._queued = set()
+        self._wakeup = None
+        self.edits = 0  # Edições feitas desde o início (para o log)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def mark(self, member_id):
+        """Coloca o membro na fila (uma vez, mesmo se marcado várias vezes)."""
+        member_id = int(member_id)
+        if member_id not in self._queued:
+            self._queued.add(member_id)
+            self._queue.append(member_id)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    def member_roles_changed(self, member: discord.Member):
+        """on_member_update: só entra na fila se os cargos gerenciados mudaram por fora."""
+        if managed_roles(member) != self._applied.get(member.id):
+            self.mark(member.id)
+
+    async def refresh(self, batch_size: int = 1000) -> int:
+        """
+        Passada periódica: coloca na fila os jogadores cujo conjunto desejado
+        é diferente do aplicado (na primeira passada, todos). Não chama a
+        API. Retorna quantos foram colocados na fila.
+        """
+        marked = 0
+        for index, (user_id, player_data) in enumerate(list(self.players.items())):
+            if index and index % batch_size == 0:
+                await asyncio.sleep(0)  # Não trava o event loop com muitos jogadores
+            if not user_id.isdigit():
+                continue
+            desired = desired_roles(player_data)
+            if desired is not None and desired != self._applied.get(int(user_id)):
+                self.mark(user_id)
+                marked += 1
+        return marked
+
+    async def reconcile(self, member_id: int) -> bool:
+        """Aplica o conjunto desejado ao membro numa única edição. Retorna True se editou."""
+        player_data = self.players.get(str(member_id))
+        desired = desired_roles(player_data) if player_data is not None else None
+        guild = self.guild()
+        if desired is None or guild is None:
+            return False
+        member = guild.get_member(member_id)
+        if member is None:
+            if guild.chunked:
+                self._applied[member_id] = desired  # Fora da guilda: on_member_join marca de novo
+            return False
+        current = managed_roles(member)
+        if current == desired:
+            self._applied[member_id] = desired
+            return False
+
+        roles = [role for role in member.roles[1:] if role.id not in MANAGED_ROLE_IDS or role.id in desired]
+        for role_id in desired - current:
+            role = guild.get_role(role_id)
+            if role is None:
+                print(f"AVISO: Cargo com ID {role_id} não encontrado na guilda.")
+                continue
+            roles.append(role)
+        try:
+            await member.edit(roles=roles, reason="Sincronização de cargos de nível.")
+        except discord.Forbidden:
+            print(f"PERMISSÃO NEGADA: Não foi possível atualizar os cargos de {member.display_name}.")
+        except discord.HTTPException as e:
+            print(f"ERRO HTTP ao atualizar os cargos de {member.display_name}: {e}")
+        self._applied[member_id] = desired  # Mesmo com erro: a próxima tentativa vem de um evento
+        self.edits += 1
+        return True
+
+    async def run(self):
+        """
+        Processa a fila: uma edição por membro, com `edit_interval` segundos
+        entre as edições. Deve rodar como uma task do event loop.
+        """
+        self._wakeup = asyncio.Event()
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            member_id = self._queue.popleft()
+            self._queued.discard(member_id)
+            try:
+                edited = await self.reconcile(member_id)
+            except Exception as e:
+                print(f"Erro ao sincronizar os cargos do membro {member_id}: {e}")
+                edited = True
+            if edited:
+                await asyncio.sleep(self.edit_interval)
@@ -0,0 +1,75 @@
+# File: OutlawRpg-main/outlaw/storage/base.py
+
+
+class StorageBackend:
+    """
+    Interface comum dos backends de persistência usados pelo data_manager.
+
+    O data_manager mantém os dados em memória e informa ao backend apenas o
+    que mudou desde o último flush: `changed` são os registros a gravar
+    (id -> registro) e `removed` são os IDs apagados.
+
+    A gravação acontece em duas etapas:
+      1. prepare_*() roda na thread do event loop e converte os registros
+         alterados em uma forma imutável (bytes, tuplas), sem guardar
+         referências aos dicionários vivos. O custo deve ser proporcional ao
+         número de alterações.
+      2. write_*() recebe o resultado da etapa 1 e faz o I/O. Pode rodar em
+         uma thread de trabalho; as chamadas chegam sempre em ordem.
+    """
+
+    def load_players(self) -> dict:
+        """Retorna todos os jogadores persistidos (id -> registro)."""
+        raise NotImplementedError
+
+    def iter_players(self, progress=None):
+        """
+        Retorna um iterador de pares (id, registro) dos jogadores persistidos,
+        lidos aos poucos. O iterador pode ser consumido em outra thread (uma
+        de cada vez). `progress` (opcional) recebe a fração já lida, de 0 a 1.
+        Padrão: load_players() inteiro.
+        """
+        return iter(self.load_players().items())
+
+    def load_player(self, user_id: str):
+        """
+        Retorna um jogador pelo ID (None se não existir), sem carregar os
+        outros. Lança NotImplementedError se o backend não tiver leitura
+        individual.
+        """
+        raise NotImplementedError
+
+    def load_clans(self) -> dict:
+        """Retorna todos os clãs persistidos (id -> registro)."""
+        raise NotImplementedError
+
+    def load_journal_seq(self) -> int:
+        """
+        Retorna o seq do journal incluído no último snapshot gravado (0 se
+        nenhum). Chamado depois de load_players() ou durante iter_players();
+        retorna None enquanto o valor ainda não tiver sido lido.
+        """
+        raise NotImplementedError
+
+    def prepare_players(self, changed: dict, removed: set, journal_seq: int = None):
+        """
+        Captura os jogadores modificados para uma gravação posterior. Se
+        `journal_seq` for informado, ele é gravado junto, na mesma operação.
+        """
+        raise NotImplementedError
+
+    def write_players(self, prepared):
+        """Persiste o resultado de prepare_players()."""
+        raise NotImplementedError
+
+    def prepare_clans(self, changed: dict, removed: set):
+        """Captura os clãs modificados para uma gravação posterior."""
+        raise NotImplementedError
+
+    def write_clans(self, prepared):
+        """Persiste o resultado de prepare_clans()."""
+        raise NotImplementedError
+
+    def close(self):
+        """Libera recursos (conexões, arquivos abertos)."""
+        pass
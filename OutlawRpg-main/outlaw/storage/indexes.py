@@ -0,0 +1,160 @@
+# File: OutlawRpg-main/outlaw/storage/indexes.py
+#
+# Índices em memória mantidos junto com os bancos de data_manager. Eles são
+# atualizados quando um registro é marcado com save_data()/save_clan_data()
+# (toda alteração já precisa passar por lá para ser gravada) e reconstruídos
+# a cada carregamento.
+
+import bisect
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:  # Dependência opcional
+    SortedList = None
+
+
+class Leaderboard:
+    """
+    Ranking ordenado de registros por uma pontuação (tupla de números, a
+    maior primeiro). Atualizar um registro custa O(log N) com sortedcontainers
+    (ou uma busca binária + deslocamento da lista sem ele) e ler os k
+    primeiros custa O(k). Empates são desfeitos pelo ID do registro.
+    """
+
+    def __init__(self, score):
+        self._score = score  # Função registro -> tupla de números
+        self._entries = SortedList() if SortedList is not None else []
+        self._keys = {}  # ID -> chave atual em _entries
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _key(self, record_id: str, record: dict) -> tuple:
+        # Pontuação negada: a ordem crescente da lista vira "maior primeiro"
+        return tuple(-value for value in self._score(record)) + (record_id,)
+
+    def _insert(self, key: tuple):
+        if SortedList is not None:
+            self._entries.add(key)
+        else:
+            bisect.insort(self._entries, key)
+
+    def _discard(self, key: tuple):
+        if SortedList is not None:
+            self._entries.remove(key)
+        else:
+            del self._entries[bisect.bisect_left(self._entries, key)]
+
+    def update(self, record_id: str, record: dict):
+        """Insere ou reposiciona `record_id` de acordo com a pontuação atual de `record`."""
+        key = self._key(record_id, record)
+        old_key = self._keys.get(record_id)
+        if old_key == key:
+            return
+        if old_key is not None:
+            self._discard(old_key)
+        self._insert(key)
+        self._keys[record_id] = key
+
+    def remove(self, record_id: str):
+        """Remove `record_id` do ranking, se estiver nele."""
+        old_key = self._keys.pop(record_id, None)
+        if old_key is not None:
+            self._discard(old_key)
+
+    def rebuild(self, table: dict):
+        """Recria o ranking inteiro a partir de {ID: registro}."""
+        self._keys = {record_id: self._key(record_id, record) for record_id, record in table.items()}
+        keys = sorted(self._keys.values())
+        self._entries = SortedList(keys) if SortedList is not None else keys
+
+    def top(self, count: int) -> list:
+        """IDs dos `count` primeiros colocados, em ordem."""
+        if SortedList is not None:
+            return [key[-1] for key in self._entries.islice(0, count)]
+        return [key[-1] for key in self._entries[:count]]
+
+    def iter_ids(self):
+        """Percorre todos os IDs em ordem de colocação."""
+        for key in self._entries:
+            yield key[-1]
+
+    def rank(self, record_id: str):
+        """Posição (começando em 1) de `record_id`, ou None se não estiver no ranking."""
+        key = self._keys.get(record_id)
+        if key is None:
+            return None
+        if SortedList is not None:
+            return self._entries.index(key) + 1
+        return bisect.bisect_left(self._entries, key) + 1
+
+    def verify(self, table: dict) -> bool:
+        """Confere se o ranking corresponde exatamente a `table`."""
+        expected = {record_id: self._key(record_id, record) for record_id, record in table.items()}
+        return expected == self._keys and list(self._entries) == sorted(expected.values())
+
+
+class GroupIndex:
+    """
+    Índice chave -> conjunto de IDs (ex: clã -> membros, local -> jogadores).
+    A chave de cada registro é calculada por `key(registro)`; registros com
+    chave None ficam fora do índice.
+    """
+
+    def __init__(self, key):
+        self._key = key
+        self._groups = {}  # chave -> set de IDs
+        self._keys = {}  # ID -> chave atual
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _add(self, record_id: str, key):
+        self._groups.setdefault(key, set()).add(record_id)
+        self._keys[record_id] = key
+
+    def remove(self, record_id: str):
+        """Remove `record_id` do índice, se estiver nele."""
+        old_key = self._keys.pop(record_id, None)
+        if old_key is None:
+            return
+        group = self._groups[old_key]
+        group.discard(record_id)
+        if not group:
+            del self._groups[old_key]
+
+    def update(self, record_id: str, record: dict):
+        """Move `record_id` para o grupo da chave atual de `record`."""
+        key = self._key(record)
+        if self._keys.get(record_id) == key:
+            return
+        self.remove(record_id)
+        if key is not None:
+            self._add(record_id, key)
+
+    def rebuild(self, table: dict):
+        """Recria o índice inteiro a partir de {ID: registro}."""
+        self._groups = {}
+        self._keys = {}
+        for record_id, record in table.items():
+            key = self._key(record)
+            if key is not None:
+                self._add(record_id, key)
+
+    def get(self, key) -> frozenset:
+        """IDs do grupo `key` (conjunto vazio se não houver nenhum)."""
+        return frozenset(self._groups.get(key, ()))
+
+    def keys(self) -> list:
+        """Chaves que têm ao menos um registro."""
+        return list(self._groups)
+
+    def key_of(self, record_id: str):
+        """Chave atual de `record_id` no índice, ou None."""
+        return self._keys.get(record_id)
+
+    def verify(self, table: dict) -> bool:
+        """Confere se o índice corresponde exatamente a `table`."""
+        expected = GroupIndex(self._key)
+        expected.rebuild(table)
+        return expected._groups == self._groups and expected._keys == self._keys
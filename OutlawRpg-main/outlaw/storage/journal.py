@@ -0,0 +1,160 @@
+# File: OutlawRpg-main/outlaw/storage/journal.py
+#
+# Journal (append-only) das alterações de jogadores. Cada linha é um JSON
+# como {"seq": 42, "uid": "123", "field": "money", "op": "add", "v": 150}.
+# O journal é dividido em segmentos (<prefixo>.<n>.log). Quando um snapshot
+# é gravado, os segmentos já incluídos nele são apagados (compactação).
+# Ao iniciar, as entradas com seq maior que o do snapshot são reaplicadas.
+
+import glob
+import json
+import os
+
+
+# Operações suportadas:
+#   "create" - cria o registro do jogador com o valor `v` (se ainda não existir)
+#   "set"    - record[field] = v
+#   "add"    - record[field] += v
+#   "append" - record[field].append(v)
+#   "remove" - record[field].remove(v) (se presente)
+#   "pop"    - del record[field] (se presente)
+# Com "key", a operação é aplicada em record[field][key] (ex: inventário).
+OPS = ("create", "set", "add", "append", "remove", "pop")
+
+
+def apply_mutation(database: dict, entry: dict) -> bool:
+    """Aplica uma entrada do journal ao banco em memória. Retorna False se o jogador não existe."""
+    uid = entry["uid"]
+    op = entry["op"]
+    if op == "create":
+        database.setdefault(uid, entry["v"])
+        return True
+    record = database.get(uid)
+    if record is None:
+        return False
+    target, field = record, entry["field"]
+    if "key" in entry:
+        target, field = record.setdefault(field, {}), entry["key"]
+    value = entry["v"]
+    if op == "set":
+        target[field] = value
+    elif op == "add":
+        target[field] = target.get(field, 0) + value
+    elif op == "append":
+        target.setdefault(field, []).append(value)
+    elif op == "remove":
+        if value in target.get(field, []):
+            target[field].remove(value)
+    elif op == "pop":
+        target.pop(field, None)
+    else:
+        raise ValueError(f"Operação de journal desconhecida: {op}")
+    return True
+
+
+class Journal:
+    """
+    Journal segmentado. Não é thread-safe: append(), seal(),
+    read_entries() e discard() devem ser chamados pela thread do event loop.
+    """
+
+    def __init__(self, prefix: str, fsync: bool = False):
+        self.prefix = prefix
+        self.fsync = fsync
+        self.seq = 0  # Último seq emitido
+        self.pending_bytes = 0  # Tamanho do segmento ativo
+        self._file = None
+        self._sealed = []  # Segmentos fechados, aguardando um snapshot que os inclua
+        self._next_segment = 1
+
+    def _segment_path(self, number: int) -> str:
+        return f"{self.prefix}.{number}.log"
+
+    def _existing_segments(self) -> list:
+        segments = []
+        for path in glob.glob(f"{glob.escape(self.prefix)}.*.log"):
+            number = path[len(self.prefix) + 1:-len(".log")]
+            if number.isdigit():
+                segments.append((int(number), path))
+        return [path for _, path in sorted(segments)]
+
+    def read_entries(self, snapshot_seq: int) -> list:
+        """
+        Lê as entradas com seq maior que `snapshot_seq`, em ordem, sem
+        aplicá-las, e prepara o journal para receber novas entradas depois
+        delas. O carregamento incremental (data_manager) aplica as entradas
+        de cada jogador quando o registro dele é lido.
+        """
+        self.seq = snapshot_seq
+        entries = []
+        segments = self._existing_segments()
+        for path in segments:
+            with open(path, "rb") as f:
+                lines = f.read().split(b"\n")
+            for index, line in enumerate(lines):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Só a última linha pode estar incompleta (queda no meio da escrita)
+                    if index < len(lines) - 1 and any(l.strip() for l in lines[index + 1:]):
+                        print(f"AVISO: Linha corrompida ignorada em {os.path.basename(path)}.")
+                    continue
+                self.seq = max(self.seq, entry["seq"])
+                if entry["seq"] <= snapshot_seq:
+                    continue
+                entries.append(entry)
+        if segments:
+            number = segments[-1][len(self.prefix) + 1:-len(".log")]
+            self._next_segment = int(number) + 1
+        self._sealed = segments
+        return entries
+
+    def append(self, entry: dict) -> int:
+        """Grava uma entrada no segmento ativo e retorna seu seq."""
+        if self._file is None:
+            self._file = open(self._segment_path(self._next_segment), "ab")
+            self._next_segment += 1
+        self.seq += 1
+        entry["seq"] = self.seq
+        line = json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n"
+        self._file.write(line)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.pending_bytes += len(line)
+        return self.seq
+
+    def seal(self) -> tuple:
+        """
+        Fecha o segmento ativo. Retorna (seq, segmentos): o seq de todas as
+        alterações já aplicadas em memória e os segmentos que poderão ser
+        apagados depois que um snapshot com esse seq for gravado.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._sealed.append(self._file.name)
+            self._file = None
+            self.pending_bytes = 0
+        return self.seq, list(self._sealed)
+
+    def has_segments(self) -> bool:
+        """Indica se há segmentos no disco que ainda não foram compactados."""
+        return bool(self._sealed) or self._file is not None
+
+    def discard(self, segments: list):
+        """Apaga segmentos já incluídos em um snapshot gravado com sucesso."""
+        for path in segments:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            if path in self._sealed:
+                self._sealed.remove(path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._sealed.append(self._file.name)
+            self._file = None
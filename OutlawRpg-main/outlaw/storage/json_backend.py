@@ -0,0 +1,103 @@
+# File: OutlawRpg-main/outlaw/storage/json_backend.py
+
+import os
+
+from storage.base import StorageBackend
+from storage.snapshot import assemble, encode_entry, iter_snapshot, read_snapshot, write_payload
+
+
+# Chave reservada no arquivo de jogadores com o seq do journal do snapshot
+JOURNAL_META_KEY = "__journal__"
+
+
+class JsonBackend(StorageBackend):
+    """
+    Backend original: um arquivo por tabela, regravado por inteiro.
+    A gravação é atômica (arquivo temporário + fsync + rename) e mantém
+    `generations` cópias anteriores para recuperação.
+
+    Cada registro é guardado já serializado; prepare_*() só serializa de novo
+    os registros alterados e write_*() apenas junta os pedaços e grava.
+    """
+
+    def __init__(self, player_file: str, clan_file: str, encoding: str = "json", generations: int = 3):
+        self.player_file = player_file
+        self.clan_file = clan_file
+        self.encoding = encoding
+        self.generations = generations
+        self._encoded = {player_file: {}, clan_file: {}}
+        self._journal_seq = 0
+
+    def _load(self, path: str, label: str) -> dict:
+        data = read_snapshot(path, self.generations, label)
+        if data is None:
+            print(f"Arquivo {os.path.basename(path)} não encontrado. Iniciando um novo.")
+            data = {}
+        self._encoded[path] = {
+            key: encode_entry(key, record, self.encoding) for key, record in data.items()
+        }
+        return data
+
+    def _prepare(self, path: str, changed: dict, removed: set) -> list:
+        encoded = self._encoded[path]
+        for key in removed:
+            encoded.pop(key, None)
+        for key, record in changed.items():
+            encoded[key] = encode_entry(key, record, self.encoding)
+        return list(encoded.values())
+
+    def _write(self, path: str, prepared: list):
+        write_payload(path, assemble(prepared, self.encoding), self.generations)
+
+    def load_players(self) -> dict:
+        data = self._load(self.player_file, "player_data.json")
+        meta = data.pop(JOURNAL_META_KEY, None)
+        self._encoded[self.player_file].pop(JOURNAL_META_KEY, None)
+        self._journal_seq = meta.get("seq", 0) if isinstance(meta, dict) else 0
+        return data
+
+    def iter_players(self, progress=None):
+        # O seq do journal fica na primeira entrada dos arquivos gravados por
+        # prepare_players(); em arquivos antigos ele só aparece no fim.
+        self._journal_seq = None
+        encoded = self._encoded[self.player_file] = {}
+        return self._iter_players(encoded, progress)
+
+    def _iter_players(self, encoded: dict, progress):
+        if not os.path.exists(self.player_file):
+            print(f"Arquivo {os.path.basename(self.player_file)} não encontrado. Iniciando um novo.")
+        reuse_raw = self.encoding == "json"
+        for key, record, raw in iter_snapshot(self.player_file, self.generations, "player_data.json", progress):
+            if key == JOURNAL_META_KEY:
+                if self._journal_seq is None:
+                    self._journal_seq = record.get("seq", 0) if isinstance(record, dict) else 0
+                continue
+            if key in encoded:
+                continue  # Repetido ao recorrer a outra leitura (veja iter_snapshot)
+            # No formato indentado, os bytes lidos já são a entrada serializada
+            encoded[key] = raw if reuse_raw and raw is not None else encode_entry(key, record, self.encoding)
+            yield key, record
+        if self._journal_seq is None:
+            self._journal_seq = 0
+
+    def load_clans(self) -> dict:
+        return self._load(self.clan_file, "clans_data.json")
+
+    def load_journal_seq(self) -> int:
+        return self._journal_seq
+
+    def prepare_players(self, changed: dict, removed: set, journal_seq: int = None):
+        prepared = self._prepare(self.player_file, changed, removed)
+        if journal_seq is not None:
+            # Primeiro no arquivo: a leitura incremental conhece o seq antes dos jogadores
+            prepared.insert(0, encode_entry(JOURNAL_META_KEY, {"seq": journal_seq}, self.encoding))
+        return prepared
+
+    def write_players(self, prepared):
+        self._write(self.player_file, prepared)
+
+    def prepare_clans(self, changed: dict, removed: set):
+        return self._prepare(self.clan_file, changed, removed)
+
+    def write_clans(self, prepared):
+        self._write(self.clan_file, prepared)
@@ -0,0 +1,66 @@
+# File: OutlawRpg-main/outlaw/storage/migrate_json_to_sqlite.py
+#
+# Migração única dos arquivos JSON (outlaws_data.json / clans_data.json)
+# para o banco SQLite. Execute a partir da pasta 'outlaw':
+#
+#     python -m storage.migrate_json_to_sqlite [--force]
+#
+# Depois da migração, defina STORAGE_BACKEND = "sqlite" em config.py.
+
+import argparse
+import os
+import sys
+import time
+
+# Permite executar como script a partir de qualquer pasta
+OUTLAW_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if OUTLAW_DIR not in sys.path:
+    sys.path.insert(0, OUTLAW_DIR)
+
+from config import SQLITE_DATABASE_FILE  # noqa: E402
+from storage.json_backend import JsonBackend  # noqa: E402
+from storage.sqlite_backend import SqliteBackend  # noqa: E402
+
+
+def migrate(player_file: str, clan_file: str, database_file: str, force: bool = False) -> bool:
+    """Copia todos os jogadores e clãs dos arquivos JSON para o SQLite."""
+    sqlite_backend = SqliteBackend(database_file)
+    try:
+        if not force and (sqlite_backend.count_players() or sqlite_backend.count_clans()):
+            print(
+                f"O banco {database_file} já contém dados. Use --force para sobrescrever as linhas existentes."
+            )
+            return False
+
+        start = time.perf_counter()
+        json_backend = JsonBackend(player_file, clan_file)
+        players = json_backend.load_players()
+        clans = json_backend.load_clans()
+
+        journal_seq = json_backend.load_journal_seq()
+        sqlite_backend.write_players(sqlite_backend.prepare_players(players, set(), journal_seq))
+        sqlite_backend.write_clans(sqlite_backend.prepare_clans(clans, set()))
+
+        elapsed = time.perf_counter() - start
+        print(
+            f"Migração concluída: {len(players)} jogadores e {len(clans)} clãs "
+            f"gravados em {database_file} ({elapsed:.2f}s)."
+        )
+        return True
+    finally:
+        sqlite_backend.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migra os dados JSON do bot para SQLite.")
+    parser.add_argument("--players", default=os.path.join(OUTLAW_DIR, "outlaws_data.json"))
+    parser.add_argument("--clans", default=os.path.join(OUTLAW_DIR, "clans_data.json"))
+    parser.add_argument("--database", default=os.path.join(OUTLAW_DIR, SQLITE_DATABASE_FILE))
+    parser.add_argument("--force", action="store_true", help="Sobrescreve linhas já existentes.")
+    args = parser.parse_args()
+    ok = migrate(args.players, args.clans, args.database, force=args.force)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
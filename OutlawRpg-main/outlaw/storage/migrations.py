@@ -0,0 +1,57 @@
+# File: OutlawRpg-main/outlaw/storage/migrations.py
+#
+# Migrações versionadas do esquema dos registros. Cada registro guarda a
+# versão do esquema em "schema_version" (ausente = 0) e cada migração é uma
+# função registrada com o número da versão que ela produz:
+#
+#     player_migrations = MigrationRegistry("jogadores")
+#
+#     @player_migrations.register(1)
+#     def _add_record_id(record_id, record):
+#         record.setdefault("id", record_id)
+#
+# migrate() aplica, em ordem, só as migrações mais novas que a versão do
+# registro e grava a versão final nele. Como a versão é persistida junto com o
+# registro, cada migração roda uma única vez por registro. Migrações precisam
+# aceitar registros que já estejam no formato novo (ex: perfis criados pelo
+# código atual sem "schema_version").
+
+SCHEMA_VERSION_KEY = "schema_version"
+
+
+class MigrationRegistry:
+    """Lista ordenada de migrações de um tipo de registro."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self._migrations = []  # (versão, função), em ordem crescente
+
+    @property
+    def latest(self) -> int:
+        """Versão do esquema atual (a da última migração registrada)."""
+        return self._migrations[-1][0] if self._migrations else 0
+
+    def register(self, version: int):
+        """Decorador: registra `func(record_id, record)` como a migração para `version`."""
+        def decorator(func):
+            if version != self.latest + 1:
+                raise ValueError(
+                    f"Migração {func.__name__} de {self.label}: versão {version}, esperada {self.latest + 1}."
+                )
+            self._migrations.append((version, func))
+            return func
+        return decorator
+
+    def is_current(self, record) -> bool:
+        return record.get(SCHEMA_VERSION_KEY, 0) >= self.latest
+
+    def migrate(self, record_id: str, record) -> bool:
+        """Aplica as migrações pendentes ao registro. Retorna True se alguma rodou."""
+        version = record.get(SCHEMA_VERSION_KEY, 0)
+        if version >= self.latest:
+            return False
+        for migration_version, func in self._migrations:
+            if migration_version > version:
+                func(record_id, record)
+        record[SCHEMA_VERSION_KEY] = self.latest
+        return True
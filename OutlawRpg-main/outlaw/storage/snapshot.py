@@ -0,0 +1,318 @@
+# File: OutlawRpg-main/outlaw/storage/snapshot.py
+#
+# Gravação atômica de snapshots: o arquivo é escrito em um temporário,
+# sincronizado com fsync e só então renomeado por cima do original. As
+# versões anteriores ficam guardadas como <arquivo>.1, <arquivo>.2, ...
+#
+# iter_snapshot() lê o snapshot um registro por vez, sem montar o arquivo
+# inteiro em memória: o JSON indentado (formato padrão, um registro por bloco
+# de linhas) é dividido entre as entradas do primeiro nível; outros JSON usam
+# o ijson, se instalado.
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # Dependência opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Dependência opcional
+    msgpack = None
+
+try:
+    import ijson
+except ImportError:  # Dependência opcional
+    ijson = None
+
+
+# Codificações suportadas:
+#   "json"    - JSON indentado (formato original, legível por humanos)
+#   "compact" - JSON sem indentação (usa orjson se estiver instalado)
+#   "msgpack" - binário compacto (requer o pacote msgpack)
+ENCODINGS = ("json", "compact", "msgpack")
+
+
+class SnapshotError(Exception):
+    """Nenhuma geração legível do snapshot pôde ser carregada."""
+
+    pass
+
+
+def encode(data, encoding: str = "json") -> bytes:
+    """Serializa `data` na codificação pedida."""
+    if encoding == "msgpack":
+        if msgpack is None:
+            raise RuntimeError("Codificação 'msgpack' requer o pacote msgpack instalado.")
+        return msgpack.packb(data, use_bin_type=True)
+    if encoding == "compact":
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, indent=4).encode("utf-8")
+
+
+def encode_entry(key, record, encoding: str = "json") -> bytes:
+    """
+    Serializa um único par chave/registro do primeiro nível do snapshot, de
+    forma que assemble() produza exatamente o mesmo resultado que encode()
+    da tabela inteira.
+    """
+    if encoding == "msgpack":
+        return encode(str(key), encoding) + encode(record, encoding)
+    encoded_key = json.dumps(str(key)).encode("utf-8")
+    if encoding == "compact":
+        return encoded_key + b":" + encode(record, encoding)
+    # Registros aninhados em json.dumps(..., indent=4) ficam com 4 espaços a mais
+    body = json.dumps(record, indent=4).replace("\n", "\n    ").encode("utf-8")
+    return b"    " + encoded_key + b": " + body
+
+
+def assemble(entries, encoding: str = "json") -> list:
+    """
+    Monta o snapshot completo a partir das entradas geradas por
+    encode_entry(), sem serializar novamente os registros que não mudaram.
+    Retorna uma lista de pedaços de bytes; concatenados, equivalem a
+    encode() da tabela inteira. Os pedaços são gravados em sequência por
+    write_payload(), evitando copiar o snapshot inteiro mais uma vez.
+    """
+    entries = list(entries)
+    if encoding == "msgpack":
+        if msgpack is None:
+            raise RuntimeError("Codificação 'msgpack' requer o pacote msgpack instalado.")
+        return [msgpack.Packer().pack_map_header(len(entries)), b"".join(entries)]
+    if not entries:
+        return [b"{}"]
+    if encoding == "compact":
+        return [b"{", b",".join(entries), b"}"]
+    return [b"{\n", b",\n".join(entries), b"\n}"]
+
+
+def decode(raw: bytes):
+    """Desserializa um snapshot, detectando JSON ou msgpack pelo conteúdo."""
+    stripped = raw.lstrip()
+    if stripped[:1] in (b"{", b"["):
+        if orjson is not None:
+            return orjson.loads(stripped)
+        return json.loads(stripped.decode("utf-8"))
+    if msgpack is None:
+        raise SnapshotError("Snapshot binário encontrado, mas o pacote msgpack não está instalado.")
+    return msgpack.unpackb(raw, raw=False)
+
+
+def generation_path(path: str, generation: int) -> str:
+    """Caminho da geração `generation` (0 é o próprio arquivo)."""
+    return path if generation == 0 else f"{path}.{generation}"
+
+
+def _fsync_dir(directory: str):
+    """Garante que o rename foi persistido (sem efeito em sistemas sem suporte)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _rotate(path: str, generations: int):
+    """Desloca as gerações antigas e mantém o arquivo atual como <arquivo>.1."""
+    if generations <= 0 or not os.path.exists(path):
+        return
+    for gen in range(generations, 1, -1):
+        older = generation_path(path, gen - 1)
+        if os.path.exists(older):
+            os.replace(older, generation_path(path, gen))
+    first = generation_path(path, 1)
+    if os.path.exists(first):
+        os.remove(first)
+    try:
+        # Hard link: o arquivo principal continua existindo durante toda a troca
+        os.link(path, first)
+    except OSError:
+        with open(path, "rb") as src, open(first, "wb") as dst:
+            dst.write(src.read())
+
+
+def write_snapshot(path: str, data, encoding: str = "json", generations: int = 3) -> int:
+    """
+    Grava `data` em `path` de forma atômica e mantém `generations` cópias
+    anteriores. Retorna o tamanho do snapshot em bytes.
+    """
+    return write_payload(path, encode(data, encoding), generations)
+
+
+def write_payload(path: str, payload, generations: int = 3) -> int:
+    """
+    Grava um snapshot já serializado de forma atômica (veja write_snapshot).
+    `payload` pode ser bytes ou uma lista de pedaços gerada por assemble().
+    """
+    if isinstance(payload, bytes):
+        payload = [payload]
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.writelines(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    _rotate(path, generations)
+    os.replace(tmp_path, path)
+    _fsync_dir(directory)
+    return sum(len(chunk) for chunk in payload)
+
+
+def read_snapshot(path: str, generations: int = 3, label: str = None):
+    """
+    Lê o snapshot mais recente que estiver íntegro, recorrendo às gerações
+    anteriores se o arquivo principal estiver ausente ou corrompido.
+    Retorna None se nenhum arquivo existir. Lança SnapshotError se existirem
+    arquivos mas nenhum puder ser lido, para nunca começar com um banco vazio
+    por cima de dados reais.
+    """
+    label = label or os.path.basename(path)
+    found_any = False
+    for gen in range(0, generations + 1):
+        candidate = generation_path(path, gen)
+        if not os.path.exists(candidate):
+            continue
+        found_any = True
+        try:
+            with open(candidate, "rb") as f:
+                data = decode(f.read())
+        except Exception as e:
+            print(f"Erro ao ler {os.path.basename(candidate)} ({label}): {e}")
+            continue
+        if gen > 0:
+            print(
+                f"AVISO: {label} estava ausente ou corrompido. Restaurado da geração {os.path.basename(candidate)}."
+            )
+        return data
+    if found_any:
+        raise SnapshotError(
+            f"Nenhuma cópia legível de {label} foi encontrada. Corrija os arquivos manualmente antes de iniciar o bot."
+        )
+    return None
+
+
+def _loads(raw: bytes):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+
+
+def _parse_entry(raw: bytes) -> tuple:
+    pair = _loads(b"{" + raw + b"}")
+    if len(pair) != 1:
+        raise SnapshotError("Registro do primeiro nível mal formado.")
+    key, record = next(iter(pair.items()))
+    return key, record, raw
+
+
+def _iter_indented(f, chunk_size: int = 1 << 20):
+    """
+    Entradas do primeiro nível de um JSON gerado com indent=4 (encode() ou
+    assemble() com "json"). Os registros aninhados têm 8 espaços ou mais, então
+    ',\n    "' só aparece entre duas entradas do primeiro nível (strings JSON
+    não contêm quebras de linha). Gera (chave, registro, bytes da entrada), e
+    os bytes são exatamente o que encode_entry() produziria.
+    """
+    first = f.readline()
+    if first.strip() != b"{":
+        raise SnapshotError("Formato indentado esperado.")
+    newline = b"\r\n" if first.endswith(b"\r\n") else b"\n"
+    separator = b"," + newline + b'    "'
+    buffer = b""
+    while True:
+        chunk = f.read(chunk_size)
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(separator, start)
+            if end < 0:
+                break
+            yield _parse_entry(buffer[start:end])
+            start = end + 1 + len(newline)
+        buffer = buffer[start:]
+        if not chunk:
+            break
+    tail = buffer.rstrip()
+    if not tail.endswith(b"}"):
+        raise SnapshotError("Arquivo terminou antes do fim do objeto (truncado).")
+    yield _parse_entry(tail[:-1].rstrip())
+
+
+def _iter_entries(f):
+    """(chave, registro, bytes da entrada ou None) do primeiro nível, no formato que o arquivo tiver."""
+    head = f.read(64)
+    f.seek(0)
+    if head.lstrip()[:1] == b"{":
+        if head.startswith((b'{\n    "', b'{\r\n    "')):
+            return _iter_indented(f)
+        if ijson is not None:
+            return ((key, record, None) for key, record in ijson.kvitems(f, "", use_float=True))
+    return _decoded_entries(f.read())  # msgpack, ou JSON compacto sem o ijson
+
+
+def _decoded_entries(raw: bytes):
+    data = decode(raw)
+    if not isinstance(data, dict):
+        raise SnapshotError("O snapshot não é um objeto.")
+    return ((key, record, None) for key, record in data.items())
+
+
+def iter_snapshot(path: str, generations: int = 3, label: str = None, progress=None):
+    """
+    Versão incremental de read_snapshot(): gera (chave, registro, bytes) do
+    snapshot mais recente que puder ser lido, um registro de cada vez. Os
+    bytes são a entrada como encode_entry(chave, registro, "json") a
+    produziria, ou None se o arquivo não estiver nesse formato. `progress`
+    (opcional) recebe a fração do arquivo já lida.
+
+    Se o arquivo se revelar corrompido depois de alguns registros, a leitura
+    continua pelo arquivo inteiro (decodificado de uma vez) ou pela geração
+    anterior, e chaves já geradas podem aparecer de novo: quem consome deve
+    manter a primeira ocorrência, que é a mais recente. Não gera nada se
+    nenhum arquivo existir e lança SnapshotError se nenhum puder ser lido.
+    """
+    label = label or os.path.basename(path)
+    found_any = False
+    yielded = 0
+    for gen in range(0, generations + 1):
+        candidate = generation_path(path, gen)
+        if not os.path.exists(candidate):
+            continue
+        found_any = True
+        if gen > 0:
+            print(
+                f"AVISO: {label} estava ausente ou corrompido. Restaurando da geração {os.path.basename(candidate)}."
+            )
+        try:
+            with open(candidate, "rb") as f:
+                size = os.fstat(f.fileno()).st_size or 1
+                try:
+                    for count, entry in enumerate(_iter_entries(f), 1):
+                        yield entry
+                        yielded += 1
+                        if progress is not None and count % 1000 == 0:
+                            progress(min(f.tell() / size, 1.0))
+                except Exception as e:
+                    if gen > 0 or not yielded:
+                        raise
+                    # Pode ser só um layout que a leitura por linhas não previu
+                    print(f"AVISO: Leitura incremental de {label} falhou ({e}). Lendo o arquivo inteiro.")
+                    f.seek(0)
+                    yield from _decoded_entries(f.read())
+        except Exception as e:
+            print(f"Erro ao ler {os.path.basename(candidate)} ({label}): {e}")
+            continue
+        if progress is not None:
+            progress(1.0)
+        return
+    if found_any:
+        raise SnapshotError(
+            f"Nenhuma cópia legível de {label} foi encontrada. Corrija os arquivos manualmente antes de iniciar o bot."
+        )
@@ -0,0 +1,210 @@
+# File: OutlawRpg-main/outlaw/storage/sqlite_backend.py
+
+import json
+import sqlite3
+
+from storage.base import StorageBackend
+
+
+# Campos aninhados do jogador guardados em colunas JSON próprias.
+# O restante do registro vai para a coluna `data`.
+PLAYER_JSON_COLUMNS = ("inventory", "relics_inventory", "equipped_items")
+CLAN_JSON_COLUMNS = ("members",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id TEXT PRIMARY KEY,
+    clan_id TEXT,
+    level INTEGER NOT NULL DEFAULT 1,
+    kills INTEGER NOT NULL DEFAULT 0,
+    money INTEGER NOT NULL DEFAULT 0,
+    inventory TEXT,
+    relics_inventory TEXT,
+    equipped_items TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_players_clan_id ON players (clan_id);
+CREATE INDEX IF NOT EXISTS idx_players_level ON players (level);
+CREATE INDEX IF NOT EXISTS idx_players_kills ON players (kills);
+
+CREATE TABLE IF NOT EXISTS clans (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    xp INTEGER NOT NULL DEFAULT 0,
+    members TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+UPSERT_PLAYER = """
+INSERT INTO players (id, clan_id, level, kills, money, inventory, relics_inventory, equipped_items, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    clan_id = excluded.clan_id,
+    level = excluded.level,
+    kills = excluded.kills,
+    money = excluded.money,
+    inventory = excluded.inventory,
+    relics_inventory = excluded.relics_inventory,
+    equipped_items = excluded.equipped_items,
+    data = excluded.data
+"""
+
+UPSERT_CLAN = """
+INSERT INTO clans (id, name, xp, members, data)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    name = excluded.name,
+    xp = excluded.xp,
+    members = excluded.members,
+    data = excluded.data
+"""
+
+
+def _int_or_zero(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _split_record(record: dict, json_columns: tuple) -> tuple:
+    """Separa os campos aninhados (colunas JSON) do resto do registro."""
+    rest = {k: v for k, v in record.items() if k not in json_columns}
+    nested = tuple(
+        json.dumps(record[col]) if col in record else None for col in json_columns
+    )
+    return nested, json.dumps(rest)
+
+
+def _join_record(data: str, nested: tuple, json_columns: tuple) -> dict:
+    """Reconstrói o registro a partir da coluna `data` e das colunas JSON."""
+    record = json.loads(data)
+    for col, raw in zip(json_columns, nested):
+        if raw is not None:
+            record[col] = json.loads(raw)
+    return record
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Backend SQLite em modo WAL. Cada flush faz upsert apenas das linhas
+    modificadas, então o custo de gravação cresce com o que mudou, não com o
+    total de jogadores.
+    """
+
+    def __init__(self, database_file: str):
+        self.database_file = database_file
+        self.conn = sqlite3.connect(database_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    # --- Leitura ---
+
+    def load_players(self) -> dict:
+        rows = self.conn.execute(
+            "SELECT id, inventory, relics_inventory, equipped_items, data FROM players"
+        )
+        return {
+            row[0]: _join_record(row[4], row[1:4], PLAYER_JSON_COLUMNS) for row in rows
+        }
+
+    def iter_players(self, progress=None):
+        return self._iter_players(self.count_players(), progress)
+
+    def _iter_players(self, total: int, progress):
+        # Conexão própria: a leitura roda em outra thread enquanto self.conn
+        # continua atendendo load_player() e as gravações
+        conn = sqlite3.connect(self.database_file, check_same_thread=False)
+        try:
+            rows = conn.execute(
+                "SELECT id, inventory, relics_inventory, equipped_items, data FROM players"
+            )
+            for count, row in enumerate(rows, 1):
+                yield row[0], _join_record(row[4], row[1:4], PLAYER_JSON_COLUMNS)
+                if progress is not None and count % 1000 == 0:
+                    progress(min(count / total, 1.0))
+        finally:
+            conn.close()
+        if progress is not None:
+            progress(1.0)
+
+    def load_player(self, user_id: str):
+        row = self.conn.execute(
+            "SELECT inventory, relics_inventory, equipped_items, data FROM players WHERE id = ?", (user_id,)
+        ).fetchone()
+        return _join_record(row[3], row[0:3], PLAYER_JSON_COLUMNS) if row else None
+
+    def load_clans(self) -> dict:
+        rows = self.conn.execute("SELECT id, members, data FROM clans")
+        return {row[0]: _join_record(row[2], row[1:2], CLAN_JSON_COLUMNS) for row in rows}
+
+    def load_journal_seq(self) -> int:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'journal_seq'").fetchone()
+        return int(row[0]) if row else 0
+
+    def count_players(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+    def count_clans(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM clans").fetchone()[0]
+
+    # --- Escrita ---
+
+    def _player_row(self, user_id: str, record: dict) -> tuple:
+        nested, data = _split_record(record, PLAYER_JSON_COLUMNS)
+        return (
+            user_id,
+            record.get("clan_id"),
+            _int_or_zero(record.get("level", 1)),
+            _int_or_zero(record.get("kills")),
+            _int_or_zero(record.get("money")),
+            *nested,
+            data,
+        )
+
+    def _clan_row(self, clan_id: str, record: dict) -> tuple:
+        nested, data = _split_record(record, CLAN_JSON_COLUMNS)
+        return (clan_id, record.get("name"), _int_or_zero(record.get("xp")), *nested, data)
+
+    def prepare_players(self, changed: dict, removed: set, journal_seq: int = None):
+        rows = [self._player_row(uid, rec) for uid, rec in changed.items()]
+        return rows, list(removed), journal_seq
+
+    def write_players(self, prepared):
+        rows, removed, journal_seq = prepared
+        with self.conn:
+            self.conn.executemany(UPSERT_PLAYER, rows)
+            if removed:
+                self.conn.executemany(
+                    "DELETE FROM players WHERE id = ?", ((uid,) for uid in removed)
+                )
+            if journal_seq is not None:
+                self.conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('journal_seq', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (str(journal_seq),),
+                )
+
+    def prepare_clans(self, changed: dict, removed: set):
+        rows = [self._clan_row(cid, rec) for cid, rec in changed.items()]
+        return rows, list(removed)
+
+    def write_clans(self, prepared):
+        rows, removed = prepared
+        with self.conn:
+            self.conn.executemany(UPSERT_CLAN, rows)
+            if removed:
+                self.conn.executemany(
+                    "DELETE FROM clans WHERE id = ?", ((cid,) for cid in removed)
+                )
+
+    def close(self):
+        self.conn.close()
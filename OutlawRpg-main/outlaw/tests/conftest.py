@@ -0,0 +1,47 @@
+# File: OutlawRpg-main/outlaw/tests/conftest.py
+#
+# Testes do bot (pytest). Rode a partir da pasta outlaw:
+#
+#     python -m pytest -q tests
+#
+# Testes ficam aqui; benchmarks ficam em bench/ (python -m bench.<nome>). Os
+# módulos do jogo não carregam código de teste nem de benchmark.
+
+import os
+import sys
+
+import pytest
+
+OUTLAW_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if OUTLAW_DIR not in sys.path:
+    sys.path.insert(0, OUTLAW_DIR)
+
+
+@pytest.fixture
+def memory_store(monkeypatch):
+    """
+    data_manager só em memória: nada é lido nem gravado em disco (sem
+    journal), os bancos começam vazios e os locks são novos. Devolve o
+    módulo.
+    """
+    import data_manager as dm
+
+    monkeypatch.setattr(dm, "_journal", None)
+    monkeypatch.setattr(dm, "_players_loaded", True)
+    monkeypatch.setattr(dm, "_clans_loaded", True)
+    # Locks novos: um asyncio.Lock fica preso ao event loop em que foi disputado
+    monkeypatch.setattr(dm, "_player_locks", {})
+    monkeypatch.setattr(dm, "_clan_locks", {})
+    players = dict(dm.player_database)
+    clans = dict(dm.clan_database)
+    dm.player_database.clear()
+    dm.clan_database.clear()
+    yield dm
+    dm.player_database.clear()
+    dm.player_database.update(players)
+    dm.clan_database.clear()
+    dm.clan_database.update(clans)
+    dm._dirty_players.clear()
+    dm._dirty_clans.clear()
+    dm._rebuild_player_indexes()
+    dm._rebuild_clan_indexes()
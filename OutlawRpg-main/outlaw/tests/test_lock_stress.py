@@ -0,0 +1,180 @@
+# File: OutlawRpg-main/outlaw/tests/test_lock_stress.py
+#
+# Teste de estresse dos locks do data_manager (player_lock, acquire_locks).
+# Dispara milhares de operações simuladas ao mesmo tempo, no formato dos
+# fluxos reais (ler, esperar a API do Discord, gravar):
+#
+#   /bau    player_lock; lê chaves e dinheiro, await, consome uma chave e credita o baú
+#   /cacar  player_lock; lê o dinheiro, await, credita a recompensa e a contribuição do clã
+#   clã     acquire_locks(membros, clã); await, divide a tesouraria entre os membros
+#
+# e confere no fim, contra um registro do que cada operação fez: nenhuma
+# atualização perdida (dinheiro e chaves batem), nenhuma chave abaixo de zero e
+# a tesouraria dos clãs conservada. Tudo em memória, sem gravar nada.
+
+import asyncio
+import contextlib
+import random
+from collections import Counter
+
+import pytest
+
+
+INITIAL_KEYS = 10
+INITIAL_MONEY = 1000
+CHEST_MONEY = 7
+HUNT_MONEY = 11
+CLAN_CONTRIBUTION = 3
+DEADLOCK_TIMEOUT_SECONDS = 30
+
+
+class StressRun:
+    """Carga simulada sobre o data_manager e o registro esperado de cada operação."""
+
+    def __init__(self, dm, rng: random.Random, use_locks: bool = True):
+        self.dm = dm
+        self.rng = rng
+        self.use_locks = use_locks
+        self.credits = Counter()  # Jogador -> dinheiro creditado pelas operações
+        self.keys_used = Counter()  # Jogador -> chaves consumidas
+        self.contributed = Counter()  # Clã -> contribuições recebidas
+        self.distributed = Counter()  # Clã -> dinheiro repassado aos membros
+
+    def player_lock(self, user_id):
+        return self.dm.player_lock(user_id) if self.use_locks else contextlib.nullcontext()
+
+    def acquire_locks(self, player_ids, clan_ids):
+        return self.dm.acquire_locks(player_ids, clan_ids) if self.use_locks else contextlib.AsyncExitStack()
+
+    async def _api_call(self):
+        """Um await do Discord (defer, followup, edit) entre a leitura e a gravação."""
+        await asyncio.sleep(self.rng.random() * 0.002)
+
+    async def open_chest(self, user_id: str):
+        async with self.player_lock(user_id):
+            await self._api_call()  # defer()
+            player = self.dm.get_player_data(user_id)
+            keys, money = player["relic_keys"], player["money"]
+            await self._api_call()
+            if keys <= 0:
+                return
+            self.dm.mutate_player(user_id, "relic_keys", "set", keys - 1)
+            self.dm.mutate_player(user_id, "money", "set", money + CHEST_MONEY)
+            self.keys_used[user_id] += 1
+            self.credits[user_id] += CHEST_MONEY
+
+    async def hunt(self, user_id: str):
+        async with self.player_lock(user_id):
+            player = self.dm.get_player_data(user_id)
+            money = player["money"]
+            await self._api_call()  # Relatório do combate
+            self.dm.mutate_player(user_id, "money", "set", money + HUNT_MONEY)
+            self.credits[user_id] += HUNT_MONEY
+            # Contribuição para o clã: leitura e gravação sem await no meio, como no combate
+            clan_id = player.get("clan_id")
+            clan = self.dm.get_clan_data(clan_id) if clan_id else None
+            if clan:
+                clan["money"] = clan.get("money", 0) + CLAN_CONTRIBUTION
+                self.dm.save_clan_data(clan_id)
+                self.contributed[clan_id] += CLAN_CONTRIBUTION
+
+    async def distribute(self, clan_id: str):
+        clan = self.dm.get_clan_data(clan_id)
+        members = list(clan.get("members", []))
+        async with self.acquire_locks(members, [clan_id]):
+            await self._api_call()  # followup.send("Processando distribuição...")
+            clan_money = clan.get("money", 0)
+            if clan_money <= 0 or not members:
+                return
+            # Saldo lido antes do await: sem os locks, um /cacar no meio se perde
+            balances = {member_id: self.dm.get_player_data(member_id)["money"] for member_id in members}
+            await self._api_call()
+            share, remainder = divmod(clan_money, len(members))
+            for member_id in members:
+                amount = share + (1 if remainder > 0 else 0)
+                remainder -= 1
+                self.dm.mutate_player(member_id, "money", "set", balances[member_id] + amount)
+                self.credits[member_id] += amount
+            clan["money"] = 0
+            self.dm.save_clan_data(clan_id)
+            self.distributed[clan_id] += clan_money
+
+    def check(self, player_ids, clan_ids) -> list:
+        """Problemas encontrados (lista vazia = nenhuma atualização perdida)."""
+        problems = []
+        for user_id in player_ids:
+            player = self.dm.player_database[user_id]
+            expected_money = INITIAL_MONEY + self.credits[user_id]
+            if player["money"] != expected_money:
+                problems.append(f"Jogador {user_id}: dinheiro {player['money']}, esperado {expected_money}.")
+            expected_keys = INITIAL_KEYS - self.keys_used[user_id]
+            if player["relic_keys"] != expected_keys or player["relic_keys"] < 0:
+                problems.append(f"Jogador {user_id}: {player['relic_keys']} chaves, esperado {expected_keys}.")
+        for clan_id in clan_ids:
+            clan = self.dm.clan_database[clan_id]
+            expected = self.contributed[clan_id] - self.distributed[clan_id]
+            if clan["money"] != expected:
+                problems.append(f"Clã {clan_id}: tesouraria {clan['money']}, esperado {expected}.")
+        return problems
+
+
+def _populate(dm, players: int, clans: int):
+    from models import Clan, Player
+
+    player_ids = [str(10**17 + i) for i in range(players)]
+    clan_ids = [f"cla_{i}" for i in range(clans)]
+    for index, user_id in enumerate(player_ids):
+        player = Player.new(user_id, 0)
+        player.update({"money": INITIAL_MONEY, "relic_keys": INITIAL_KEYS})
+        if clan_ids and index % 4:  # Um quarto dos jogadores fica sem clã
+            player["clan_id"] = clan_ids[index % len(clan_ids)]
+        dm.player_database[user_id] = player
+    for clan_id in clan_ids:
+        members = [user_id for user_id in player_ids if dm.player_database[user_id].get("clan_id") == clan_id]
+        dm.clan_database[clan_id] = Clan(id=clan_id, name=clan_id, leader=members[0] if members else None,
+                                         members=members, xp=0, money=0)
+    return player_ids, clan_ids
+
+
+def _stress(dm, ops: int, players: int, clans: int, seed: int, use_locks: bool = True) -> list:
+    """Dispara `ops` operações ao mesmo tempo e retorna os problemas encontrados."""
+    rng = random.Random(seed)
+    player_ids, clan_ids = _populate(dm, players, clans)
+    run = StressRun(dm, rng, use_locks=use_locks)
+    operations = []
+    for _ in range(ops):
+        kind = rng.random()
+        if kind < 0.45:
+            operations.append(run.open_chest(rng.choice(player_ids)))
+        elif kind < 0.9 or not clan_ids:
+            operations.append(run.hunt(rng.choice(player_ids)))
+        else:
+            operations.append(run.distribute(rng.choice(clan_ids)))
+
+    async def fire():
+        await asyncio.wait_for(asyncio.gather(*operations), DEADLOCK_TIMEOUT_SECONDS)
+
+    try:
+        asyncio.run(fire())
+    except asyncio.TimeoutError:
+        pytest.fail(f"Deadlock: as {ops} operações não terminaram em {DEADLOCK_TIMEOUT_SECONDS}s.")
+    assert sum(run.keys_used.values()) > 0 and sum(run.distributed.values()) > 0  # A carga exercitou tudo
+    return run.check(player_ids, clan_ids)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_locks_prevent_lost_updates(memory_store, seed):
+    problems = _stress(memory_store, ops=6000, players=200, clans=20, seed=seed)
+    assert problems == []
+
+
+def test_contended_players_do_not_deadlock(memory_store):
+    # Poucos jogadores e clãs: quase toda operação disputa os mesmos locks
+    problems = _stress(memory_store, ops=3000, players=8, clans=2, seed=4)
+    assert problems == []
+
+
+def test_detects_lost_updates_without_locks(memory_store):
+    # A mesma carga sem os locks precisa falhar, senão o teste não detecta a corrida
+    problems = _stress(memory_store, ops=6000, players=200, clans=20, seed=1, use_locks=False)
+    assert problems
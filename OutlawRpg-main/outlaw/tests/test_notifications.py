@@ -0,0 +1,90 @@
+# File: OutlawRpg-main/outlaw/tests/test_notifications.py
+#
+# Desligamento da fila de DMs (notifications.py): drain() entrega o que está
+# na fila dentro do prazo e stop() conta e loga os avisos descartados. O bot
+# é um objeto mínimo com get_user e usuários que só guardam as mensagens.
+
+import asyncio
+
+from notifications import NotificationQueue
+
+
+class FakeUser:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.messages = []
+
+    async def send(self, message: str):
+        await asyncio.sleep(self.delay)
+        self.messages.append(message)
+
+
+class FakeBot:
+    def __init__(self, users: dict, ready: bool = True):
+        self.users = users
+        self._ready = asyncio.Event()
+        if ready:
+            self._ready.set()
+
+    async def wait_until_ready(self):
+        await self._ready.wait()
+
+    def get_user(self, user_id: int):
+        return self.users.get(user_id)
+
+
+def _queue(bot) -> NotificationQueue:
+    return NotificationQueue(bot, workers=2, rate_per_second=1000, user_interval=0, closed_retry=60)
+
+
+def test_drain_delivers_queued_notifications(capsys):
+    users = {user_id: FakeUser() for user_id in range(1, 21)}
+
+    async def run():
+        queue = _queue(FakeBot(users))
+        queue.start()
+        for user_id in users:
+            queue.notify(user_id, "Sua bênção expirou.")
+            queue.notify(user_id, "Nova chave disponível.")
+        drained = await queue.drain(5)
+        return drained, queue.stop()
+
+    drained, dropped = asyncio.run(run())
+    assert drained and dropped == 0
+    assert all(user.messages == ["Sua bênção expirou.\nNova chave disponível."] for user in users.values())
+    assert "descartados" not in capsys.readouterr().out
+
+
+def test_stop_logs_notifications_left_after_timeout(capsys):
+    users = {1: FakeUser(), 2: FakeUser()}
+
+    async def run():
+        queue = _queue(FakeBot(users, ready=False))  # Workers presos esperando o gateway
+        queue.start()
+        queue.notify(1, "a")
+        queue.notify(1, "b")
+        queue.notify(2, "c")
+        drained = await queue.drain(0.3)
+        return drained, queue.stop(), queue.metrics()
+
+    drained, dropped, metrics = asyncio.run(run())
+    assert not drained and dropped == 3
+    assert metrics["queued_users"] == 0
+    assert "3 avisos para 2 usuário(s) descartados" in capsys.readouterr().out
+
+
+def test_stop_counts_notifications_being_sent(capsys):
+    users = {1: FakeUser(delay=10)}  # Envio que não termina dentro do prazo
+
+    async def run():
+        queue = _queue(FakeBot(users))
+        queue.start()
+        queue.notify(1, "a")
+        queue.notify(1, "b")
+        drained = await queue.drain(0.3)
+        return drained, queue.stop()
+
+    drained, dropped = asyncio.run(run())
+    assert not drained and dropped == 2
+    assert users[1].messages == []
+    assert "2 avisos para 1 usuário(s) descartados" in capsys.readouterr().out
@@ -0,0 +1,123 @@
+# File: OutlawRpg-main/outlaw/tests/test_relic_mechanics.py
+#
+# Sorteio de relíquias: frequências do sorteador alias conferidas pelo teste
+# qui-quadrado e pesos de evento (relic_weights), com overrides pelo ID do
+# catálogo e rejeição de chaves ambíguas.
+
+import math
+import random
+from decimal import Decimal
+
+import pytest
+
+from game_logic.relic_catalog import relic_catalog
+from game_logic.relic_mechanics import build_relic_sampler, relic_sampler, relic_weights
+
+DUPLICATE_NAME = "Orbe do Caos Abissal"  # Existe em dois tiers
+DRAWS = 300_000
+MIN_P_VALUE = 0.001
+
+
+def chi_square(observed: list, probabilities: list) -> dict:
+    """
+    Compara as contagens observadas com as probabilidades esperadas pelo
+    teste qui-quadrado. Itens com menos de 5 ocorrências esperadas são
+    agrupados. Retorna a estatística, os graus de liberdade e o p-valor
+    (aproximação de Wilson-Hilferty).
+    """
+    draws = sum(observed)
+    bins = []  # (observado, esperado)
+    pooled_observed = pooled_expected = 0
+    for count, probability in zip(observed, probabilities):
+        expected = draws * probability
+        if expected >= 5:
+            bins.append((count, expected))
+        else:
+            pooled_observed += count
+            pooled_expected += expected
+    if pooled_expected > 0:
+        bins.append((pooled_observed, pooled_expected))
+
+    statistic = sum((count - expected) ** 2 / expected for count, expected in bins)
+    dof = max(1, len(bins) - 1)
+    # Qui-quadrado -> normal padrão (Wilson-Hilferty)
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    p_value = 0.5 * math.erfc(z / math.sqrt(2))
+    return {"statistic": statistic, "dof": dof, "p_value": p_value}
+
+
+def _observed(sampler, draws: int, seed: int) -> list:
+    rng = random.Random(seed)
+    observed = [0] * len(sampler)
+    for _ in range(draws):
+        observed[sampler.draw_index(rng)] += 1
+    return observed
+
+
+def _catalog_probabilities() -> list:
+    return [relic_sampler.probability(i) for i in range(len(relic_sampler))]
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_draw_frequencies_match_chances(seed):
+    result = chi_square(_observed(relic_sampler, DRAWS, seed), _catalog_probabilities())
+    assert result["p_value"] >= MIN_P_VALUE, result
+
+
+def test_chi_square_detects_wrong_frequencies():
+    # Sorteando com a tier Comum dobrada, as frequências precisam divergir das chances do catálogo
+    skewed = build_relic_sampler(tier_multipliers={"Comum": 2})
+    result = chi_square(_observed(skewed, DRAWS, 1), _catalog_probabilities())
+    assert result["p_value"] < MIN_P_VALUE, result
+
+
+def _index(relic_id: str) -> int:
+    return relic_catalog.get(relic_id)["index"]
+
+
+def test_duplicate_name_is_in_catalog():
+    assert len([r for r in relic_catalog.relics if r["nome"] == DUPLICATE_NAME]) == 2
+
+
+def test_override_by_id_changes_only_that_relic():
+    relics = relic_catalog.relics
+    base = relic_weights(relics)
+    weights = relic_weights(relics, overrides={"orbe_do_caos_abissal_epica": 0.5})
+    changed = [i for i, (a, b) in enumerate(zip(base, weights)) if a != b]
+    assert changed == [_index("orbe_do_caos_abissal_epica")]
+    assert weights[_index("orbe_do_caos_abissal_epica")] == Decimal("0.5")
+    assert weights[_index("orbe_do_caos_abissal_incomum")] == base[_index("orbe_do_caos_abissal_incomum")]
+
+
+def test_override_by_unique_name_is_accepted():
+    relic = next(r for r in relic_catalog.relics if r["nome"] != DUPLICATE_NAME)
+    weights = relic_weights(relic_catalog.relics, overrides={relic["nome"]: 3})
+    assert weights[relic["index"]] == Decimal("3")
+
+
+def test_ambiguous_name_is_rejected():
+    with pytest.raises(ValueError, match="ambíguo"):
+        relic_weights(relic_catalog.relics, overrides={DUPLICATE_NAME: 0})
+    with pytest.raises(ValueError, match="ambíguo"):
+        build_relic_sampler(overrides={DUPLICATE_NAME: 0})
+
+
+def test_unknown_and_repeated_keys_are_rejected():
+    with pytest.raises(ValueError, match="não está na lista"):
+        relic_weights(relic_catalog.relics, overrides={"reliquia_inexistente": 1})
+    relic = next(r for r in relic_catalog.relics if r["nome"] != DUPLICATE_NAME)
+    with pytest.raises(ValueError, match="repetido"):
+        relic_weights(relic_catalog.relics, overrides={relic["id"]: 1, relic["nome"]: 2})
+
+
+def test_tier_multiplier_still_applies_without_override():
+    relics = relic_catalog.relics
+    base = relic_weights(relics)
+    weights = relic_weights(relics, tier_multipliers={"Épica": 2}, overrides={"orbe_do_caos_abissal_epica": 1})
+    for relic in relics:
+        if relic["id"] == "orbe_do_caos_abissal_epica":
+            assert weights[relic["index"]] == Decimal("1")
+        elif relic["tier"] == "Épica":
+            assert weights[relic["index"]] == base[relic["index"]] * 2
+        else:
+            assert weights[relic["index"]] == base[relic["index"]]
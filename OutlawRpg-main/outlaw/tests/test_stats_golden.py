@@ -0,0 +1,267 @@
+# File: OutlawRpg-main/outlaw/tests/test_stats_golden.py
+#
+# Teste de referência dos atributos efetivos. Guarda uma cópia congelada do
+# cálculo antigo (a cadeia de ifs de utils._compute_effective_stats e o
+# get_player_effective_xp_gain de antes das tabelas de stat_modifiers) e
+# compara com o cálculo atual em todas as 408.576 combinações de classe (as 7
+# e uma inexistente) × estilo de poder (os 5 com bônus, "Aura" e nenhum) ×
+# Habilidade Inata × itens equipados (nenhum, cada um, cada par ordenado e um
+# ID desconhecido junto com um item não equipável) × Coração do Universo ×
+# transformação (nenhuma ou qualquer uma, inclusive de outra classe) ×
+# bênçãos, com atributos sorteados. Os resultados têm que ser idênticos,
+# inclusive no tipo (int/float) e no arredondamento.
+#
+# As funções reference_* não devem ser alteradas: se uma mudança de regra de
+# jogo for intencional, ela entra também aqui, no mesmo commit.
+
+import itertools
+import math
+import random
+
+import pytest
+
+from config import CLASS_TRANSFORMATIONS, ITEMS_DATA
+from game_logic.stat_modifiers import compute_effective_stats
+from utils import get_player_effective_xp_gain
+
+
+CLASSES = ("Lutador", "Espadachim", "Atirador", "Curandeiro", "Vampiro", "Domador", "Corpo Seco", "Classe Inexistente")
+POWER_STYLES = ("Força", "Agilidade", "Inteligência", "Constituição", "Destreza", "Aura", None)
+UNKNOWN_ITEM_ID = "item_inexistente"
+BASE_XP_GAINS = (1, 37, 1000)
+EXPECTED_COMBINATIONS = 408_576
+
+
+def reference_effective_stats(player_data: dict) -> dict:
+    """Cópia congelada do cálculo antigo dos atributos efetivos."""
+    effective_hp = player_data["max_hp"]
+    effective_attack = player_data["attack"]
+    effective_special_attack = player_data["special_attack"]
+    xp_multiplier = 1.0
+    money_multiplier = 1.0
+    healing_multiplier = 1.0
+    cooldown_reduction_percent = 0.0
+    evasion_chance_bonus = 0.0
+
+    # Bônus de atributos
+    if player_data["class"] == "Lutador":
+        effective_hp += player_data["strength"] * 1.5
+        effective_attack += player_data["strength"] * 0.8
+    elif player_data["class"] == "Espadachim":
+        effective_attack += player_data["agility"] * 1.2
+        effective_hp += player_data["agility"] * 0.5
+    elif player_data["class"] == "Atirador":
+        effective_special_attack += player_data["intelligence"] * 1.5
+        effective_attack += player_data["intelligence"] * 0.5
+    elif player_data["class"] == "Curandeiro":
+        healing_multiplier += player_data["intelligence"] * 0.02
+        effective_hp += player_data["constitution"] * 1.0
+    elif player_data["class"] == "Vampiro":
+        effective_attack += player_data["strength"] * 0.7
+        effective_special_attack += player_data["intelligence"] * 1.0
+        healing_multiplier += player_data["dexterity"] * 0.015  # Roubo de vida
+    elif player_data["class"] == "Domador":
+        effective_attack += player_data["strength"] * 0.6
+        effective_hp += player_data["constitution"] * 0.7
+        xp_multiplier += player_data["dexterity"] * 0.005  # Bônus de XP de caça
+    elif player_data["class"] == "Corpo Seco":
+        effective_hp += player_data["constitution"] * 1.8
+        effective_attack += player_data["strength"] * 0.5
+
+    # Bônus do item "Habilidade Inata (Passiva)" (bônus de estilo)
+    if "habilidade_inata" in player_data.get("inventory", {}):
+        if player_data.get("power_style") == "Força":
+            effective_attack *= 1.05
+            effective_hp *= 1.02
+        elif player_data.get("power_style") == "Agilidade":
+            effective_attack *= 1.03
+            evasion_chance_bonus += 0.03
+        elif player_data.get("power_style") == "Inteligência":
+            effective_special_attack *= 1.07
+            cooldown_reduction_percent += 0.03
+        elif player_data.get("power_style") == "Constituição":
+            effective_hp *= 1.07
+        elif player_data.get("power_style") == "Destreza":
+            xp_multiplier += 0.05
+            money_multiplier += 0.05
+
+    # Bônus de itens equipados
+    for item_id in player_data.get("equipped_items", {}).values():
+        item_info = ITEMS_DATA.get(item_id)
+        if item_info and item_info.get("type") == "equipable":
+            if item_info.get("class_restriction") and item_info["class_restriction"] != player_data["class"]:
+                continue  # Pular item se houver restrição de classe e não corresponder
+
+            if "attack_bonus_percent" in item_info:
+                effective_attack *= (1 + item_info["attack_bonus_percent"])
+            if "hp_bonus_flat" in item_info:
+                effective_hp += item_info["hp_bonus_flat"]
+            if "special_attack_bonus_percent" in item_info:
+                effective_special_attack *= (1 + item_info["special_attack_bonus_percent"])
+            if "cooldown_reduction_percent" in item_info:
+                cooldown_reduction_percent += item_info["cooldown_reduction_percent"]
+            if "effect_multiplier" in item_info and item_info.get("description") == "Aumenta a eficácia de todas as suas curas em 20%.":
+                healing_multiplier *= item_info["effect_multiplier"]
+            if "hp_penalty_percent" in item_info:
+                effective_hp *= (1 - item_info["hp_penalty_percent"])
+
+    # Efeito do Coração do Universo
+    if "coracao_do_universo" in player_data.get("inventory", {}):
+        item_info = ITEMS_DATA.get("coracao_do_universo")
+        if item_info:
+            effective_attack *= (1 + item_info.get("attack_multiplier", 0) / 100)
+            effective_hp *= (1 + item_info.get("max_hp_multiplier", 0) / 100)
+            xp_multiplier += item_info.get("xp_multiplier_passive", 0)
+            money_multiplier += item_info.get("money_multiplier_passive", 0)
+            cooldown_reduction_percent += item_info.get("cooldown_reduction_percent", 0)
+
+    # Bônus de Transformações/Bênçãos ativas
+    if player_data.get("current_transformation"):
+        transform_name = player_data["current_transformation"]
+        player_class = player_data["class"]
+        if player_class in CLASS_TRANSFORMATIONS and transform_name in CLASS_TRANSFORMATIONS[player_class]:
+            transform_info = CLASS_TRANSFORMATIONS[player_class][transform_name]
+            effective_attack *= transform_info.get("attack_multiplier", 1.0)
+            effective_special_attack *= transform_info.get("special_attack_multiplier", 1.0)
+            effective_hp *= transform_info.get("hp_multiplier", 1.0)
+            healing_multiplier *= transform_info.get("healing_multiplier", 1.0)
+            cooldown_reduction_percent += transform_info.get("cooldown_reduction_percent", 0.0)
+            evasion_chance_bonus += transform_info.get("evasion_chance_bonus", 0.0)
+
+    # Aplicar bênçãos que afetam atributos diretamente
+    for item_id, item_info in ITEMS_DATA.items():
+        if item_info.get("type") == "blessing_unlock" and player_data.get(f"{item_id}_active"):
+            if "attack_multiplier" in item_info:
+                effective_attack *= item_info["attack_multiplier"]
+            if "special_attack_multiplier" in item_info:
+                effective_special_attack *= item_info["special_attack_multiplier"]
+            if "max_hp_multiplier" in item_info:
+                effective_hp *= item_info["max_hp_multiplier"]
+            if "cooldown_reduction_percent" in item_info:
+                cooldown_reduction_percent += item_info["cooldown_reduction_percent"]
+            if "evasion_chance" in item_info:
+                evasion_chance_bonus += item_info["evasion_chance"]
+
+    # Garantir que HP não seja negativo
+    effective_hp = max(1, math.floor(effective_hp))
+    effective_attack = max(1, math.floor(effective_attack))
+    effective_special_attack = max(1, math.floor(effective_special_attack))
+
+    return {
+        "hp": effective_hp,
+        "attack": effective_attack,
+        "special_attack": effective_special_attack,
+        "xp_multiplier": xp_multiplier,
+        "money_multiplier": money_multiplier,
+        "healing_multiplier": healing_multiplier,
+        "cooldown_reduction_percent": min(0.95, cooldown_reduction_percent),  # Limitar redução de cooldown
+        "evasion_chance": min(0.75, evasion_chance_bonus),  # Limitar chance de esquiva
+    }
+
+
+def reference_xp_gain(player_data: dict, base_xp_gain: int) -> int:
+    """Cópia congelada do cálculo antigo do ganho de XP efetivo."""
+    effective_xp_gain = base_xp_gain
+    player_stats = reference_effective_stats(player_data)  # Para pegar o xp_multiplier
+
+    effective_xp_gain = math.floor(effective_xp_gain * player_stats["xp_multiplier"])
+
+    # Adicionalmente, se o jogador tiver a Habilidade Inata e o estilo de poder for "Destreza"
+    if "habilidade_inata" in player_data.get("inventory", {}) and player_data.get("power_style") == "Destreza":
+        item_info = ITEMS_DATA.get("habilidade_inata", {})
+        effective_xp_gain = math.floor(effective_xp_gain * (1 + item_info.get("xp_multiplier_passive", 0)))
+
+    # Se o jogador tiver o Coração do Universo
+    if "coracao_do_universo" in player_data.get("inventory", {}):
+        item_info = ITEMS_DATA.get("coracao_do_universo", {})
+        effective_xp_gain = math.floor(effective_xp_gain * (1 + item_info.get("xp_multiplier_passive", 0)))
+
+    return max(1, effective_xp_gain)  # Garantir que o ganho mínimo de XP seja 1
+
+
+def _equipment_sets() -> list:
+    """
+    Itens equipados: nenhum, cada equipável, cada par ordenado e um ID
+    desconhecido junto com um item que não é equipável (os dois são ignorados).
+    """
+    equipables = [item_id for item_id, info in ITEMS_DATA.items() if info.get("type") == "equipable"]
+    not_equipable = next(item_id for item_id, info in ITEMS_DATA.items() if info.get("type") != "equipable")
+    sets = [{}]
+    sets += [{"slot": item_id} for item_id in equipables]
+    sets += [{"slot_a": first, "slot_b": second} for first, second in itertools.permutations(equipables, 2)]
+    sets.append({"slot_a": UNKNOWN_ITEM_ID, "slot_b": not_equipable})
+    return sets
+
+
+def _blessing_sets() -> list:
+    """Bênçãos ativas: todos os subconjuntos."""
+    blessings = [item_id for item_id, info in ITEMS_DATA.items() if info.get("type") == "blessing_unlock"]
+    return [
+        tuple(item_id for item_id, active in zip(blessings, flags) if active)
+        for flags in itertools.product((False, True), repeat=len(blessings))
+    ]
+
+
+# Nenhuma transformação ou qualquer uma (as de outra classe devem ser ignoradas)
+TRANSFORMATIONS = [None] + [name for transforms in CLASS_TRANSFORMATIONS.values() for name in transforms]
+
+
+def combinations(player_class: str, rng: random.Random):
+    """Gera os registros de jogador de uma classe, com atributos sorteados."""
+    for style, innate, equipped, heart, transformation, blessings in itertools.product(
+        POWER_STYLES, (False, True), _equipment_sets(), (False, True), TRANSFORMATIONS, _blessing_sets()
+    ):
+        inventory = {}
+        if innate:
+            inventory["habilidade_inata"] = 1
+        if heart:
+            inventory["coracao_do_universo"] = 1
+        player_data = {
+            "class": player_class,
+            "power_style": style,
+            "max_hp": rng.randint(1, 2000),
+            "attack": rng.randint(1, 500),
+            "special_attack": rng.randint(1, 800),
+            "strength": rng.randint(0, 300),
+            "agility": rng.randint(0, 300),
+            "intelligence": rng.randint(0, 300),
+            "constitution": rng.randint(0, 300),
+            "dexterity": rng.randint(0, 300),
+            "inventory": inventory,
+            "equipped_items": dict(equipped),
+            "current_transformation": transformation,
+        }
+        for item_id in blessings:
+            player_data[f"{item_id}_active"] = True
+        yield player_data
+
+
+def _same(expected, actual) -> bool:
+    """Igualdade exata, inclusive no tipo de cada valor."""
+    if isinstance(expected, dict):
+        return expected.keys() == actual.keys() and all(_same(expected[key], actual[key]) for key in expected)
+    return type(expected) is type(actual) and expected == actual
+
+
+def test_combination_count():
+    per_class = len(POWER_STYLES) * 2 * len(_equipment_sets()) * 2 * len(TRANSFORMATIONS) * len(_blessing_sets())
+    assert per_class * len(CLASSES) == EXPECTED_COMBINATIONS
+
+
+@pytest.mark.parametrize("player_class", CLASSES)
+def test_matches_frozen_reference(player_class):
+    rng = random.Random(f"stats-golden-{player_class}")
+    mismatches = []
+    for player_data in combinations(player_class, rng):
+        expected = reference_effective_stats(player_data)
+        actual = compute_effective_stats(player_data)
+        if not _same(expected, actual):
+            mismatches.append(f"atributos de {player_data}: esperado {expected}, obtido {actual}")
+            continue
+        for base_xp_gain in BASE_XP_GAINS:
+            expected = reference_xp_gain(player_data, base_xp_gain)
+            actual = get_player_effective_xp_gain(player_data, base_xp_gain)
+            if not _same(expected, actual):
+                mismatches.append(f"XP (base {base_xp_gain}) de {player_data}: esperado {expected}, obtido {actual}")
+                break
+    assert not mismatches, f"{len(mismatches)} combinações divergentes, ex: {mismatches[:3]}"
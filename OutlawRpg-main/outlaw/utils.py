@@ -1,179 +1,136 @@
 # utils.py
 import math
-import random
 import time
 from datetime import datetime, timedelta
 import discord
 
 from config import (
-    CRITICAL_CHANCE,
-    CRITICAL_MULTIPLIER,
     XP_PER_LEVEL_BASE,
-    LEVEL_ROLES,
     ATTRIBUTE_POINTS_PER_LEVEL,
-    NEW_CHARACTER_ROLE_ID,
-    CLASS_TRANSFORMATIONS,
-    ITEMS_DATA,
     CLAN_KILL_CONTRIBUTION_PERCENTAGE_XP,
     CLAN_KILL_CONTRIBUTION_PERCENTAGE_MONEY,
+    XP_PER_MESSAGE,
 )
 from data_manager import (
     player_database,
     get_player_data,
     save_data,
+    mutate_player,
+    player_lock,
+    get_stats_version,
     clan_database,
     get_clan_data,
     save_clan_data,
 )
+from game_logic.combat import (
+    EVENT_ENEMY_ATTACK,
+    EVENT_ENEMY_DEFEATED,
+    EVENT_EVADE,
+    EVENT_LIFESTEAL,
+    EVENT_PLAYER_ATTACK,
+    EVENT_SECOND_CHANCE,
+    combat_modifiers,
+    resolve_combat,
+)
+from game_logic.stat_modifiers import (
+    INNATE_XP_FACTOR,
+    UNIVERSE_HEART_XP_FACTOR,
+    compute_effective_stats,
+)
 
 
-def calculate_effective_stats(player_data: dict) -> dict:
-    """Calcula os atributos efetivos de um jogador, incluindo bônus de itens e transformações."""
-    effective_hp = player_data["max_hp"]
-    effective_attack = player_data["attack"]
-    effective_special_attack = player_data["special_attack"]
-    xp_multiplier = 1.0
-    money_multiplier = 1.0
-    healing_multiplier = 1.0
-    cooldown_reduction_percent = 0.0
-    evasion_chance_bonus = 0.0
-
-    # Bônus de atributos
-    if player_data["class"] == "Lutador":
-        effective_hp += player_data["strength"] * 1.5
-        effective_attack += player_data["strength"] * 0.8
-    elif player_data["class"] == "Espadachim":
-        effective_attack += player_data["agility"] * 1.2
-        effective_hp += player_data["agility"] * 0.5
-    elif player_data["class"] == "Atirador":
-        effective_special_attack += player_data["intelligence"] * 1.5
-        effective_attack += player_data["intelligence"] * 0.5
-    elif player_data["class"] == "Curandeiro":
-        healing_multiplier += player_data["intelligence"] * 0.02
-        effective_hp += player_data["constitution"] * 1.0
-    elif player_data["class"] == "Vampiro":
-        effective_attack += player_data["strength"] * 0.7
-        effective_special_attack += player_data["intelligence"] * 1.0
-        healing_multiplier += player_data["dexterity"] * 0.015  # Roubo de vida
-    elif player_data["class"] == "Domador":
-        effective_attack += player_data["strength"] * 0.6
-        effective_hp += player_data["constitution"] * 0.7
-        xp_multiplier += player_data["dexterity"] * 0.005  # Bônus de XP de caça
-    elif player_data["class"] == "Corpo Seco":
-        effective_hp += player_data["constitution"] * 1.8
-        effective_attack += player_data["strength"] * 0.5
-
-    # Bônus do item "Habilidade Inata (Passiva)" (bônus de estilo)
-    if "habilidade_inata" in player_data.get("inventory", {}):
-        if player_data.get("power_style") == "Força":
-            effective_attack *= 1.05
-            effective_hp *= 1.02
-        elif player_data.get("power_style") == "Agilidade":
-            effective_attack *= 1.03
-            evasion_chance_bonus += 0.03
-        elif player_data.get("power_style") == "Inteligência":
-            effective_special_attack *= 1.07
-            cooldown_reduction_percent += 0.03
-        elif player_data.get("power_style") == "Constituição":
-            effective_hp *= 1.07
-        elif player_data.get("power_style") == "Destreza":
-            xp_multiplier += 0.05
-            money_multiplier += 0.05
-
-    # Bônus de itens equipados
-    for item_id in player_data.get("equipped_items", {}).values():
-        item_info = ITEMS_DATA.get(item_id)
-        if item_info and item_info.get("type") == "equipable":
-            if item_info.get("class_restriction") and item_info["class_restriction"] != player_data["class"]:
-                continue # Pular item se houver restrição de classe e não corresponder
-
-            if "attack_bonus_percent" in item_info:
-                effective_attack *= (1 + item_info["attack_bonus_percent"])
-            if "hp_bonus_flat" in item_info:
-                effective_hp += item_info["hp_bonus_flat"]
-            if "special_attack_bonus_percent" in item_info:
-                effective_special_attack *= (1 + item_info["special_attack_bonus_percent"])
-            if "cooldown_reduction_percent" in item_info:
-                cooldown_reduction_percent += item_info["cooldown_reduction_percent"]
-            if "effect_multiplier" in item_info and item_info.get("description") == "Aumenta a eficácia de todas as suas curas em 20%.":
-                healing_multiplier *= item_info["effect_multiplier"]
-            if "hp_penalty_percent" in item_info:
-                effective_hp *= (1 - item_info["hp_penalty_percent"])
-
-    # Efeito do amuleto de pedra
-    if "amuleto_de_pedra" in player_data.get("inventory", {}):
-        # O amuleto de pedra é um item passivo, não afeta os atributos diretamente,
-        # mas sim a lógica de combate (segunda chance), então não entra aqui.
-        pass
-
-    # Efeito do Coração do Universo
-    if "coracao_do_universo" in player_data.get("inventory", {}):
-        item_info = ITEMS_DATA.get("coracao_do_universo")
-        if item_info:
-            effective_attack *= (1 + item_info.get("attack_multiplier", 0) / 100)
-            effective_hp *= (1 + item_info.get("max_hp_multiplier", 0) / 100)
-            xp_multiplier += item_info.get("xp_multiplier_passive", 0)
-            money_multiplier += item_info.get("money_multiplier_passive", 0)
-            cooldown_reduction_percent += item_info.get("cooldown_reduction_percent", 0)
-
-    # Bônus de Transformações/Bênçãos ativas
-    if player_data.get("current_transformation"):
-        transform_name = player_data["current_transformation"]
-        player_class = player_data["class"]
-        if player_class in CLASS_TRANSFORMATIONS and transform_name in CLASS_TRANSFORMATIONS[player_class]:
-            transform_info = CLASS_TRANSFORMATIONS[player_class][transform_name]
-            effective_attack *= transform_info.get("attack_multiplier", 1.0)
-            effective_special_attack *= transform_info.get("special_attack_multiplier", 1.0)
-            effective_hp *= transform_info.get("hp_multiplier", 1.0)
-            healing_multiplier *= transform_info.get("healing_multiplier", 1.0)
-            cooldown_reduction_percent += transform_info.get("cooldown_reduction_percent", 0.0)
-            evasion_chance_bonus += transform_info.get("evasion_chance_bonus", 0.0)
-
-    # Aplicar bênçãos que afetam atributos diretamente
-    for item_id, item_info in ITEMS_DATA.items():
-        if item_info.get("type") == "blessing_unlock" and player_data.get(f"{item_id}_active"):
-            if "attack_multiplier" in item_info:
-                effective_attack *= item_info["attack_multiplier"]
-            if "special_attack_multiplier" in item_info:
-                effective_special_attack *= item_info["special_attack_multiplier"]
-            if "max_hp_multiplier" in item_info:
-                effective_hp *= item_info["max_hp_multiplier"]
-            if "cooldown_reduction_percent" in item_info:
-                cooldown_reduction_percent += item_info["cooldown_reduction_percent"]
-            if "evasion_chance" in item_info:
-                evasion_chance_bonus += item_info["evasion_chance"]
-
-    # Garantir que HP não seja negativo
-    effective_hp = max(1, math.floor(effective_hp))
-    effective_attack = max(1, math.floor(effective_attack))
-    effective_special_attack = max(1, math.floor(effective_special_attack))
+# Cache dos atributos efetivos: user_id -> (versão, registro do jogador, atributos)
+_stats_cache = {}
+_stats_cache_hits = 0
+_stats_cache_misses = 0
 
+
+def calculate_effective_stats(player_data: dict) -> dict:
+    """
+    Retorna os atributos efetivos de um jogador, incluindo bônus de itens e
+    transformações. O resultado fica em cache até a próxima alteração
+    registrada com data_manager.bump_stats_version().
+    """
+    global _stats_cache_hits, _stats_cache_misses
+    user_id = player_data.get("id")
+    if user_id is None:  # Registro sem ID (ex: montado fora do banco): sem cache
+        return compute_effective_stats(player_data)
+
+    version = get_stats_version(user_id)
+    cached = _stats_cache.get(user_id)
+    # O registro também precisa ser o mesmo objeto: load_data() substitui os dicionários
+    if cached is not None and cached[0] == version and cached[1] is player_data:
+        _stats_cache_hits += 1
+        return dict(cached[2])
+
+    _stats_cache_misses += 1
+    stats = compute_effective_stats(player_data)
+    _stats_cache[user_id] = (version, player_data, stats)
+    return dict(stats)
+
+
+def stats_cache_info() -> dict:
+    """Estatísticas do cache de atributos efetivos."""
+    total = _stats_cache_hits + _stats_cache_misses
     return {
-        "hp": effective_hp,
-        "attack": effective_attack,
-        "special_attack": effective_special_attack,
-        "xp_multiplier": xp_multiplier,
-        "money_multiplier": money_multiplier,
-        "healing_multiplier": healing_multiplier,
-        "cooldown_reduction_percent": min(0.95, cooldown_reduction_percent), # Limitar redução de cooldown
-        "evasion_chance": min(0.75, evasion_chance_bonus), # Limitar chance de esquiva
+        "hits": _stats_cache_hits,
+        "misses": _stats_cache_misses,
+        "hit_ratio": _stats_cache_hits / total if total else 0.0,
+        "size": len(_stats_cache),
     }
 
 
+def _format_combat_event(event: tuple, mention: str, enemy_name: str) -> str:
+    """Converte um evento de game_logic.combat na linha correspondente do log."""
+    kind = event[0]
+    if kind == EVENT_PLAYER_ATTACK:
+        _, damage, is_critical = event
+        if is_critical:
+            return f"{mention} atacou {enemy_name} e causou **{damage}** de dano! (Crítico!)"
+        return f"{mention} atacou {enemy_name} e causou **{damage}** de dano."
+    if kind == EVENT_ENEMY_DEFEATED:
+        return f"**{enemy_name} foi derrotado!**"
+    if kind == EVENT_ENEMY_ATTACK:
+        return f"{enemy_name} atacou {mention} e causou **{event[1]}** de dano."
+    if kind == EVENT_LIFESTEAL:
+        return f"✨ Você desviou e roubou **{event[1]} HP** de {enemy_name}!"
+    if kind == EVENT_EVADE:
+        return f"{mention} desviou do ataque de {enemy_name}!"
+    if kind == EVENT_SECOND_CHANCE:
+        return "🪨 Seu Amuleto de Pedra brilhou! Você recebeu uma segunda chance e recuperou 30% do seu HP!"
+    return f"**{mention} foi derrotado!**"
+
+
 async def run_turn_based_combat(bot, interaction, player_id, enemy_data):
+    """
+    Executa um combate por turnos. Combates do mesmo jogador são executados
+    um de cada vez (o próximo só começa depois do level-up e do relatório).
+    """
+    async with player_lock(player_id):
+        await _run_turn_based_combat(bot, interaction, player_id, enemy_data)
+
+
+async def _run_turn_based_combat(bot, interaction, player_id, enemy_data):
     # from views.combat_views import CombatView # Importação local para evitar circular
 
     player_data = get_player_data(str(player_id))
     original_hp = player_data["hp"]
     player_stats = calculate_effective_stats(player_data)
-    player_current_hp = player_data["hp"]
-    enemy_current_hp = enemy_data["hp"]
+    has_amulet, lifesteal_percent = combat_modifiers(player_data)
 
     # Resetar 'second_chance_used' para cada nova batalha
-    second_chance_used_in_combat = False
-    if "amuleto_de_pedra" in player_data.get("inventory", {}):
+    if has_amulet:
         player_data["second_chance_used"] = False # Garantir que está Falso no início da batalha
-        save_data()
+        save_data(player_id)
+
+    # As regras do combate ficam em game_logic.combat; aqui só montamos o relatório
+    result = resolve_combat(
+        player_data["hp"], player_stats, enemy_data, has_amulet, lifesteal_percent
+    )
+    player_current_hp = result["player_hp"]
+    if result["second_chance_used"]:
+        player_data["second_chance_used"] = True
+        save_data(player_id) # Salva o uso da segunda chance
 
     combat_log = [f"**--- Início do Combate contra {enemy_data['name']} ---**"]
 
@@ -184,69 +141,14 @@ async def run_turn_based_combat(bot, interaction, player_id, enemy_data):
         if len(combat_log) > 20:
             combat_log.pop(1) # Remove as entradas mais antigas, exceto o cabeçalho
 
-    while player_current_hp > 0 and enemy_current_hp > 0:
-        # Turno do Jogador
-        player_hit_chance = random.random()
-        is_player_critical = random.random() < CRITICAL_CHANCE
-        player_damage = player_stats["attack"]
-        if is_player_critical:
-            player_damage = math.floor(player_damage * CRITICAL_MULTIPLIER)
-            add_to_log(
-                f"{interaction.user.mention} atacou {enemy_data['name']} e causou **{player_damage}** de dano! (Crítico!)"
-            )
-        else:
-            add_to_log(
-                f"{interaction.user.mention} atacou {enemy_data['name']} e causou **{player_damage}** de dano."
-            )
-        enemy_current_hp -= player_damage
-
-        if enemy_current_hp <= 0:
-            add_to_log(f"**{enemy_data['name']} foi derrotado!**")
-            break
-
-        # Turno do Inimigo
-        enemy_hit_chance = random.random()
-        if enemy_hit_chance > player_stats["evasion_chance"]: # Verifica se o jogador desviou
-            enemy_damage = enemy_data["attack"]
-            add_to_log(
-                f"{enemy_data['name']} atacou {interaction.user.mention} e causou **{enemy_damage}** de dano."
-            )
-            player_current_hp -= enemy_damage
-
-            # Lógica de roubo de HP se a Bênção de Drácula estiver ativa E o jogador desviou
-            # Nota: O roubo de HP na Bênção de Drácula é condicional ao desvio
-            if player_data.get("bencao_dracula_active") and player_hit_chance <= player_stats["evasion_chance"]:
-                hp_steal_percent = ITEMS_DATA.get("bencao_dracula", {}).get("hp_steal_percent_on_evade", 0)
-                if hp_steal_percent > 0:
-                    hp_stolen = math.floor(enemy_damage * hp_steal_percent)
-                    player_current_hp = min(player_stats["hp"], player_current_hp + hp_stolen)
-                    add_to_log(f"✨ Você desviou e roubou **{hp_stolen} HP** de {enemy_data['name']}!")
-        else:
-            add_to_log(f"{interaction.user.mention} desviou do ataque de {enemy_data['name']}!")
-
-
-        if player_current_hp <= 0:
-            # Lógica da segunda chance do Amuleto de Pedra
-            if (
-                "amuleto_de_pedra" in player_data.get("inventory", {})
-                and not player_data.get("second_chance_used")
-            ):
-                player_current_hp = math.floor(player_stats["hp"] * 0.30)  # Recupera 30% do HP máximo
-                player_data["second_chance_used"] = True
-                save_data() # Salva o uso da segunda chance
-                add_to_log(
-                    "🪨 Seu Amuleto de Pedra brilhou! Você recebeu uma segunda chance e recuperou 30% do seu HP!"
-                )
-            else:
-                add_to_log(f"**{interaction.user.mention} foi derrotado!**")
-                break
+    for event in result["events"]:
+        add_to_log(_format_combat_event(event, interaction.user.mention, enemy_data["name"]))
 
     # --- Fim do Combate ---
     if player_current_hp <= 0:
-        player_data["hp"] = 1  # Deixa o HP em 1 para indicar derrota sem ser 0
-        player_data["deaths"] = player_data.get("deaths", 0) + 1
-        player_data["status"] = "dead"
-        save_data()
+        mutate_player(player_id, "hp", "set", 1)  # Deixa o HP em 1 para indicar derrota sem ser 0
+        mutate_player(player_id, "deaths", "add", 1)
+        mutate_player(player_id, "status", "set", "dead")
         final_message = f"💀 **Você foi derrotado por {enemy_data['name']}!** Retorne à cidade para se curar."
         embed_color = discord.Color.red()
     else:
@@ -257,10 +159,11 @@ async def run_turn_based_combat(bot, interaction, player_id, enemy_data):
         effective_xp_gain = get_player_effective_xp_gain(player_data, xp_gain)
         effective_money_gain = math.floor(money_gain * player_stats["money_multiplier"])
 
-        player_data["xp"] = player_data.get("xp", 0) + effective_xp_gain
-        player_data["money"] = player_data.get("money", 0) + effective_money_gain
-        player_data["kills"] = player_data.get("kills", 0) + 1
-        player_data["hp"] = player_current_hp # Salvar HP restante
+        # Registradas no journal: sobrevivem a uma queda antes do próximo snapshot
+        mutate_player(player_id, "xp", "add", effective_xp_gain)
+        mutate_player(player_id, "money", "add", effective_money_gain)
+        mutate_player(player_id, "kills", "add", 1)
+        mutate_player(player_id, "hp", "set", player_current_hp) # Salvar HP restante
 
         # Contribuição para o clã
         if player_data.get("clan_id"):
@@ -271,14 +174,14 @@ async def run_turn_based_combat(bot, interaction, player_id, enemy_data):
                 clan_money_contribution = math.floor(money_gain * CLAN_KILL_CONTRIBUTION_PERCENTAGE_MONEY)
                 clan_data["xp"] = clan_data.get("xp", 0) + clan_xp_contribution
                 clan_data["money"] = clan_data.get("money", 0) + clan_money_contribution
-                save_clan_data()
+                save_clan_data(clan_id)
                 add_to_log(f"🛡️ Seu clã ganhou **{clan_xp_contribution} XP** e **${clan_money_contribution}** pela sua vitória!")
 
 
         # Chamar a função centralizada de level-up
         await check_and_process_levelup_internal(bot, interaction.user, player_data, interaction)
 
-        save_data() # Salva todas as mudanças após o combate
+        save_data(player_id) # Salva todas as mudanças após o combate
 
         final_message = (
             f"🎉 **Você derrotou {enemy_data['name']}!**\n"
@@ -319,58 +222,20 @@ async def check_and_process_levelup_internal(
     old_level = player_data.get("level", 1)
     xp_needed_for_next_level = calculate_xp_for_next_level(old_level)
 
-    level_up_occurred = False
+    new_level = old_level
     while player_data["xp"] >= xp_needed_for_next_level:
-        player_data["level"] += 1
-        player_data["attribute_points"] += ATTRIBUTE_POINTS_PER_LEVEL
-        player_data["hp"] = player_data["max_hp"]  # Recupera HP ao subir de nível
-        level_up_occurred = True
-        xp_needed_for_next_level = calculate_xp_for_next_level(player_data["level"])
+        new_level += 1
+        xp_needed_for_next_level = calculate_xp_for_next_level(new_level)
+    level_up_occurred = new_level > old_level
 
     if level_up_occurred:
-        save_data()  # Salvar os novos dados de level/xp/atributos
-
-        # Sincronizar cargos imediatamente após o level-up
-        if bot.GUILD_ID:
-            guild = bot.get_guild(bot.GUILD_ID)
-            if guild:
-                member_obj = guild.get_member(member.id)
-                if member_obj:
-                    # Remover cargo de 'novo personagem' se ainda tiver
-                    if isinstance(NEW_CHARACTER_ROLE_ID, int) and NEW_CHARACTER_ROLE_ID > 0:
-                        new_char_role = guild.get_role(NEW_CHARACTER_ROLE_ID)
-                        if new_char_role and new_char_role in member_obj.roles:
-                            try:
-                                await member_obj.remove_roles(new_char_role, reason="Level Up")
-                            except discord.Forbidden:
-                                print(f"AVISO: Não foi possível remover cargo {new_char_role.name} de {member_obj.display_name} (permissão negada).")
-                            except Exception as e:
-                                print(f"Erro ao remover cargo de novo personagem: {e}")
-
-                    # Atribuir o novo cargo de nível
-                    current_level = player_data["level"]
-                    highest_applicable_role_id = None
-                    for required_level in sorted(LEVEL_ROLES.keys(), reverse=True):
-                        if current_level >= required_level:
-                            highest_applicable_role_id = LEVEL_ROLES[required_level]
-                            break
-
-                    if highest_applicable_role_id:
-                        role_to_add = guild.get_role(highest_applicable_role_id)
-                        if role_to_add and role_to_add not in member_obj.roles:
-                            try:
-                                # Remover cargos de níveis anteriores
-                                roles_to_remove = [
-                                    r for r in member_obj.roles
-                                    if r.id in LEVEL_ROLES.values() and r.id != highest_applicable_role_id
-                                ]
-                                if roles_to_remove:
-                                    await member_obj.remove_roles(*roles_to_remove, reason="Level Up")
-                                await member_obj.add_roles(role_to_add, reason="Level Up")
-                            except discord.Forbidden:
-                                print(f"AVISO: Não foi possível atribuir/remover cargos de nível para {member_obj.display_name} (permissão negada).")
-                            except Exception as e:
-                                print(f"Erro ao atribuir/remover cargos de nível: {e}")
+        # Salvar os novos dados de level/atributos (uma entrada do journal por campo)
+        mutate_player(member.id, "level", "set", new_level)
+        mutate_player(member.id, "attribute_points", "add", (new_level - old_level) * ATTRIBUTE_POINTS_PER_LEVEL)
+        mutate_player(member.id, "hp", "set", player_data["max_hp"])  # Recupera HP ao subir de nível
+
+        # Cargos de nível: o membro entra na fila do RoleSync (uma edição, espaçada)
+        bot.role_sync.mark(member.id)
 
         # Enviar mensagem de level-up
         embed = discord.Embed(
@@ -398,19 +263,39 @@ def get_player_effective_xp_gain(player_data: dict, base_xp_gain: int) -> int:
     effective_xp_gain = math.floor(effective_xp_gain * player_stats["xp_multiplier"])
 
     # Adicionalmente, se o jogador tiver a Habilidade Inata e o estilo de poder for "Destreza"
-    if "habilidade_inata" in player_data.get("inventory", {}) and player_data.get("power_style") == "Destreza":
-        item_info = ITEMS_DATA.get("habilidade_inata", {})
-        effective_xp_gain = math.floor(effective_xp_gain * (1 + item_info.get("xp_multiplier_passive", 0)))
+    inventory = player_data.get("inventory", {})
+    if "habilidade_inata" in inventory and player_data.get("power_style") == "Destreza":
+        effective_xp_gain = math.floor(effective_xp_gain * INNATE_XP_FACTOR)
 
     # Se o jogador tiver o Coração do Universo
-    if "coracao_do_universo" in player_data.get("inventory", {}):
-        item_info = ITEMS_DATA.get("coracao_do_universo", {})
-        effective_xp_gain = math.floor(effective_xp_gain * (1 + item_info.get("xp_multiplier_passive", 0)))
+    if "coracao_do_universo" in inventory:
+        effective_xp_gain = math.floor(effective_xp_gain * UNIVERSE_HEART_XP_FACTOR)
 
 
     return max(1, effective_xp_gain) # Garantir que o ganho mínimo de XP seja 1
 
 
+def apply_chat_xp(pending: dict, messages: dict) -> list:
+    """
+    Aplica o XP de mensagens acumulado por game_logic.chat_xp.ChatXpBuffer:
+    um mutate_player por jogador e lote, com o ganho por mensagem calculado
+    uma vez. Retorna [(user_id, última mensagem)] dos jogadores que chegaram
+    ao XP do próximo nível (o level-up em si é com check_and_process_levelup).
+    """
+    level_ups = []
+    for author_id, count in pending.items():
+        user_id = str(author_id)
+        player_data = player_database.get(user_id)
+        if player_data is None or player_data.get("class") is None:
+            continue  # Perfil apagado depois da mensagem ou ficha ainda sem classe
+        # Os atributos não mudam dentro do lote: o ganho é o mesmo em cada mensagem
+        xp_gain = get_player_effective_xp_gain(player_data, XP_PER_MESSAGE) * count
+        mutate_player(user_id, "xp", "add", xp_gain)
+        if player_data.get("xp", 0) >= calculate_xp_for_next_level(player_data.get("level", 1)):
+            level_ups.append((user_id, messages.get(author_id)))
+    return level_ups
+
+
 # Função auxiliar para formatar tempo de cooldown
 def format_cooldown(seconds: int) -> str:
     if seconds <= 0:
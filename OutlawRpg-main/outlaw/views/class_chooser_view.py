@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands
 from discord import ui, ButtonStyle, Interaction, Embed, Color
 
-from data_manager import player_database, save_data
+from data_manager import PlayerDataLoading, create_player
 from config import (
     INITIAL_HP,
     INITIAL_ATTACK,
@@ -60,9 +60,6 @@ class ClassChooserView(ui.View):
             )
             return
         user_id = str(i.user.id)
-        if user_id in player_database:
-            await i.response.send_message("Você já possui uma ficha!", ephemeral=True)
-            return
 
         base_stats = {
             "hp": INITIAL_HP,
@@ -96,36 +93,47 @@ class ClassChooserView(ui.View):
             base_stats["special_attack"] -= 5
 
         # Bloco de inicialização da ficha do jogador movido para fora dos `if/elif` de classe
-        player_database[user_id] = {
-            "name": i.user.display_name,
-            "class": self.chosen_class,
-            "style": self.chosen_style,
-            "xp": 0,
-            "level": 1,
-            "money": INITIAL_MONEY,
-            "hp": base_stats["hp"],
-            "max_hp": base_stats["hp"],
-            "base_attack": base_stats["attack"],
-            "base_special_attack": base_stats["special_attack"],
-            "inventory": {},
-            "cooldowns": {},
-            "status": "online",
-            "bounty": 0,
-            "kills": 0,
-            "deaths": 0,
-            "energy": MAX_ENERGY,
-            "current_transformation": None,
-            "transform_end_time": 0,
-            "aura_blessing_active": False,
-            "aura_blessing_end_time": 0,
-            "bencao_dracula_active": False,
-            "bencao_dracula_end_time": 0,
-            "amulet_used_since_revive": False,
-            "attribute_points": 0,
-            "location": STARTING_LOCATION,
-            "xptriple": False,
-            "money_double": False,
-        }
+        try:
+            created = create_player(user_id, {
+                "name": i.user.display_name,
+                "class": self.chosen_class,
+                "style": self.chosen_style,
+                "xp": 0,
+                "level": 1,
+                "money": INITIAL_MONEY,
+                "hp": base_stats["hp"],
+                "max_hp": base_stats["hp"],
+                "base_attack": base_stats["attack"],
+                "base_special_attack": base_stats["special_attack"],
+                "inventory": {},
+                "cooldowns": {},
+                "status": "online",
+                "bounty": 0,
+                "kills": 0,
+                "deaths": 0,
+                "energy": MAX_ENERGY,
+                "energy_timestamp": 0,
+                "current_transformation": None,
+                "transform_end_time": 0,
+                "aura_blessing_active": False,
+                "aura_blessing_end_time": 0,
+                "bencao_dracula_active": False,
+                "bencao_dracula_end_time": 0,
+                "amulet_used_since_revive": False,
+                "attribute_points": 0,
+                "location": STARTING_LOCATION,
+                "xptriple": False,
+                "money_double": False,
+            })
+        except PlayerDataLoading:
+            await i.response.send_message(
+                "⏳ Os dados dos jogadores ainda estão carregando. Tente novamente em alguns segundos.",
+                ephemeral=True,
+            )
+            return
+        if not created:
+            await i.response.send_message("Você já possui uma ficha!", ephemeral=True)
+            return
 
         guild = i.guild
         if guild:
@@ -152,7 +160,6 @@ class ClassChooserView(ui.View):
                     "NEW_CHARACTER_ROLE_ID is not a valid role ID (must be a positive integer)."
                 )
 
-        save_data()
         embed = Embed(
             title=f"Ficha de {i.user.display_name} Criada!",
             description=f"Bem-vindo ao mundo de OUTLAWS, **{self.chosen_class}** que usa **{self.chosen_style}**!",
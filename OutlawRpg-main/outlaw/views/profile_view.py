@@ -2,18 +2,19 @@ import discord
 from discord import ui, ButtonStyle, Interaction, Embed, Color
 from datetime import datetime
 
-from data_manager import get_player_data
+from data_manager import get_player_data, get_energy, get_relic_keys, get_relic_rarity_points
 from utils import calculate_effective_stats
 from config import (
     XP_PER_LEVEL_BASE,
     MAX_ENERGY,
+    MAX_RELIC_KEYS,
     WORLD_MAP,
     STARTING_LOCATION,
     ITEMS_DATA,
     CLASS_TRANSFORMATIONS,
     CUSTOM_EMOJIS,
 )
-from relics import relics
+from game_logic.relic_catalog import rarity_level
 
 
 class ProfileView(ui.View):
@@ -76,37 +77,10 @@ class ProfileView(ui.View):
         embed.timestamp = datetime.now()
         return embed
 
-    def _calculate_total_relic_rarity(self, player_relics_inventory: list) -> str:
-        tier_weights = {
-            "Básica": 1,
-            "Comum": 2,
-            "Incomum": 5,
-            "Rara": 10,
-            "Épica": 25,
-            "Mítica": 50,
-        }
-
-        total_rarity_points = 0
-        relics_info_map = {relic["nome"]: relic for relic in relics}
-
-        for relic_name in player_relics_inventory:
-            relic_info = relics_info_map.get(relic_name)
-            if relic_info:
-                tier = relic_info.get("tier", "Básica")
-                total_rarity_points += tier_weights.get(tier, 0)
-
-        if total_rarity_points < 10:
-            rarity_level = "Novato"
-        elif total_rarity_points < 50:
-            rarity_level = "Aventureiro"
-        elif total_rarity_points < 200:
-            rarity_level = "Colecionador"
-        elif total_rarity_points < 500:
-            rarity_level = "Mestre Relicário"
-        else:
-            rarity_level = "Lendário"
-
-        return f"**{rarity_level}** ({total_rarity_points} pontos)"
+    def _calculate_total_relic_rarity(self, player_data: dict) -> str:
+        # Pontos mantidos por add_item_to_inventory (calculados pelo catálogo em perfis antigos)
+        total_rarity_points = get_relic_rarity_points(player_data)
+        return f"**{rarity_level(total_rarity_points)}** ({total_rarity_points} pontos)"
 
     def create_profile_embed(self) -> discord.Embed:
         player_data = get_player_data(self.user.id)
@@ -136,9 +110,7 @@ class ProfileView(ui.View):
         }
 
         # Calcula a raridade da coleção
-        total_relic_rarity = self._calculate_total_relic_rarity(
-            player_data.get("relics_inventory", [])
-        )
+        total_relic_rarity = self._calculate_total_relic_rarity(player_data)
 
         # --- Descrição principal com a CLASSE do personagem no topo ---
         embed.description = (
@@ -207,12 +179,13 @@ class ProfileView(ui.View):
             return embed
         embed.title = f"Recursos de {self.user.display_name}"
 
-        energy_bar = self.create_progress_bar(player_data.get("energy", 0), MAX_ENERGY)
+        energy_bar = self.create_progress_bar(get_energy(player_data), MAX_ENERGY)
 
         resources_value = (
             f"{CUSTOM_EMOJIS.get('energy_icon', '⚡')} **Energia:** {energy_bar}\n"
             f"{CUSTOM_EMOJIS.get('money_icon', '💰')} **Dinheiro:** **${player_data.get('money', 0):,}**\n"
             f"{CUSTOM_EMOJIS.get('attribute_points_icon', '💎')} **Pontos de Atributo:** **{player_data.get('attribute_points', 0)}**\n"
+            f"🔑 **Chaves de Baú:** **{get_relic_keys(player_data)}/{MAX_RELIC_KEYS}**\n"
         )
         embed.add_field(
             name=f"{CUSTOM_EMOJIS.get('resources_header_icon', '⚙️')} Seus Recursos",
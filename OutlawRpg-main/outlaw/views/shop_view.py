@@ -1,7 +1,7 @@
 import discord
 from discord import ui, ButtonStyle, Interaction, Embed, Color
 
-from ..data_manager import get_player_data, save_data
+from ..data_manager import get_player_data, mutate_player
 from ..config import ITEMS_DATA
 
 
@@ -148,30 +148,29 @@ class ShopView(ui.View):
                     )
                     return
 
-            player_data["money"] -= self.price
-            player_data["inventory"][self.item_id] = (
-                player_data["inventory"].get(self.item_id, 0) + 1
-            )
+            mutate_player(i.user.id, "money", "add", -self.price)
+            mutate_player(i.user.id, "inventory", "add", 1, key=self.item_id)
 
             if item_info.get("type") == "equipable":
                 if self.item_id == "manopla_lutador":
                     hp_gain_from_item = ITEMS_DATA["manopla_lutador"].get(
                         "hp_bonus_flat", 0
                     )
-                    player_data["max_hp"] += hp_gain_from_item
-                    player_data["hp"] = min(
-                        player_data["hp"] + hp_gain_from_item, player_data["max_hp"]
+                    mutate_player(i.user.id, "max_hp", "add", hp_gain_from_item)
+                    mutate_player(
+                        i.user.id, "hp", "set",
+                        min(player_data["hp"] + hp_gain_from_item, player_data["max_hp"]),
                     )
                 elif self.item_id == "espada_fantasma":
                     hp_penalty_percent = ITEMS_DATA["espada_fantasma"].get(
                         "hp_penalty_percent", 0.0
                     )
-                    player_data["max_hp"] = max(
-                        1, int(player_data["max_hp"] * (1 - hp_penalty_percent))
+                    mutate_player(
+                        i.user.id, "max_hp", "set",
+                        max(1, int(player_data["max_hp"] * (1 - hp_penalty_percent))),
                     )
-                    player_data["hp"] = min(player_data["hp"], player_data["max_hp"])
+                    mutate_player(i.user.id, "hp", "set", min(player_data["hp"], player_data["max_hp"]))
 
-            save_data()
             await i.response.send_message(
                 f"**{i.user.display_name}** comprou 1x {ITEMS_DATA[self.item_id]['name']}!"
             )
@@ -3,7 +3,7 @@ from discord.ui import View, Button
 from discord import Interaction, Embed, Color
 from ..data_manager import (
     get_player_data,
-    save_data,
+    mutate_player,
     player_database,
 )  # Alterado para importação relativa
 from ..config import WORLD_MAP, ITEMS_DATA  # Alterado para importação relativa
@@ -68,8 +68,7 @@ class TravelButton(Button):
             )
             return
 
-        player_data["location"] = self.location_id
-        save_data()
+        mutate_player(i.user.id, "location", "set", self.location_id)
 
         embed = Embed(
             title="🗺️ Viagem Concluída!",